@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Asyncio form-filling pipeline speaking the W3C WebDriver protocol directly
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+
+from enhanced_form_filler import EnhancedFormFiller
+from fill_log import get_fill_logger
+from page_waits import FORM_FIELD_SELECTOR, COUNT_READY_FIELDS_JS, UPLOAD_SHOWS_FILENAME_JS
+from field_discovery import DISCOVER_FIELDS_JS, describe_field, is_fillable
+from bulk_fill import CHECKABLE_INPUT_TYPES, INJECT_VALUES_JS
+from resume_pipeline import validate_resume
+from board_adapters import detect_board, BOARDS_BY_NAME, BOARD_MARKERS, DETECT_BOARD_JS, GENERIC_BOARD, RESUME_TARGET
+
+# W3C key under which element references are passed to and from the browser
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class AsyncWebDriverError(Exception):
+    """Error reported by the WebDriver endpoint"""
+
+    def __init__(self, error, message=""):
+        super().__init__(f"{error}: {message}" if message else error)
+        self.error = error
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ChromeDriverService:
+    """A chromedriver process shared by many async sessions"""
+
+    def __init__(self, executable="chromedriver", port=None, host="127.0.0.1"):
+        self.executable = executable
+        self.host = host
+        self.port = port or _free_port()
+        self.process = None
+
+    async def request(self, method, path, payload=None):
+        """Send one WebDriver command and return its 'value'"""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write((
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("ascii") + body)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = None
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            raw = await (reader.readexactly(length) if length is not None else reader.read())
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        value = json.loads(raw or b"{}").get("value")
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            value = value if isinstance(value, dict) else {}
+            raise AsyncWebDriverError(value.get("error", f"HTTP {status}"), value.get("message", ""))
+        return value
+
+    async def start(self, timeout=20):
+        """Launch chromedriver and wait until it reports ready"""
+        self.process = await asyncio.create_subprocess_exec(
+            self.executable, f"--port={self.port}",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                status = await self.request("GET", "/status")
+                if status and status.get("ready"):
+                    return self
+            except (OSError, AsyncWebDriverError, ValueError):
+                pass
+            await asyncio.sleep(0.05)
+        raise AsyncWebDriverError("timeout", f"chromedriver not ready after {timeout}s")
+
+    async def new_session(self, headless=True, page_load_timeout=60):
+        """Create a browser session on this service"""
+        args = ["--no-sandbox", "--disable-dev-shm-usage", "--window-size=1280,900"]
+        if headless:
+            args.append("--headless=new")
+        capabilities = {
+            "browserName": "chrome",
+            "timeouts": {"pageLoad": page_load_timeout * 1000, "script": 30000},
+            "goog:chromeOptions": {"args": args},
+        }
+        value = await self.request("POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        return AsyncWebDriver(self, value["sessionId"])
+
+    async def stop(self):
+        """Terminate the chromedriver process"""
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+
+
+class AsyncWebDriver:
+    """Minimal async WebDriver session: navigate, run scripts and type into elements"""
+
+    def __init__(self, service, session_id):
+        self.service = service
+        self.session_id = session_id
+
+    def _command(self, method, endpoint, payload=None):
+        return self.service.request(method, f"/session/{self.session_id}{endpoint}", payload)
+
+    async def get(self, url):
+        await self._command("POST", "/url", {"url": url})
+
+    async def execute_script(self, script, *args):
+        return await self._command("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def execute_async_script(self, script, *args):
+        return await self._command("POST", "/execute/async", {"script": script, "args": list(args)})
+
+    async def clear(self, element):
+        await self._command("POST", f"/element/{element[ELEMENT_KEY]}/clear", {})
+
+    async def send_keys(self, element, text):
+        await self._command("POST", f"/element/{element[ELEMENT_KEY]}/value", {"text": text})
+
+    async def quit(self):
+        try:
+            await self.service.request("DELETE", f"/session/{self.session_id}")
+        except (OSError, AsyncWebDriverError):
+            pass
+
+
+class AsyncFormFiller:
+    """Fills many postings concurrently in one event loop, with EnhancedFormFiller's field matching"""
+
+    def __init__(self, filler=None, concurrency=8, headless=True, chromedriver="chromedriver",
+                 poll_interval=0.1, wait_timeout=20):
+        # Classification and value choice are delegated so results match the sync filler exactly
+        self.filler = filler or EnhancedFormFiller()
+        self.concurrency = concurrency
+        self.headless = headless
+        self.chromedriver = chromedriver
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+
+    async def _wait_for(self, session, script, *args):
+        """Poll a readiness script without blocking the event loop"""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            result = await session.execute_script(script, *args)
+            if result:
+                return result
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    async def _upload_resume(self, session, field):
+        resume_path = self.filler.resume_path
+        if validate_resume(resume_path, field.get("accept", "")):
+            return False
+        await session.send_keys(field["element"], resume_path)
+        filename = os.path.basename(resume_path)
+        return bool(await self._wait_for(session, UPLOAD_SHOWS_FILENAME_JS, field["element"], filename,
+                                         f"[id='{field['id']}']"))
+
+    async def fill_form(self, session, url):
+        """Fill one posting on an async session; returns a result record"""
+        start = time.perf_counter()
+        await session.get(url)
+        await self._wait_for(session, "return document.readyState === 'complete';")
+        ready = await self._wait_for(session, COUNT_READY_FIELDS_JS, FORM_FIELD_SELECTOR)
+        load_seconds = time.perf_counter() - start
+
+        # Per posting, not on the shared filler: other postings' coroutines resolve values in between
+        board = detect_board(url)
+        if board is GENERIC_BOARD:
+            name = await session.execute_script(DETECT_BOARD_JS, BOARD_MARKERS)
+            board = BOARDS_BY_NAME.get(name, GENERIC_BOARD)
+        fields = await session.execute_script(DISCOVER_FIELDS_JS, FORM_FIELD_SELECTOR) or []
+        filled = 0
+        failed = 0
+        # None: the board has no resume field; otherwise whether the upload showed up on the page
+        resume_uploaded = None
+        assignments = []
+        for field in fields:
+            # Comboboxes need clicks the injected script can't make; the sync filler handles them
+            if not is_fillable(field) or field.get("combobox"):
+                continue
+            if field["input_type"] == "file":
+                if board.system_target(field) == RESUME_TARGET:
+                    resume_uploaded = await self._upload_resume(session, field)
+                    filled += resume_uploaded
+                continue
+            _, value = self.filler._resolve_field_value(field, board)
+            if value:
+                assignments.append((field, value))
+
+        if assignments:
+            payload = [{"element": field["element"], "value": value} for field, value in assignments]
+            results = await session.execute_async_script(INJECT_VALUES_JS, payload) or []
+            for (field, value), committed in zip(assignments, results + [False] * (len(assignments) - len(results))):
+                if not committed:
+                    # Same fallback as the sync bulk mode: type the value where injection didn't stick
+                    try:
+                        if field["tag"] != "select" and field["input_type"] not in CHECKABLE_INPUT_TYPES:
+                            await session.clear(field["element"])
+                            await session.send_keys(field["element"], value)
+                            committed = True
+                    except AsyncWebDriverError as e:
+                        get_fill_logger(url).error("   ❌ %s: %s: %s", url, describe_field(field), e,
+                                                   action="fill", outcome="error")
+                filled += bool(committed)
+                failed += not committed
+
+        # Same bar as a clean sync run: a form was found, every value stuck and the resume went up
+        error = None
+        if not ready or not fields:
+            error = "no form fields found"
+        elif resume_uploaded is False:
+            error = "resume not uploaded"
+        elif failed:
+            error = f"{failed} of {len(assignments)} values not committed"
+        record = {
+            "url": url,
+            "success": error is None,
+            "filled": filled,
+            "failed": failed,
+            "resume_uploaded": resume_uploaded,
+            "load_seconds": round(load_seconds, 3),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        if error:
+            record["error"] = error
+        return record
+
+    async def run(self, urls):
+        """Fill every URL with up to `concurrency` sessions in flight at once"""
+        service = await ChromeDriverService(self.chromedriver).start()
+        sessions = asyncio.Queue()
+        created = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+
+        async def worker(url):
+            async with semaphore:
+                log = get_fill_logger(url)
+                session = None
+                try:
+                    # A session that fails to start fails this posting only, not the whole gather
+                    if sessions.empty() and len(created) < self.concurrency:
+                        session = await service.new_session(headless=self.headless)
+                        created.append(session)
+                    else:
+                        session = await sessions.get()
+                    result = await self.fill_form(session, url)
+                    if result["success"]:
+                        log.info("✅ %s: filled %d fields in %.1fs", url, result["filled"], result["seconds"],
+                                 action="posting", outcome="ok")
+                    else:
+                        log.error("❌ %s: %s (filled %d fields)", url, result["error"], result["filled"],
+                                  action="posting", outcome="error")
+                    return result
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                    log.error("❌ %s: %s", url, error, action="posting", outcome="error")
+                    return {"url": url, "success": False, "filled": 0, "error": error}
+                finally:
+                    if session is not None:
+                        try:
+                            await session.get("about:blank")
+                        except (OSError, AsyncWebDriverError):
+                            pass
+                        sessions.put_nowait(session)
+
+        try:
+            results = await asyncio.gather(*(worker(url) for url in urls))
+        finally:
+            await asyncio.gather(*(session.quit() for session in created))
+            await service.stop()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "jobs": len(results),
+            "succeeded": sum(1 for r in results if r["success"]),
+            "fields_filled": sum(r["filled"] for r in results),
+            "elapsed_seconds": round(elapsed, 3),
+            "jobs_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+            "results": list(results),
+        }
+
+
+def fill_many(urls, **options):
+    """Synchronous entry point: run AsyncFormFiller over urls in a fresh event loop"""
+    return asyncio.run(AsyncFormFiller(**options).run(urls))
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-application runner backed by a pool of reusable browser sessions
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError as DriverConnectionError
+
+from enhanced_form_filler import EnhancedFormFiller, create_chrome_driver
+from fill_trace import FillTracer
+from fill_log import get_fill_logger, configure_logging, shutdown_logging, add_logging_arguments, logging_options
+from domain_scheduler import DOMAIN_LIMITS, DomainScheduler, format_scheduler_metrics
+from profile_store import open_profile_store
+from progress_journal import ProgressJournal, FSYNC_POLICIES
+from resume_pipeline import ResumeCache, candidate_profiles, print_build_summary
+
+
+# Errors that mean the browser session itself is broken; a pooled browser is only discarded after these.
+# Anything else (a bad profile, a bug in the filler) leaves the session healthy for the next job.
+BROWSER_ERRORS = (WebDriverException, ConnectionError, DriverConnectionError)
+
+
+def error_text(error):
+    """Exception type and message for a result record (queue.Empty and others have no message)"""
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
+
+
+class BrowserPool:
+    """Bounded pool of reusable headless Chrome sessions"""
+
+    def __init__(self, size=4, factory=None, launch_profile="throughput"):
+        self.size = size
+        self.launch_profile = launch_profile
+        self.factory = factory or (lambda: create_chrome_driver(headless=True, launch_profile=launch_profile))
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self.launched = 0
+        self.discarded = 0
+
+    def acquire(self, timeout=None):
+        """Take an idle session, launching a new one while under the size limit"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_launch = self._created < self.size
+            if can_launch:
+                self._created += 1
+        if can_launch:
+            try:
+                driver = self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self.launched += 1
+            return driver
+        return self._idle.get(timeout=timeout)
+
+    def release(self, driver, healthy=True):
+        """Return a session to the pool, or quit it if it can't be trusted any more"""
+        if healthy:
+            try:
+                driver.get("about:blank")
+                self._idle.put(driver)
+                return
+            except Exception:
+                pass
+        self.discard(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def discard(self, driver):
+        """Quit a broken or timed-out session and free its slot"""
+        self._quit(driver)
+        self.discarded += 1
+
+    def close(self):
+        """Quit every idle session"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+
+def job_key(job):
+    """Progress-journal key of a normalized job: the URL, plus the candidate when there is one"""
+    return f"{job['url']} {job['candidate']}" if job["candidate"] else job["url"]
+
+
+def normalize_job(job):
+    """Accept a URL, a (url, profile) pair or a {"url", "profile", "candidate", "priority"} dict"""
+    if isinstance(job, str):
+        return {"url": job, "profile": None, "candidate": None, "priority": 0}
+    if isinstance(job, (tuple, list)):
+        url, profile = (list(job) + [None])[:2]
+        return {"url": url, "profile": profile, "candidate": None, "priority": 0}
+    return {"url": job["url"], "profile": job.get("profile"), "candidate": job.get("candidate"),
+            "priority": job.get("priority", 0)}
+
+
+class BatchRunner:
+    """Fills many postings concurrently with EnhancedFormFiller on a shared browser pool"""
+
+    def __init__(self, concurrency=4, job_timeout=180, retries=1, pool=None, filler_options=None,
+                 profile_store=None, journal=None, scheduler=None, metrics_interval=None):
+        self.concurrency = concurrency
+        self.job_timeout = job_timeout
+        self.retries = retries
+        self.pool = pool or BrowserPool(size=concurrency)
+        self.filler_options = filler_options or {}
+        # Optional ProfileStore: jobs naming a "candidate" get that candidate's profile, answers and resume
+        self.profile_store = profile_store
+        # Optional ProgressJournal: finished postings are skipped when a batch is restarted
+        self.journal = journal
+        # Optional DomainScheduler: per-board start rates, concurrency caps and backoff;
+        # retries go back through it instead of running immediately
+        self.scheduler = scheduler
+        # Seconds between live scheduler metrics lines (scheduled mode only)
+        self.metrics_interval = metrics_interval
+
+    def _attempt(self, job):
+        """One fill attempt on a pooled session; a watchdog kills the session on timeout"""
+        driver = self.pool.acquire(timeout=self.job_timeout)
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+        watchdog = threading.Timer(self.job_timeout, expire)
+        watchdog.daemon = True
+        watchdog.start()
+        healthy = False
+        try:
+            driver.set_page_load_timeout(self.job_timeout)
+            options = dict({"launch_profile": self.pool.launch_profile}, **self.filler_options)
+            if job["candidate"]:
+                if self.profile_store is None:
+                    raise ValueError(f"job names candidate '{job['candidate']}' but no profile store is configured")
+                options.update(self.profile_store.filler_options(job["candidate"],
+                                                                 require_resume=options.get("resume_cache") is None))
+                if job["profile"]:
+                    options["profile"] = dict(options["profile"] or {}, **job["profile"])
+            else:
+                options["profile"] = job["profile"]
+            filler = EnhancedFormFiller(journal=self.journal, **options)
+            filler.attach_driver(driver)
+            success = filler.fill_form(job["url"], review=False, journal_key=job_key(job))
+            healthy = not timed_out.is_set()
+        except Exception as e:
+            if not timed_out.is_set():
+                healthy = not isinstance(e, BROWSER_ERRORS)
+                return False, 0, error_text(e), {}
+        finally:
+            watchdog.cancel()
+            if healthy:
+                self.pool.release(driver)
+            else:
+                self.pool.discard(driver)
+        if timed_out.is_set():
+            return False, 0, f"timed out after {self.job_timeout}s", {}
+        return success, filler.last_filled_count, None if success else "form filling failed", filler.last_metrics
+
+    def _run_job(self, job):
+        """Run a job with retries; returns a result record"""
+        start = time.perf_counter()
+        error = None
+        attempts = 0
+        filled = 0
+        metrics = {}
+        success = False
+        while attempts <= self.retries and not success:
+            attempts += 1
+            success, filled, error, metrics = self._safe_attempt(job)
+        return self._record(job, success, filled, attempts, time.perf_counter() - start, error, metrics)
+
+    def _safe_attempt(self, job):
+        try:
+            return self._attempt(job)
+        except Exception as e:
+            return False, 0, error_text(e), {}
+
+    @staticmethod
+    def _record(job, success, filled, attempts, seconds, error, metrics):
+        return {
+            "url": job["url"],
+            "candidate": job["candidate"],
+            "success": success,
+            "filled": filled,
+            "attempts": attempts,
+            "seconds": round(seconds, 3),
+            "error": None if success else error,
+            "metrics": metrics,
+        }
+
+    def _scheduled_worker(self, records):
+        """Worker thread: take jobs as the scheduler releases them until it is drained"""
+        while True:
+            item = self.scheduler.next_job()
+            if item is None:
+                return
+            domain, entry = item
+            job = entry["job"]
+            entry["attempts"] += 1
+            if entry["start"] is None:
+                entry["start"] = time.perf_counter()
+            attempt_start = time.perf_counter()
+            success, filled, error, metrics = self._safe_attempt(job)
+            # Page load time is what the board controls; the whole attempt is the fallback
+            load_ms = (metrics or {}).get("load_ms")
+            seconds = load_ms / 1000 if load_ms else time.perf_counter() - attempt_start
+            retry = not success and entry["attempts"] <= self.retries
+            # Retries jump the queue but wait out the domain's backoff
+            self.scheduler.done(domain, seconds, success, requeue=entry if retry else None,
+                                url=job["url"], priority=job["priority"] - 1)
+            if not retry:
+                records.put(self._record(job, success, filled, entry["attempts"],
+                                         time.perf_counter() - entry["start"], error, metrics))
+
+    def _run_scheduled(self, jobs, on_result):
+        """Fill jobs through the domain scheduler; returns the result records"""
+        for job in jobs:
+            self.scheduler.submit(job["url"], {"job": job, "attempts": 0, "start": None}, job["priority"])
+        self.scheduler.close()
+        records = queue.Queue()
+        results = []
+        log = get_fill_logger()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            workers = [executor.submit(self._scheduled_worker, records) for _ in range(self.concurrency)]
+            last_report = time.perf_counter()
+            while len(results) < len(jobs):
+                try:
+                    results.append(records.get(timeout=self.metrics_interval or 1))
+                    if on_result:
+                        on_result(results[-1])
+                except queue.Empty:
+                    if all(worker.done() for worker in workers):
+                        # A worker died; surface its exception
+                        for worker in workers:
+                            worker.result()
+                        break
+                if self.metrics_interval and time.perf_counter() - last_report >= self.metrics_interval:
+                    log.info("📊 %s", format_scheduler_metrics(self.scheduler.metrics()))
+                    last_report = time.perf_counter()
+        return results
+
+    def run(self, jobs, on_result=None):
+        """Fill all jobs concurrently and return a throughput/failure summary; on_result sees each record as it finishes"""
+        jobs = [normalize_job(job) for job in jobs]
+        skipped = 0
+        if self.journal:
+            pending = [job for job in jobs if not self.journal.is_complete(job_key(job))]
+            skipped = len(jobs) - len(pending)
+            if skipped:
+                get_fill_logger().info("📒 Skipping %d postings already completed according to the journal", skipped)
+            jobs = pending
+        start = time.perf_counter()
+        results = []
+        try:
+            if self.scheduler:
+                results = self._run_scheduled(jobs, on_result)
+            else:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                    futures = [executor.submit(self._run_job, job) for job in jobs]
+                    for future in as_completed(futures):
+                        results.append(future.result())
+                        if on_result:
+                            on_result(results[-1])
+        finally:
+            self.pool.close()
+            if self.journal:
+                self.journal.flush()
+        summary = self._summarize(results, time.perf_counter() - start)
+        summary["skipped_completed"] = skipped
+        if self.scheduler:
+            summary["domains"] = self.scheduler.metrics()["domains"]
+        return summary
+
+    def _summarize(self, results, elapsed):
+        succeeded = [r for r in results if r["success"]]
+
+        def average(key):
+            values = [r["metrics"][key] for r in results if r["metrics"].get(key) is not None]
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            "jobs": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "retries": sum(r["attempts"] - 1 for r in results),
+            "fields_filled": sum(r["filled"] for r in results),
+            "elapsed_seconds": round(elapsed, 3),
+            "jobs_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+            "browsers_launched": self.pool.launched,
+            "browsers_discarded": self.pool.discarded,
+            "avg_browser_rss_mb": average("browser_rss_mb"),
+            "avg_load_ms": average("load_ms"),
+            "failures": [{"url": r["url"], "error": r["error"]} for r in results if not r["success"]],
+            "results": results,
+        }
+
+
+def print_summary(summary):
+    """Print a batch summary"""
+    print("\n📦 BATCH COMPLETED")
+    print("=" * 50)
+    print(f"Jobs: {summary['jobs']} ({summary['succeeded']} succeeded, {summary['failed']} failed, {summary['retries']} retries)")
+    print(f"Fields filled: {summary['fields_filled']}")
+    if summary.get("skipped_completed"):
+        print(f"Skipped (already completed): {summary['skipped_completed']}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.1f}s ({summary['jobs_per_minute']:.1f} jobs/min)")
+    print(f"Browsers: {summary['browsers_launched']} launched, {summary['browsers_discarded']} discarded")
+    print(f"Per session: {summary['avg_browser_rss_mb']} MB RSS, {summary['avg_load_ms']} ms page load (avg)")
+    for domain, d in summary.get("domains", {}).items():
+        print(f"   🌐 {domain}: {d['completed']} ok, {d['failed']} failed, {d['slow']} slow, "
+              f"{d['backoffs']} backoffs, avg {d['latency_avg']}s, p95 {d['latency_p95']}s, rate {d['rate']}/s")
+    for failure in summary["failures"]:
+        print(f"   ❌ {failure['url']}: {failure['error']}")
+
+
+def load_jobs(path):
+    """Read one posting URL per line, optionally followed by a candidate id; blank lines and # comments are ignored"""
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            jobs.append({"url": parts[0], "candidate": parts[1] if len(parts) > 1 else None})
+    return jobs
+
+
+def prebuild_resumes(cache, jobs, profile_store=None, workers=None):
+    """Generate every resume a batch will upload before it starts, in parallel; returns the build summary"""
+    from enhanced_form_filler import DEFAULT_PROFILE
+    candidates = sorted({job["candidate"] for job in jobs if job.get("candidate")})
+    profiles = candidate_profiles(profile_store, candidates) if profile_store and candidates else {}
+    if any(not job.get("candidate") for job in jobs):
+        profiles["(default)"] = DEFAULT_PROFILE
+    return cache.build_all(profiles, workers=workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill many job applications concurrently")
+    parser.add_argument("jobs_file", help="text file with one posting URL per line")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=int, default=180, help="per-job timeout in seconds")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--profile-store", help="candidate directory or SQLite file for jobs that name a candidate")
+    parser.add_argument("--journal", help="progress journal; completed postings are skipped on restart")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="posting")
+    parser.add_argument("--schedule", action="store_true",
+                        help="rate-limit per job board (domain_scheduler.DOMAIN_LIMITS) with backoff")
+    parser.add_argument("--domain-concurrency", type=int, help="with --schedule: postings in flight per board")
+    parser.add_argument("--domain-rate", type=float, help="with --schedule: page loads started per second per board")
+    parser.add_argument("--metrics-interval", type=float, default=10, help="with --schedule: seconds between metrics lines")
+    parser.add_argument("--resume-cache", help="generate each candidate's resume into this directory before the batch")
+    parser.add_argument("--resume-workers", type=int, help="with --resume-cache: processes (default: one per CPU core)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="record every posting's phase and field spans to PATH (.jsonl: JSON lines, "
+                             "otherwise a Chrome trace with one track per worker thread)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    # Loaded once up front instead of by the first pool threads that launch a browser
+    import selenium.webdriver
+    import selenium.webdriver.chrome.options
+
+    profile_store = open_profile_store(args.profile_store) if args.profile_store else None
+    journal = ProgressJournal(args.journal, fsync=args.fsync) if args.journal else None
+    jobs = load_jobs(args.jobs_file)
+    filler_options = {}
+    if args.resume_cache:
+        resume_cache = ResumeCache(args.resume_cache)
+        print_build_summary(prebuild_resumes(resume_cache, jobs, profile_store, args.resume_workers))
+        filler_options["resume_cache"] = resume_cache
+    # One tracer shared by all workers; spans carry the thread that recorded them
+    tracer = FillTracer() if args.trace else None
+    if tracer:
+        filler_options["tracer"] = tracer
+    scheduler = None
+    if args.schedule:
+        overrides = {key: value for key, value in (("max_concurrent", args.domain_concurrency),
+                                                   ("rate", args.domain_rate)) if value}
+        limits = {domain: dict(limits, **overrides) for domain, limits in DOMAIN_LIMITS.items()}
+        scheduler = DomainScheduler(limits=limits, default_limits=overrides)
+    runner = BatchRunner(concurrency=args.concurrency, job_timeout=args.timeout, retries=args.retries,
+                         profile_store=profile_store, journal=journal, scheduler=scheduler,
+                         metrics_interval=args.metrics_interval, filler_options=filler_options)
+    # Concurrent postings share one buffered sink; human lines are prefixed with their posting
+    configure_logging(**logging_options(args, show_posting=args.concurrency > 1))
+    try:
+        summary = runner.run(jobs)
+        if tracer:
+            get_fill_logger().info("🔬 Wrote %d spans to %s", tracer.export(args.trace), args.trace)
+    finally:
+        if journal:
+            journal.close()
+        shutdown_logging()
+    print_summary(summary)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
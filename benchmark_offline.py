@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark: fill a local replica of the Ashby application form and time each phase
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from enhanced_form_filler import EnhancedFormFiller, create_chrome_driver
+from field_discovery import discover_fields, is_fillable
+from board_adapters import detect_board
+from handle_cache import HandleCache
+
+PHASES = ["browser_start", "load", "discovery", "classification", "upload", "fill"]
+
+# extracted_fields.json has no dropdowns; the replica adds two so the select path is measured
+REPLICA_EXTRA_FIELDS = [
+    {"type": "select", "name": "work_authorization", "id": "work_authorization",
+     "label": "Are you legally authorized to work in the United States?", "required": True,
+     "options": ["Select...", "Yes", "No"]},
+    {"type": "select", "name": "employment_type", "id": "employment_type",
+     "label": "Preferred employment type", "required": True,
+     "options": ["Please choose", "Full-time", "Part-time", "Contract"]},
+]
+
+# Renders the form after a short hydration delay and keeps every value in a state
+# object, like a React app: input/change events update state and trigger a
+# re-render that writes state back into every field, so values set without
+# events are reverted.
+_REPLICA_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Application (offline replica)</title>
+<style>
+body { font-family: sans-serif; max-width: 720px; margin: 24px auto; }
+.field { margin: 16px 0; }
+.field label { display: block; font-weight: 600; margin-bottom: 4px; }
+.field input, .field textarea, .field select { width: 100%; box-sizing: border-box; }
+.hidden { display: none; }
+</style>
+</head>
+<body>
+<div id="root">Loading...</div>
+<script>
+var FIELDS = __FIELDS__;
+var HYDRATION_DELAY_MS = __HYDRATION_DELAY_MS__;
+var state = {};
+var renderScheduled = false;
+
+function keyOf(f) { return f.name || f.id; }
+
+function render() {
+    renderScheduled = false;
+    FIELDS.forEach(function (f) {
+        var el = document.getElementById(f.dom_id);
+        if (!el || el.type === 'file') return;
+        var value = state[keyOf(f)] || '';
+        if (el.value !== value) el.value = value;
+    });
+}
+
+function setState(key, value) {
+    state[key] = value;
+    if (!renderScheduled) {
+        renderScheduled = true;
+        Promise.resolve().then(render);
+    }
+}
+
+function buildField(f) {
+    var wrapper = document.createElement('div');
+    wrapper.className = 'field' + (f.hidden ? ' hidden' : '');
+    var label = document.createElement('label');
+    label.htmlFor = f.dom_id;
+    label.textContent = f.label + (f.required ? ' *' : '');
+    wrapper.appendChild(label);
+
+    var el;
+    if (f.type === 'textarea') {
+        el = document.createElement('textarea');
+        el.rows = 3;
+    } else if (f.type === 'select') {
+        el = document.createElement('select');
+        f.options.forEach(function (text, i) {
+            var opt = document.createElement('option');
+            opt.value = i === 0 ? '' : text;
+            opt.textContent = text;
+            el.appendChild(opt);
+        });
+    } else {
+        el = document.createElement('input');
+        el.type = f.input_type || 'text';
+    }
+    el.id = f.dom_id;
+    if (f.name) el.name = f.name;
+    if (f.placeholder) el.placeholder = f.placeholder;
+    if (f.required) el.required = true;
+    if (f.accept) el.accept = f.accept;
+
+    if (el.type === 'file') {
+        el.style.display = 'none';
+        var button = document.createElement('button');
+        button.type = 'button';
+        button.textContent = 'Upload File';
+        button.onclick = function () { el.click(); };
+        var filename = document.createElement('span');
+        filename.className = 'filename';
+        el.addEventListener('change', function () {
+            var file = el.files[0];
+            // Simulate the upload round trip before the widget shows the file
+            setTimeout(function () { filename.textContent = file ? file.name : ''; }, 150);
+        });
+        wrapper.appendChild(button);
+        wrapper.appendChild(filename);
+    } else {
+        el.addEventListener('input', function () { setState(keyOf(f), el.value); });
+        el.addEventListener('change', function () { setState(keyOf(f), el.value); });
+    }
+    wrapper.appendChild(el);
+    return wrapper;
+}
+
+setTimeout(function () {
+    var root = document.getElementById('root');
+    root.textContent = '';
+    var form = document.createElement('form');
+    FIELDS.forEach(function (f) { form.appendChild(buildField(f)); });
+    root.appendChild(form);
+}, HYDRATION_DELAY_MS);
+</script>
+</body>
+</html>
+"""
+
+# Counts fields whose DOM value matches what the filler chose
+_VERIFY_VALUES_JS = """
+var expected = arguments[0];
+var ok = 0;
+expected.forEach(function (pair) {
+    var el = pair[0];
+    var value = el.tagName === 'SELECT' ? (el.options[el.selectedIndex] || {}).text : el.value;
+    if ((value || '').trim() === pair[1].trim()) ok++;
+});
+return ok;
+"""
+
+
+def replica_fields(schema):
+    """Deduplicated replica field list built from an extracted_fields.json schema"""
+    fields = []
+    seen = set()
+    for field in schema["fields"] + REPLICA_EXTRA_FIELDS:
+        key = field.get("id") or field.get("name")
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        tag = "input" if field["type"] == "file" else field["type"]
+        fields.append({
+            "type": tag,
+            "input_type": "file" if field["type"] == "file" else field.get("input_type", ""),
+            "name": field.get("name", ""),
+            "dom_id": field.get("id") or field["name"],
+            "label": field.get("label", ""),
+            "placeholder": field.get("placeholder", ""),
+            "required": field.get("required", False),
+            "accept": field.get("accept", ""),
+            "options": field.get("options", []),
+            # Unlabelled widgets such as the reCAPTCHA response are hidden on the real page
+            "hidden": not field.get("label"),
+        })
+    return fields
+
+
+def build_replica_html(schema, hydration_delay_ms=300):
+    """Self-contained HTML replica of the form described by the schema"""
+    return (_REPLICA_TEMPLATE
+            .replace("__FIELDS__", json.dumps(replica_fields(schema)))
+            .replace("__HYDRATION_DELAY_MS__", str(int(hydration_delay_ms))))
+
+
+class ReplicaServer:
+    """Serves the replica HTML on localhost from a background thread"""
+
+    def __init__(self, html, port=0):
+        body = html.encode("utf-8")
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/application"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def run_once(url, launch_profile="throughput", bulk_fill=False):
+    """Fill the replica once and return per-phase timings"""
+    phases = {}
+    filler = EnhancedFormFiller(bulk_fill=bulk_fill, launch_profile=launch_profile)
+
+    start = time.perf_counter()
+    driver = create_chrome_driver(headless=True, launch_profile=launch_profile)
+    filler.attach_driver(driver)
+    phases["browser_start"] = time.perf_counter() - start
+    try:
+        # The filler's per-field output is not part of what we measure
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            driver.get(url)
+            filler.waiter.dom_ready()
+            filler.waiter.form_fields_present()
+            phases["load"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            fields = discover_fields(driver)
+            # The upload and fill helpers act through the handle cache, as in fill_form()
+            filler.handles = HandleCache(driver)
+            filler.handles.track(fields)
+            phases["discovery"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            filler.board = detect_board(url, driver)
+            resume_field = filler.board.resume_field(fields)
+            plan = []
+            for i, field in enumerate(fields, 1):
+                if not is_fillable(field) or field is resume_field:
+                    continue
+                _, value = filler._resolve_field_value(field)
+                if value:
+                    plan.append((i, field, value))
+            phases["classification"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            uploaded = filler._upload_resume(resume_field)
+            phases["upload"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if bulk_fill:
+                filled = filler._bulk_fill_fields(plan)
+            else:
+                filled = sum(1 for _, field, value in plan if filler._fill_field(field, value))
+            phases["fill"] = time.perf_counter() - start
+
+        verified = driver.execute_script(_VERIFY_VALUES_JS, [[f["element"], v] for _, f, v in plan])
+    finally:
+        driver.quit()
+
+    total = sum(phases.values())
+    fields_filled = filled + (1 if uploaded else 0)
+    return {
+        "phases": {name: round(seconds, 4) for name, seconds in phases.items()},
+        "total_seconds": round(total, 4),
+        "fields_discovered": len(fields),
+        "fields_planned": len(plan),
+        "fields_filled": fields_filled,
+        "fields_verified": verified,
+        "fields_per_second": round(filled / phases["fill"], 2) if phases["fill"] else None,
+        "end_to_end_fields_per_second": round(fields_filled / total, 2) if total else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(runs):
+    """Median of every phase and rate across runs"""
+    return {
+        "phases": {name: round(statistics.median(r["phases"][name] for r in runs), 4) for name in PHASES},
+        "total_seconds": round(statistics.median(r["total_seconds"] for r in runs), 4),
+        "fields_per_second": statistics.median(r["fields_per_second"] or 0 for r in runs),
+        "end_to_end_fields_per_second": statistics.median(r["end_to_end_fields_per_second"] or 0 for r in runs),
+    }
+
+
+def compare(result, baseline, tolerance=0.15, min_delta=0.05):
+    """Phases that got slower than the baseline by more than tolerance (and min_delta seconds)"""
+    regressions = []
+    for name in PHASES:
+        old = baseline["median"]["phases"].get(name)
+        new = result["median"]["phases"].get(name)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > min_delta:
+            regressions.append({"phase": name, "baseline": old, "current": new,
+                                "change": f"+{(new - old) / old * 100:.0f}%" if old else "new"})
+    return regressions
+
+
+def run_benchmark(schema_path="extracted_fields.json", runs=3, launch_profile="throughput",
+                  bulk_fill=False, hydration_delay_ms=300):
+    """Serve the replica, fill it `runs` times and return the results document"""
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    results = []
+    with ReplicaServer(build_replica_html(schema, hydration_delay_ms)) as server:
+        for i in range(runs):
+            result = run_once(server.url, launch_profile=launch_profile, bulk_fill=bulk_fill)
+            results.append(result)
+            print(f"   Run {i + 1}/{runs}: {result['total_seconds']:.2f}s, "
+                  f"{result['fields_filled']} fields ({result['fields_verified']} verified)")
+    return {
+        "benchmark": "offline_replica",
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {"schema": schema_path, "runs": runs, "launch_profile": launch_profile,
+                   "bulk_fill": bulk_fill, "hydration_delay_ms": hydration_delay_ms},
+        "runs": results,
+        "median": summarize(results),
+    }
+
+
+def print_result(result):
+    """Print median phase timings"""
+    median = result["median"]
+    print("\n🏁 OFFLINE BENCHMARK (median)")
+    print("=" * 50)
+    for name in PHASES:
+        print(f"   {name:<15} {median['phases'][name]:.3f}s")
+    print(f"   {'total':<15} {median['total_seconds']:.3f}s")
+    print(f"   Fill rate: {median['fields_per_second']} fields/s "
+          f"(end to end {median['end_to_end_fields_per_second']} fields/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the filler against a local replica of the application form")
+    parser.add_argument("--schema", default="extracted_fields.json")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--launch-profile", default="throughput")
+    parser.add_argument("--bulk-fill", action="store_true")
+    parser.add_argument("--output-dir", default="benchmark_results")
+    parser.add_argument("--baseline", help="earlier results JSON to check for regressions")
+    parser.add_argument("--write-replica", help="also save the replica HTML to this path")
+    args = parser.parse_args()
+
+    if args.write_replica:
+        with open(args.schema, "r", encoding="utf-8") as f:
+            html = build_replica_html(json.load(f))
+        with open(args.write_replica, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    print(f"🏎️  Benchmarking {args.runs} runs against the offline replica...")
+    result = run_benchmark(args.schema, args.runs, args.launch_profile, args.bulk_fill)
+    print_result(result)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output_path = os.path.join(args.output_dir, f"{stamp}-{result['git_commit'] or 'nogit'}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"💾 Results saved to {output_path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f))
+        if regressions:
+            print("\n⚠️  Regressions against baseline:")
+            for r in regressions:
+                print(f"   • {r['phase']}: {r['baseline']:.3f}s → {r['current']:.3f}s ({r['change']})")
+            raise SystemExit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Job-board adapters: detect the platform once, map its standard fields straight to profile keys
+"""
+
+import argparse
+import os
+import sys
+from html.parser import HTMLParser
+
+from browser_profiles import match_domain
+
+# Rule id prefix for fields filled from a board's system-field map (no classification)
+SYSTEM_RULE_PREFIX = "system:"
+
+# Target of a board's resume upload field
+RESUME_TARGET = "resume"
+
+# Field attributes a system-field map can key on, in lookup order
+SYSTEM_FIELD_ATTRIBUTES = ("automation_id", "name", "id")
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "board_fixtures")
+
+# First board (in table order) whose marker selector matches the page; one round trip for all boards
+DETECT_BOARD_JS = """
+var markers = arguments[0];
+for (var i = 0; i < markers.length; i++) {
+    try { if (document.querySelector(markers[i][1])) return markers[i][0]; } catch (e) {}
+}
+return null;
+"""
+
+
+class BoardAdapter:
+    """One job-board platform: how to recognise it and which of its fields are standard
+
+    system_fields maps a field attribute ("automation_id", "name" or "id") to
+    {attribute value: target}, where a target is "profile.<key>",
+    "responses.<key>" or RESUME_TARGET. The maps are compiled into one
+    case-insensitive lookup table when the adapter is created.
+    """
+
+    def __init__(self, name, domains=(), marker=None, system_fields=None):
+        self.name = name
+        self.domains = tuple(domains)
+        self.marker = marker
+        self.system_fields = system_fields or {}
+        self._lookup = {
+            (attribute, value.lower()): target
+            for attribute, mapping in self.system_fields.items()
+            for value, target in mapping.items()
+        }
+
+    def system_target(self, field):
+        """Target of a standard field of this board, or None for custom questions"""
+        if not self._lookup:
+            return None
+        for attribute in SYSTEM_FIELD_ATTRIBUTES:
+            value = field.get(attribute)
+            if value:
+                target = self._lookup.get((attribute, value.lower()))
+                if target:
+                    return target
+        return None
+
+    def resume_field(self, fields):
+        """The board's resume upload field among discovered fields, or None"""
+        return next((field for field in fields
+                     if field["input_type"] == "file" and self.system_target(field) == RESUME_TARGET), None)
+
+    def __repr__(self):
+        return f"BoardAdapter({self.name!r})"
+
+
+BOARD_ADAPTERS = [
+    BoardAdapter(
+        "ashby",
+        domains=["ashbyhq.com"],
+        marker="[id^='_systemfield_'], [name^='_systemfield_']",
+        system_fields={"id": {
+            "_systemfield_name": "profile.full_name",
+            "_systemfield_email": "profile.email",
+            "_systemfield_phone": "profile.phone",
+            "_systemfield_resume": RESUME_TARGET,
+        }},
+    ),
+    BoardAdapter(
+        "greenhouse",
+        domains=["greenhouse.io"],
+        marker="#application-form, #application_form, [name^='job_application[']",
+        system_fields={
+            "id": {
+                "first_name": "profile.first_name",
+                "last_name": "profile.last_name",
+                "email": "profile.email",
+                "phone": "profile.phone",
+                "resume": RESUME_TARGET,
+            },
+            "name": {
+                "job_application[first_name]": "profile.first_name",
+                "job_application[last_name]": "profile.last_name",
+                "job_application[email]": "profile.email",
+                "job_application[phone]": "profile.phone",
+                "job_application[resume]": RESUME_TARGET,
+            },
+        },
+    ),
+    BoardAdapter(
+        "lever",
+        domains=["lever.co"],
+        marker="[name^='urls['], [name^='cards[']",
+        system_fields={"name": {
+            "name": "profile.full_name",
+            "email": "profile.email",
+            "phone": "profile.phone",
+            "urls[linkedin]": "profile.linkedin",
+            "urls[github]": "profile.github",
+            "urls[portfolio]": "profile.portfolio",
+            "urls[other]": "profile.portfolio",
+            "comments": "responses.cover_letter",
+            "resume": RESUME_TARGET,
+        }},
+    ),
+    BoardAdapter(
+        "workday",
+        domains=["myworkdayjobs.com", "myworkday.com"],
+        marker="[data-automation-id^='legalNameSection'], [data-automation-id='file-upload-input-ref']",
+        system_fields={"automation_id": {
+            "legalNameSection_firstName": "profile.first_name",
+            "legalNameSection_lastName": "profile.last_name",
+            "email": "profile.email",
+            "phone-number": "profile.phone",
+            "linkedinQuestion": "profile.linkedin",
+            "file-upload-input-ref": RESUME_TARGET,
+        }},
+    ),
+]
+
+# Unknown platforms: every field goes through the keyword rules and no upload field is known
+GENERIC_BOARD = BoardAdapter("generic")
+
+BOARDS_BY_NAME = {adapter.name: adapter for adapter in BOARD_ADAPTERS}
+_BOARDS_BY_DOMAIN = {domain: adapter for adapter in BOARD_ADAPTERS for domain in adapter.domains}
+BOARD_MARKERS = [[adapter.name, adapter.marker] for adapter in BOARD_ADAPTERS if adapter.marker]
+
+
+def detect_board(url=None, driver=None, fields=None):
+    """Adapter for a posting: by URL domain, else one DOM marker check, else the fields' system attributes"""
+    domain = match_domain(url, _BOARDS_BY_DOMAIN) if url else None
+    if domain:
+        return _BOARDS_BY_DOMAIN[domain]
+    if driver is not None:
+        try:
+            name = driver.execute_script(DETECT_BOARD_JS, BOARD_MARKERS)
+        except Exception:
+            name = None
+        if name:
+            return BOARDS_BY_NAME[name]
+    if fields:
+        # Offline schemas: the board with the most standard fields present, if at least two are
+        hits = [(sum(1 for field in fields if adapter.system_target(field)), adapter) for adapter in BOARD_ADAPTERS]
+        count, adapter = max(hits, key=lambda hit: hit[0])
+        if count >= 2:
+            return adapter
+    return GENERIC_BOARD
+
+
+class _FixtureParser(HTMLParser):
+    """Field descriptors (attributes only) and data-expect targets of a fixture page"""
+
+    def __init__(self):
+        super().__init__()
+        self.fields = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ("input", "textarea", "select"):
+            return
+        attrs = {key: value or "" for key, value in attrs}
+        self.fields.append({
+            "index": len(self.fields),
+            "tag": tag,
+            "input_type": attrs.get("type", "").lower() if tag == "input" else "",
+            "id": attrs.get("id", ""),
+            "name": attrs.get("name", ""),
+            "automation_id": attrs.get("data-automation-id", ""),
+            "expect": attrs.get("data-expect") or None,
+        })
+
+
+def load_fixture(name):
+    """(html, fields) of board_fixtures/<name>.html; each field carries its expected target"""
+    with open(os.path.join(FIXTURE_DIR, f"{name}.html"), "r", encoding="utf-8") as f:
+        html = f.read()
+    parser = _FixtureParser()
+    parser.feed(html)
+    return html, parser.fields
+
+
+def _check_mapping(adapter, fields):
+    """Problems with how an adapter maps a fixture's fields (fields carry their expected targets)"""
+    problems = []
+    for field in fields:
+        target = adapter.system_target(field)
+        if target != field.get("expect"):
+            label = field.get("automation_id") or field["name"] or field["id"] or f"#{field['index']}"
+            problems.append(f"{label}: mapped to {target}, expected {field.get('expect')}")
+    if fields and not adapter.resume_field(fields):
+        problems.append("no resume field")
+    return problems
+
+
+def check_fixtures(browser=False):
+    """Check every adapter against its offline fixture; returns {board: [problems]}
+
+    Without a browser the fixture's fields are parsed from the HTML and detection
+    uses the field attributes. With browser=True the fixture is loaded in headless
+    Chrome, detected by its DOM marker and discovered like a live form.
+    """
+    driver = None
+    if browser:
+        from enhanced_form_filler import create_chrome_driver
+        from field_discovery import discover_fields
+        driver = create_chrome_driver(headless=True)
+    report = {}
+    try:
+        for adapter in BOARD_ADAPTERS:
+            _, fields = load_fixture(adapter.name)
+            if driver:
+                driver.get("file://" + os.path.join(FIXTURE_DIR, f"{adapter.name}.html"))
+                detected = detect_board(driver=driver)
+                expected = {field["index"]: field["expect"] for field in fields}
+                fields = [dict(field, expect=expected.get(field["index"])) for field in discover_fields(driver)]
+            else:
+                detected = detect_board(fields=fields)
+            problems = [] if detected is adapter else [f"detected as {detected.name}"]
+            domain_url = f"https://careers.{adapter.domains[0]}/posting"
+            if detect_board(domain_url) is not adapter:
+                problems.append(f"{domain_url} not detected")
+            report[adapter.name] = problems + _check_mapping(adapter, fields)
+    finally:
+        if driver:
+            driver.quit()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the job-board adapters against their offline fixtures")
+    parser.add_argument("--browser", action="store_true", help="load each fixture in headless Chrome")
+    args = parser.parse_args()
+
+    report = check_fixtures(browser=args.browser)
+    for name, problems in report.items():
+        adapter = BOARDS_BY_NAME[name]
+        mapped = sum(len(mapping) for mapping in adapter.system_fields.values())
+        print(f"{'✅' if not problems else '❌'} {name}: {mapped} system field keys")
+        for problem in problems:
+            print(f"   ⚠️  {problem}")
+    return 1 if any(report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Chrome launch profiles and per-session resource metrics
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import urlparse
+
+from fill_log import get_fill_logger
+
+log = get_fill_logger()
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Third-party scripts that never matter for filling a form
+ANALYTICS_URL_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*segment.io*", "*segment.com*", "*hotjar.com*", "*fullstory.com*",
+    "*mixpanel.com*", "*amplitude.com*", "*intercom.io*", "*facebook.net*",
+]
+
+# Media and fonts are blocked by extension; images are also disabled in renderer settings
+MEDIA_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.wav", "*.ogg",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
+
+# Chrome's HTTP cache is single-process, so every browser gets its own cache directory.
+# New ones start as a copy of the template: the cache of the first browser that quit,
+# so JS bundles and stylesheets are already on disk for later sessions. Delete the
+# directory to re-warm it.
+DISK_CACHE_ROOT = ".chrome_cache"
+DISK_CACHE_TEMPLATE_DIR = os.path.join(DISK_CACHE_ROOT, "template")
+DISK_CACHE_SESSIONS_DIR = os.path.join(DISK_CACHE_ROOT, "sessions")
+
+# Per job-board adjustments to the launch profile's blocked_urls. "block" adds patterns
+# for that board; "allow" removes profile patterns the board needs to render its form.
+# Keys match the posting's host or any parent domain. Policies apply to every launch
+# profile, including the visible review browser, so nothing a user needs to submit
+# (such as the reCAPTCHA challenge frame) may be blocked here.
+DOMAIN_REQUEST_POLICIES = {
+    "ashbyhq.com": {
+        # Datadog RUM posts to browser-intake-<site> hosts (datadoghq.com, .eu, us5-...)
+        "block": ["*sentry.io*", "*datadoghq.com*", "*://browser-intake-*"],
+        "allow": [],
+    },
+    "greenhouse.io": {
+        "block": ["*sentry.io*", "*cdn.heapanalytics.com*"],
+        "allow": [],
+    },
+    "lever.co": {
+        "block": ["*sentry.io*", "*cdn.segment.com*"],
+        "allow": [],
+    },
+    "myworkdayjobs.com": {
+        "block": ["*sentry.io*"],
+        # Workday draws its form controls with web fonts and inline SVG sprites
+        "allow": ["*.woff", "*.woff2", "*.svg"],
+    },
+}
+
+LAUNCH_PROFILES = {
+    # Visible, maximized browser for demos and manual review
+    "default": {
+        "headless": False,
+        "window_size": None,
+        "block_images": False,
+        "blocked_urls": [],
+        "extra_args": [],
+        "scroll_into_view": True,
+        "seeded_disk_cache": False,
+        "network_stats": False,
+    },
+    # Headless, trimmed browser for build boxes and batch runs
+    "throughput": {
+        "headless": True,
+        "window_size": (1024, 768),
+        "block_images": True,
+        "blocked_urls": ANALYTICS_URL_PATTERNS + MEDIA_URL_PATTERNS,
+        "extra_args": [
+            "--mute-audio",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-renderer-backgrounding",
+            "--autoplay-policy=user-gesture-required",
+            "--blink-settings=imagesEnabled=false",
+        ],
+        "scroll_into_view": False,
+        "seeded_disk_cache": True,
+        "network_stats": True,
+    },
+}
+
+# Navigation timing of the current page, in milliseconds
+_PAGE_TIMING_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+if (!nav) return null;
+return {
+    dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd),
+    load_ms: Math.round(nav.loadEventEnd),
+    transfer_bytes: nav.transferSize + resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0),
+    resources: resources.length
+};
+"""
+
+
+def get_launch_profile(name):
+    """Launch profile settings by name"""
+    if name not in LAUNCH_PROFILES:
+        raise ValueError(f"Unknown launch profile '{name}' (choose from {', '.join(LAUNCH_PROFILES)})")
+    return LAUNCH_PROFILES[name]
+
+
+def session_disk_cache_dir():
+    """New private disk cache directory for one browser, seeded from the template when there is one"""
+    os.makedirs(DISK_CACHE_SESSIONS_DIR, exist_ok=True)
+    path = tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=DISK_CACHE_SESSIONS_DIR)
+    template = os.path.abspath(DISK_CACHE_TEMPLATE_DIR)
+    if os.path.isdir(template):
+        try:
+            shutil.copytree(template, path, dirs_exist_ok=True)
+        except (OSError, shutil.Error) as e:
+            log.warning("⚠️  Could not seed the disk cache: %s", e)
+    return os.path.abspath(path)
+
+
+def retire_disk_cache(path):
+    """After its browser quit: keep a session's cache as the template if there is none yet, else delete it"""
+    template = os.path.abspath(DISK_CACHE_TEMPLATE_DIR)
+    # A browser that never loaded anything would leave an empty template behind
+    warmed = any(files for _, _, files in os.walk(path))
+    if warmed and not os.path.exists(template):
+        try:
+            # Atomic, so concurrent browsers quitting at once can't leave a half-copied template
+            os.rename(path, template)
+            return
+        except OSError:
+            pass
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def build_chrome_options(launch_profile="default", headless=False, user_data_dir=None, disk_cache_dir=None):
+    """Chrome options for a launch profile (disk_cache_dir: the browser's own cache, see session_disk_cache_dir())"""
+    from selenium.webdriver.chrome.options import Options
+
+    profile = get_launch_profile(launch_profile)
+    options = Options()
+    if user_data_dir:
+        # Persistent profile keeps cookies and the HTTP cache between launches
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if headless or profile["headless"]:
+        options.add_argument("--headless=new")
+        width, height = profile["window_size"] or (1280, 900)
+        options.add_argument(f"--window-size={width},{height}")
+    elif profile["window_size"]:
+        options.add_argument("--window-size={},{}".format(*profile["window_size"]))
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    for arg in profile["extra_args"]:
+        options.add_argument(arg)
+    if profile["block_images"]:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if disk_cache_dir:
+        options.add_argument(f"--disk-cache-dir={disk_cache_dir}")
+    if profile["network_stats"]:
+        # Network events land in the performance log, which collect_network_stats() drains
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def apply_network_blocking(driver, launch_profile="default"):
+    """Block the profile's URL patterns through the DevTools protocol; returns the pattern count"""
+    patterns = get_launch_profile(launch_profile)["blocked_urls"]
+    if not patterns:
+        return 0
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver._blocked_patterns = list(patterns)
+    except Exception as e:
+        log.warning("⚠️  Could not enable request blocking: %s", e)
+        return 0
+    return len(patterns)
+
+
+def match_domain(url, table):
+    """Key of table matching url's host or its closest parent domain, or None"""
+    host = (urlparse(url).hostname or "").lower()
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        domain = ".".join(parts[i:])
+        if domain in table:
+            return domain
+    return None
+
+
+def domain_policy(url):
+    """Request policy for the job board hosting url, or None"""
+    return DOMAIN_REQUEST_POLICIES.get(match_domain(url, DOMAIN_REQUEST_POLICIES))
+
+
+def blocked_patterns(url, launch_profile="default"):
+    """URL patterns to block while loading url: the profile's list adjusted by the board's policy"""
+    patterns = list(get_launch_profile(launch_profile)["blocked_urls"])
+    policy = domain_policy(url)
+    if policy:
+        allowed = set(policy["allow"])
+        patterns = [p for p in patterns if p not in allowed] + [p for p in policy["block"] if p not in patterns]
+    return patterns
+
+
+def apply_request_policy(driver, url, launch_profile="default"):
+    """Set the blocked URL list for the board about to be loaded; returns the pattern count"""
+    patterns = blocked_patterns(url, launch_profile)
+    # Skip the DevTools round trip when the previous posting used the same list
+    if getattr(driver, "_blocked_patterns", None) == patterns:
+        return len(patterns)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver._blocked_patterns = patterns
+    except Exception as e:
+        log.warning("⚠️  Could not apply request policy: %s", e)
+        return 0
+    return len(patterns)
+
+
+def drain_network_log(driver):
+    """Network events logged since the last call (empty when network_stats is off)"""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            events.append(message)
+    return events
+
+
+def collect_network_stats(driver):
+    """Requests and bytes for the page just loaded, and how many were saved by blocking or the disk cache"""
+    events = drain_network_log(driver)
+    if not events:
+        return {}
+    stats = {"requests": 0, "blocked_requests": 0, "cached_requests": 0,
+             "bytes_downloaded": 0, "bytes_from_cache": 0}
+    cached = set()
+    sizes = {}
+    for event in events:
+        method, params = event["method"], event.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            if response.get("fromDiskCache"):
+                cached.add(params.get("requestId"))
+                length = (response.get("headers") or {}).get("content-length") or \
+                    (response.get("headers") or {}).get("Content-Length")
+                if length and str(length).isdigit():
+                    sizes[params.get("requestId")] = int(length)
+        elif method == "Network.loadingFinished":
+            if params.get("requestId") not in cached:
+                stats["bytes_downloaded"] += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason") or "BLOCKED_BY_CLIENT" in params.get("errorText", ""):
+                stats["blocked_requests"] += 1
+    stats["cached_requests"] = len(cached)
+    stats["bytes_from_cache"] = sum(sizes.get(request_id, 0) for request_id in cached)
+    return stats
+
+
+def _browser_rss_bytes(driver):
+    """Resident memory of the browser process tree behind a chromedriver service"""
+    service_process = getattr(getattr(driver, "service", None), "process", None)
+    if not PSUTIL_AVAILABLE or service_process is None:
+        return None
+    try:
+        root = psutil.Process(service_process.pid)
+        processes = root.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes if p.is_running())
+    except psutil.Error:
+        return None
+
+
+def collect_session_metrics(driver):
+    """Memory per session and page-load timing for the current page"""
+    metrics = {"browser_rss_mb": None, "js_heap_mb": None}
+    rss = _browser_rss_bytes(driver)
+    if rss is not None:
+        metrics["browser_rss_mb"] = round(rss / 1024 / 1024, 1)
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        performance = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        values = {m["name"]: m["value"] for m in performance.get("metrics", [])}
+        if "JSHeapUsedSize" in values:
+            metrics["js_heap_mb"] = round(values["JSHeapUsedSize"] / 1024 / 1024, 1)
+    except Exception:
+        pass
+    try:
+        metrics.update(driver.execute_script(_PAGE_TIMING_JS) or {})
+    except Exception:
+        pass
+    metrics.update(collect_network_stats(driver))
+    return metrics
+
+
+def format_session_metrics(metrics):
+    """One-line summary of collect_session_metrics() output"""
+    parts = []
+    if metrics.get("browser_rss_mb") is not None:
+        parts.append(f"browser RSS {metrics['browser_rss_mb']} MB")
+    if metrics.get("js_heap_mb") is not None:
+        parts.append(f"JS heap {metrics['js_heap_mb']} MB")
+    if metrics.get("load_ms") is not None:
+        parts.append(f"load {metrics['load_ms']} ms (DCL {metrics['dom_content_loaded_ms']} ms)")
+    if metrics.get("transfer_bytes") is not None:
+        parts.append(f"{metrics['resources']} resources, {metrics['transfer_bytes'] // 1024} KB")
+    if metrics.get("requests") is not None:
+        parts.append(f"{metrics['requests']} requests, {metrics['bytes_downloaded'] // 1024} KB downloaded, "
+                     f"saved {metrics['blocked_requests']} blocked + {metrics['cached_requests']} cached "
+                     f"({metrics['bytes_from_cache'] // 1024} KB from disk cache)")
+    return ", ".join(parts) or "no metrics available"
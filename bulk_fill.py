@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Bulk value injection: set every field value in a single script call
+"""
+
+# Radios and checkboxes hold their state in `checked`; their `value` is the static option value
+CHECKABLE_INPUT_TYPES = ("radio", "checkbox")
+
+# Sets each value through the native prototype setter so React's value tracker
+# sees a real change, fires input/change/blur, then verifies after the page has
+# had a chance to re-render. Radios and checkboxes are clicked (if not already
+# checked) and verified by their checked state. Runs as an async script so
+# verification costs no extra round trip.
+INJECT_VALUES_JS = """
+var assignments = arguments[0];
+var done = arguments[arguments.length - 1];
+var CHECKED = {};
+
+function checkable(el) {
+    return el.tagName === 'INPUT' && (el.type === 'radio' || el.type === 'checkbox');
+}
+
+function normalize(value) {
+    return (value || '').replace(/\\r\\n/g, '\\n');
+}
+
+function nativeSetter(el) {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+        : el.tagName === 'SELECT' ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    return Object.getOwnPropertyDescriptor(proto, 'value').set;
+}
+
+var expected = [];
+for (var i = 0; i < assignments.length; i++) {
+    var el = assignments[i].element;
+    var value = assignments[i].value;
+    try {
+        if (checkable(el)) {
+            // A click toggles the state and fires the events frameworks listen for
+            if (!el.checked) el.click();
+            expected.push(CHECKED);
+            continue;
+        }
+        if (el.tagName === 'SELECT') {
+            var match = null;
+            for (var j = 0; j < el.options.length; j++) {
+                if (el.options[j].text.trim() === value) { match = el.options[j]; break; }
+            }
+            if (!match) { expected.push(null); continue; }
+            value = match.value;
+        }
+        if (el.focus) el.focus({preventScroll: true});
+        nativeSetter(el).call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        if (el.blur) el.blur();
+        expected.push(value);
+    } catch (e) {
+        expected.push(null);
+    }
+}
+
+setTimeout(function () {
+    done(assignments.map(function (a, k) {
+        try {
+            if (expected[k] === null || !a.element.isConnected) return false;
+            if (expected[k] === CHECKED) return a.element.checked;
+            return normalize(a.element.value) === normalize(expected[k]);
+        } catch (e) {
+            return false;
+        }
+    }));
+}, 50);
+"""
+
+# Current value of each element as the filler would compare it: option text for
+# selects, the option value of a checked radio/checkbox ('' while unchecked),
+# null for file inputs and detached elements
+READ_VALUES_JS = """
+return arguments[0].map(function (el) {
+    if (!el || !el.isConnected || el.type === 'file') return null;
+    if (el.type === 'radio' || el.type === 'checkbox') return el.checked ? (el.value || 'on') : '';
+    if (el.tagName === 'SELECT') {
+        var opt = el.options[el.selectedIndex];
+        return opt ? (opt.text || '').trim() : '';
+    }
+    return (el.value || '').replace(/\\r\\n/g, '\\n');
+});
+"""
+
+
+def inject_values(driver, assignments):
+    """Set all (element, value) pairs in one call; returns a committed flag per pair"""
+    if not assignments:
+        return []
+    payload = [{"element": element, "value": value} for element, value in assignments]
+    results = driver.execute_async_script(INJECT_VALUES_JS, payload)
+    return [bool(ok) for ok in (results or [False] * len(assignments))]
+
+
+def read_values(driver, elements):
+    """Current value of every element in one call (None where it can't be read)"""
+    if not elements:
+        return []
+    return driver.execute_script(READ_VALUES_JS, list(elements)) or [None] * len(elements)
+
+
+def value_matches(current, target, input_type=""):
+    """Whether a field already holds the target value
+
+    A radio or checkbox holds it only while checked (read_values gives '' otherwise);
+    any checked state satisfies a target, since filling one means checking it.
+    """
+    if current is None or not target:
+        return False
+    if input_type in CHECKABLE_INPUT_TYPES:
+        return current != ""
+    return current.replace("\r\n", "\n").strip() == str(target).replace("\r\n", "\n").strip()
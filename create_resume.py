@@ -3,83 +3,140 @@
 Create a sample PDF resume for testing form uploads
 """
 
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
-def create_pdf_resume_reportlab():
+import importlib.util
+
+# reportlab takes ~150 ms to import, so it is only checked for here and imported
+# when a PDF is actually generated
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+
+
+def _default_profile(profile):
+    if profile is None:
+        from enhanced_form_filler import DEFAULT_PROFILE
+        return DEFAULT_PROFILE
+    return profile
+
+
+def _bare_url(url):
+    return (url or "").replace("https://", "").replace("http://", "")
+
+
+def resume_filename(profile, extension=".pdf"):
+    """Default resume file name for a profile, e.g. Taylor_Johnson_QA_Resume.pdf"""
+    return f"{profile['full_name'].replace(' ', '_')}_QA_Resume{extension}"
+
+
+# Sections printed the same on every resume: (style name, markup) pairs, a None style is a spacer height
+STATIC_SECTIONS = [
+    ("heading", "Experience"),
+    ("normal", "<b>Senior QA Engineer</b> | TechTravel Inc. | 2021 - Present"),
+    ("normal", "• Led automated testing initiatives, reducing regression testing time by 60%"),
+    ("normal", "• Implemented comprehensive test suites for mobile and web applications"),
+    ("normal", "• Collaborated with cross-functional teams to ensure quality deliverables"),
+    (None, 10),
+    ("normal", "<b>QA Engineer</b> | Digital Solutions LLC | 2019 - 2021"),
+    ("normal", "• Developed and maintained automated test scripts using Selenium and Cypress"),
+    ("normal", "• Performed API testing and database validation"),
+    ("normal", "• Created detailed test documentation and bug reports"),
+    (None, 15),
+    ("heading", "Technical Skills"),
+    ("normal", "• Testing Frameworks: Selenium, Cypress, Jest, PyTest"),
+    ("normal", "• Programming: Python, JavaScript, Java"),
+    ("normal", "• Tools: JIRA, TestRail, Postman, Git, Jenkins"),
+    ("normal", "• Platforms: Web, Mobile (iOS/Android), API Testing"),
+    (None, 15),
+    ("heading", "Education"),
+    ("normal", "Bachelor of Science in Computer Science | University of Technology | 2019"),
+]
+
+
+def _escape(text):
+    """Profile text as Paragraph markup"""
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+class ResumeTemplate:
+    """Page setup and paragraph styles built once; render() lays out one profile per call"""
+
+    def __init__(self):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+        self._document, self._paragraph, self._spacer = SimpleDocTemplate, Paragraph, Spacer
+        self.pagesize = letter
+        styles = getSampleStyleSheet()
+        self.styles = {
+            "title": ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18, spaceAfter=30),
+            "heading": styles['Heading2'],
+            "normal": styles['Normal'],
+        }
+
+    def _flowable(self, style, markup):
+        if style is None:
+            return self._spacer(1, markup)
+        return self._paragraph(markup, self.styles[style])
+
+    def sections(self, profile):
+        """(style, markup) pairs of the whole resume for a profile"""
+        return [
+            ("title", _escape(profile["full_name"])),
+            ("heading", "Quality Assurance Engineer"),
+            (None, 12),
+            ("normal", _escape(f"📧 {profile['email']} | 📞 {profile['phone']}")),
+            ("normal", _escape(f"🔗 {_bare_url(profile.get('linkedin'))} | 💻 {_bare_url(profile.get('github'))} | "
+                               f"🌐 {_bare_url(profile.get('portfolio'))}")),
+            (None, 20),
+            ("heading", "Professional Summary"),
+            ("normal", f"Dedicated Quality Assurance Engineer with {_escape(profile.get('experience', '5'))} years of "
+                       "experience in automated testing, manual testing, and quality assurance processes. Expertise in "
+                       "testing frameworks, cross-platform testing, and ensuring exceptional user experiences in travel "
+                       "technology platforms."),
+            (None, 15),
+        ] + STATIC_SECTIONS
+
+    def render(self, profile, output_path):
+        """Write the PDF resume for a profile; returns output_path"""
+        doc = self._document(output_path, pagesize=self.pagesize)
+        doc.build([self._flowable(style, markup) for style, markup in self.sections(profile)])
+        return output_path
+
+
+_template = None
+
+
+def resume_template():
+    """The process-wide ResumeTemplate, built on first use"""
+    global _template
+    if _template is None:
+        _template = ResumeTemplate()
+    return _template
+
+
+def create_pdf_resume_reportlab(profile=None, output_path=None):
     """Create PDF resume using reportlab"""
-    doc = SimpleDocTemplate("Taylor_Johnson_QA_Resume.pdf", pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Title
-    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18, spaceAfter=30)
-    story.append(Paragraph("Taylor Johnson", title_style))
-    story.append(Paragraph("Quality Assurance Engineer", styles['Heading2']))
-    story.append(Spacer(1, 12))
-    
-    # Contact Info
-    story.append(Paragraph("📧 taylor.johnson@example.com | 📞 (555) 123-4567", styles['Normal']))
-    story.append(Paragraph("🔗 linkedin.com/in/taylorjohnson | 💻 github.com/taylorjohnson | 🌐 taylorjohnson.dev", styles['Normal']))
-    story.append(Spacer(1, 20))
-    
-    # Professional Summary
-    story.append(Paragraph("Professional Summary", styles['Heading2']))
-    story.append(Paragraph("Dedicated Quality Assurance Engineer with 5 years of experience in automated testing, "
-                          "manual testing, and quality assurance processes. Expertise in testing frameworks, "
-                          "cross-platform testing, and ensuring exceptional user experiences in travel technology platforms.", 
-                          styles['Normal']))
-    story.append(Spacer(1, 15))
-    
-    # Experience
-    story.append(Paragraph("Experience", styles['Heading2']))
-    story.append(Paragraph("<b>Senior QA Engineer</b> | TechTravel Inc. | 2021 - Present", styles['Normal']))
-    story.append(Paragraph("• Led automated testing initiatives, reducing regression testing time by 60%", styles['Normal']))
-    story.append(Paragraph("• Implemented comprehensive test suites for mobile and web applications", styles['Normal']))
-    story.append(Paragraph("• Collaborated with cross-functional teams to ensure quality deliverables", styles['Normal']))
-    story.append(Spacer(1, 10))
-    
-    story.append(Paragraph("<b>QA Engineer</b> | Digital Solutions LLC | 2019 - 2021", styles['Normal']))
-    story.append(Paragraph("• Developed and maintained automated test scripts using Selenium and Cypress", styles['Normal']))
-    story.append(Paragraph("• Performed API testing and database validation", styles['Normal']))
-    story.append(Paragraph("• Created detailed test documentation and bug reports", styles['Normal']))
-    story.append(Spacer(1, 15))
-    
-    # Skills
-    story.append(Paragraph("Technical Skills", styles['Heading2']))
-    story.append(Paragraph("• Testing Frameworks: Selenium, Cypress, Jest, PyTest", styles['Normal']))
-    story.append(Paragraph("• Programming: Python, JavaScript, Java", styles['Normal']))
-    story.append(Paragraph("• Tools: JIRA, TestRail, Postman, Git, Jenkins", styles['Normal']))
-    story.append(Paragraph("• Platforms: Web, Mobile (iOS/Android), API Testing", styles['Normal']))
-    story.append(Spacer(1, 15))
-    
-    # Education
-    story.append(Paragraph("Education", styles['Heading2']))
-    story.append(Paragraph("Bachelor of Science in Computer Science | University of Technology | 2019", styles['Normal']))
-    
-    doc.build(story)
-    print("✅ PDF resume created: Taylor_Johnson_QA_Resume.pdf")
+    profile = _default_profile(profile)
+    output_path = output_path or resume_filename(profile)
+    resume_template().render(profile, output_path)
+    print(f"✅ PDF resume created: {output_path}")
+    return output_path
 
-def create_text_resume():
+def create_text_resume(profile=None, output_path=None):
     """Create a simple text resume if reportlab not available"""
-    resume_content = """TAYLOR JOHNSON
+    profile = _default_profile(profile)
+    output_path = output_path or resume_filename(profile, ".txt")
+    resume_content = f"""{profile['full_name'].upper()}
 Quality Assurance Engineer
 
 Contact Information:
-Email: taylor.johnson@example.com
-Phone: (555) 123-4567
-LinkedIn: linkedin.com/in/taylorjohnson
-GitHub: github.com/taylorjohnson
-Portfolio: taylorjohnson.dev
+Email: {profile['email']}
+Phone: {profile['phone']}
+LinkedIn: {_bare_url(profile.get('linkedin'))}
+GitHub: {_bare_url(profile.get('github'))}
+Portfolio: {_bare_url(profile.get('portfolio'))}
 
 PROFESSIONAL SUMMARY
-Dedicated Quality Assurance Engineer with 5 years of experience in automated testing, 
+Dedicated Quality Assurance Engineer with {profile.get('experience', '5')} years of experience in automated testing, 
 manual testing, and quality assurance processes. Expertise in testing frameworks, 
 cross-platform testing, and ensuring exceptional user experiences in travel technology platforms.
 
@@ -115,10 +172,11 @@ PROJECTS
 • API Testing Framework: Built robust API testing solution using Python and Postman
 """
     
-    with open("Taylor_Johnson_QA_Resume.txt", "w") as f:
+    with open(output_path, "w") as f:
         f.write(resume_content)
-    print("✅ Text resume created: Taylor_Johnson_QA_Resume.txt")
+    print(f"✅ Text resume created: {output_path}")
     print("⚠️  Note: PDF version not available (reportlab not installed)")
+    return output_path
 
 def main():
     print("📄 Creating Sample Resume for Form Upload Testing")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Per-domain batch scheduling: token-bucket start rates, concurrency caps, priority queues and backoff
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from browser_profiles import match_domain
+
+# Starts per second (rate), how many may start back to back (burst) and how many
+# postings of one board may be in flight at once. Keys match the host or a parent domain;
+# other hosts get DEFAULT_DOMAIN_LIMITS, each host counted separately.
+DEFAULT_DOMAIN_LIMITS = {"rate": 1.0, "burst": 2, "max_concurrent": 2}
+DOMAIN_LIMITS = {
+    "ashbyhq.com": {"rate": 0.5, "burst": 2, "max_concurrent": 3},
+    "greenhouse.io": {"rate": 0.5, "burst": 2, "max_concurrent": 3},
+    "lever.co": {"rate": 0.5, "burst": 2, "max_concurrent": 3},
+    "myworkdayjobs.com": {"rate": 0.2, "burst": 1, "max_concurrent": 2},
+}
+
+# Latency samples kept per domain for the slow-load baseline and the metrics
+LATENCY_WINDOW = 50
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available (0 if one is available now)"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class DomainState:
+    """Queue, limits, backoff and latency history of one domain"""
+
+    def __init__(self, name, limits, now):
+        self.name = name
+        self.base_rate = limits["rate"]
+        self.max_concurrent = limits["max_concurrent"]
+        self.bucket = TokenBucket(limits["rate"], limits["burst"], now)
+        self.queue = []
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.slow = 0
+        self.backoffs = 0
+        self.backoff_until = 0.0
+        self.streak = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def ready_at(self, now):
+        """When this domain may start its next job (now or later), or None if it can't until one finishes"""
+        if not self.queue or self.in_flight >= self.max_concurrent:
+            return None
+        return max(now + self.bucket.wait_time(now), self.backoff_until)
+
+    def baseline(self):
+        """Median of recent latencies: what a normal load of this domain takes"""
+        ordered = sorted(self.latencies)
+        return ordered[len(ordered) // 2] if ordered else None
+
+    def metrics(self):
+        ordered = sorted(self.latencies)
+        return {
+            "queued": len(self.queue),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "slow": self.slow,
+            "backoffs": self.backoffs,
+            "rate": round(self.bucket.rate, 3),
+            "latency_avg": round(sum(ordered) / len(ordered), 3) if ordered else None,
+            "latency_p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else None,
+        }
+
+
+class DomainScheduler:
+    """Hands jobs to worker threads as their domain's rate, concurrency cap and backoff allow
+
+    Within a domain lower priority numbers go first (FIFO among equals); across domains
+    the ready head with the lowest priority wins. Failures and loads slower than
+    slow_factor x the domain's median back the domain off exponentially and halve its
+    start rate; successes restore the rate step by step (additive increase,
+    multiplicative decrease), so each board is pushed only as hard as it keeps up with.
+    """
+
+    def __init__(self, limits=None, default_limits=None, slow_factor=2.0, base_backoff=2.0, max_backoff=60.0,
+                 min_rate_factor=0.25, clock=time.monotonic):
+        self.limits = DOMAIN_LIMITS if limits is None else limits
+        self.default_limits = dict(DEFAULT_DOMAIN_LIMITS, **(default_limits or {}))
+        self.slow_factor = slow_factor
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_rate_factor = min_rate_factor
+        self.clock = clock
+        self.domains = {}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._closed = False
+
+    def domain_for(self, url):
+        """Scheduling key of a URL: its configured board domain, else its host"""
+        return match_domain(url, self.limits) or (urlparse(url).hostname or "").lower()
+
+    def _state(self, domain):
+        state = self.domains.get(domain)
+        if state is None:
+            limits = dict(self.default_limits, **self.limits.get(domain, {}))
+            state = self.domains[domain] = DomainState(domain, limits, self.clock())
+        return state
+
+    def submit(self, url, item, priority=0):
+        """Queue an item (anything) for url's domain; lower priority numbers run first"""
+        with self._condition:
+            state = self._state(self.domain_for(url))
+            heapq.heappush(state.queue, (priority, next(self._sequence), item))
+            self._condition.notify()
+
+    def close(self):
+        """No more submissions; next_job() returns None once everything queued has finished"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _pending(self):
+        return any(state.queue or state.in_flight for state in self.domains.values())
+
+    def next_job(self, timeout=None):
+        """Block until some domain may start a job; returns (domain, item), or None when closed and drained"""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._condition:
+            while True:
+                now = self.clock()
+                best = None
+                wake = None
+                for state in self.domains.values():
+                    ready = state.ready_at(now)
+                    if ready is None:
+                        continue
+                    if ready <= now:
+                        if best is None or state.queue[0][:2] < best.queue[0][:2]:
+                            best = state
+                    elif wake is None or ready < wake:
+                        wake = ready
+                if best:
+                    best.bucket.take(now)
+                    best.in_flight += 1
+                    return best.name, heapq.heappop(best.queue)[2]
+                if self._closed and not self._pending():
+                    return None
+                if deadline is not None:
+                    if now >= deadline:
+                        return None
+                    wake = deadline if wake is None else min(wake, deadline)
+                self._condition.wait(None if wake is None else max(0.0, wake - now))
+
+    def done(self, domain, seconds, success, requeue=None, url=None, priority=0):
+        """Report a finished job; a failed job can be requeued (for url) in the same step"""
+        with self._condition:
+            state = self.domains[domain]
+            state.in_flight -= 1
+            now = self.clock()
+            baseline = state.baseline()
+            slow = success and baseline is not None and len(state.latencies) >= 3 and \
+                seconds > self.slow_factor * baseline
+            if success:
+                state.completed += 1
+                state.latencies.append(seconds)
+            else:
+                state.failed += 1
+            if slow:
+                state.slow += 1
+            if success and not slow:
+                state.streak = 0
+                # Additive increase back towards the configured rate
+                state.bucket.rate = min(state.base_rate, state.bucket.rate + 0.1 * state.base_rate)
+            else:
+                state.streak += 1
+                state.backoffs += 1
+                state.backoff_until = now + min(self.max_backoff, self.base_backoff * 2 ** (state.streak - 1))
+                # Multiplicative decrease of the start rate
+                state.bucket.rate = max(self.min_rate_factor * state.base_rate, state.bucket.rate / 2)
+            if requeue is not None:
+                heapq.heappush(self._state(self.domain_for(url) if url else domain).queue,
+                               (priority, next(self._sequence), requeue))
+            self._condition.notify_all()
+
+    def metrics(self):
+        """Live snapshot: total queue depth and in-flight count, plus per-domain state and latency"""
+        with self._condition:
+            domains = {name: state.metrics() for name, state in self.domains.items()}
+        return {
+            "queued": sum(d["queued"] for d in domains.values()),
+            "in_flight": sum(d["in_flight"] for d in domains.values()),
+            "domains": domains,
+        }
+
+
+def format_scheduler_metrics(metrics):
+    """One-line summary of a metrics() snapshot"""
+    parts = [f"queue {metrics['queued']}", f"in flight {metrics['in_flight']}"]
+    for name, d in metrics["domains"].items():
+        latency = f", avg {d['latency_avg']}s" if d["latency_avg"] is not None else ""
+        parts.append(f"{name}: {d['in_flight']} running, {d['queued']} queued{latency}, {d['rate']}/s")
+    return " | ".join(parts)
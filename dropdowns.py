@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Dropdown filling by option index: native <select> elements and ARIA comboboxes
+"""
+
+from field_rules import OptionIndex, choose_option
+
+# Selects an option by position through the native value setter (so React's value
+# tracker sees the change) and fires the events a user's choice would; returns the
+# selected option's text, or null if the position no longer exists
+SELECT_BY_INDEX_JS = """
+var el = arguments[0], index = arguments[1];
+var option = el.options[index];
+if (!option) return null;
+var setter = Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set;
+if (el.focus) el.focus({preventScroll: true});
+setter.call(el, option.value);
+// Options sharing a value: make sure the requested one is the selected one
+if (el.selectedIndex !== index) el.selectedIndex = index;
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+if (el.blur) el.blur();
+return (el.options[el.selectedIndex].text || '').trim();
+"""
+
+# Options of an open combobox: the listbox it controls, else any visible listbox
+COMBOBOX_OPTIONS_JS = """
+var el = arguments[0];
+function visible(node) { return node.getClientRects().length > 0; }
+var ids = [el].concat(Array.prototype.slice.call(el.querySelectorAll('[aria-controls], [aria-owns]')))
+    .map(function (node) { return node.getAttribute('aria-controls') || node.getAttribute('aria-owns') || ''; })
+    .join(' ').split(/\\s+/).filter(Boolean);
+var listboxes = ids.map(function (id) { return document.getElementById(id); }).filter(Boolean);
+if (!listboxes.length) {
+    listboxes = Array.prototype.filter.call(document.querySelectorAll('[role=listbox]'), visible);
+}
+var options = [];
+listboxes.forEach(function (listbox) {
+    Array.prototype.forEach.call(listbox.querySelectorAll('[role=option]'), function (opt) {
+        if (!visible(opt)) return;
+        options.push({
+            element: opt,
+            text: (opt.innerText || opt.textContent || '').trim(),
+            value: opt.getAttribute('data-value') || '',
+            disabled: opt.getAttribute('aria-disabled') === 'true'
+        });
+    });
+});
+return options.length ? options : null;
+"""
+
+# Picks a combobox option the way a pointer would (most widgets listen for mousedown)
+CLICK_OPTION_JS = """
+var option = arguments[0];
+option.scrollIntoView({block: 'nearest'});
+['pointerdown', 'mousedown', 'pointerup', 'mouseup', 'click'].forEach(function (type) {
+    option.dispatchEvent(new MouseEvent(type, {bubbles: true, cancelable: true, view: window}));
+});
+"""
+
+# True once the combobox (or the control wrapping it) displays the chosen text
+COMBOBOX_SHOWS_JS = """
+var el = arguments[0], expected = arguments[1].toLowerCase();
+var node = el;
+for (var depth = 0; node && depth < 3; depth++, node = node.parentElement) {
+    var shown = ((node.value || '') + ' ' + (node.innerText || '')).toLowerCase();
+    if (shown.indexOf(expected) !== -1) return true;
+}
+return false;
+"""
+
+
+def select_by_index(driver, field, value):
+    """Select the option of a <select> field matching value; returns the selected text or None"""
+    position, _ = OptionIndex(field.get("options", [])).best(value)
+    if position is None:
+        return None
+    return driver.execute_script(SELECT_BY_INDEX_JS, field["element"], position)
+
+
+def fill_combobox(driver, waiter, field, target, text=""):
+    """Open a combobox, pick the option matching target and confirm it is shown; returns the option text or None"""
+    element = field["element"]
+    element.click()
+    options = waiter.script_result("combobox_options", COMBOBOX_OPTIONS_JS, element, timeout=2)
+    if not options and field["tag"] == "input":
+        # Typeahead comboboxes only list options once something is typed
+        element.send_keys(target)
+        options = waiter.script_result("combobox_options", COMBOBOX_OPTIONS_JS, element, timeout=3)
+    if not options:
+        return None
+
+    texts = [opt["text"] for opt in options]
+    _, chosen = choose_option(texts, text, target)
+    if chosen is None:
+        return None
+    position = OptionIndex(options).position(chosen)
+    if position is None:
+        return None
+    driver.execute_script(CLICK_OPTION_JS, options[position]["element"])
+    shown = waiter.script_result("combobox_committed", COMBOBOX_SHOWS_JS, element, chosen, timeout=3)
+    return chosen if shown else None
@@ -3,36 +3,50 @@
 Enhanced Form Filler with Contextual Responses and Resume Upload
 """
 
+import argparse
 import json
-import time
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import shutil
+import sys
+import time
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from page_waits import PageWaiter, UPLOAD_SHOWS_FILENAME_JS
+from field_discovery import discover_fields, describe_field, is_fillable, resolve_fields
+from bulk_fill import CHECKABLE_INPUT_TYPES, inject_values, read_values, value_matches
+from progress_journal import field_key
+from fill_plan import resolve_plan
+from field_rules import FIELD_CLASSIFIER, SELECT_CLASSIFIER, choose_option, rule_target
+from dropdowns import select_by_index, fill_combobox
+from handle_cache import HandleCache
+from schema_cache import form_fingerprint, fingerprint_fields, values_key
+from browser_profiles import (build_chrome_options, apply_network_blocking, apply_request_policy, get_launch_profile,
+                              drain_network_log, collect_session_metrics, format_session_metrics,
+                              session_disk_cache_dir, retire_disk_cache)
+from fill_trace import FillTracer, NULL_TRACER
+from fill_log import get_fill_logger, configure_logging, add_logging_arguments, logging_options
+from semantic_matcher import SemanticMatcher, SEMANTIC_RULE_PREFIX, NUMPY_AVAILABLE
+from board_adapters import detect_board, GENERIC_BOARD, RESUME_TARGET, SYSTEM_RULE_PREFIX
+from resume_pipeline import validate_resume
 
-class EnhancedFormFiller:
-    """Enhanced form filler with contextual responses and file upload"""
-    
-    def __init__(self):
-        self.driver = None
-        self.profile = {
-            "full_name": "Taylor Johnson",
-            "first_name": "Taylor", 
-            "last_name": "Johnson",
-            "email": "taylor.johnson@example.com",
-            "phone": "(555) 123-4567",
-            "linkedin": "https://linkedin.com/in/taylorjohnson",
-            "github": "https://github.com/taylorjohnson",
-            "portfolio": "https://taylorjohnson.dev",
-            "salary": "$100k",
-            "experience": "5"
-        }
-        
-        # Enhanced contextual responses
-        self.responses = {
-            "cover_letter": """Dear Hiring Manager,
+WANDER_URL = "https://jobs.ashbyhq.com/wander/121c24e0-eeff-49a8-ac56-793d2dbc9fcd/application"
+DEFAULT_RESUME_FILENAME = "Taylor_Johnson_QA_Resume.pdf"
+
+DEFAULT_PROFILE = {
+    "full_name": "Taylor Johnson",
+    "first_name": "Taylor", 
+    "last_name": "Johnson",
+    "email": "taylor.johnson@example.com",
+    "phone": "(555) 123-4567",
+    "linkedin": "https://linkedin.com/in/taylorjohnson",
+    "github": "https://github.com/taylorjohnson",
+    "portfolio": "https://taylorjohnson.dev",
+    "salary": "$100k",
+    "experience": "5"
+}
+
+# Enhanced contextual responses
+DEFAULT_RESPONSES = {
+    "cover_letter": """Dear Hiring Manager,
 
 I am excited to apply for the QA Engineer position at Wander. With my 5 years of experience in quality assurance and passion for travel technology, I believe I would be a valuable addition to your team.
 
@@ -42,390 +56,755 @@ Thank you for considering my application. I look forward to discussing how I can
 
 Best regards,
 Taylor Johnson""",
-            
-            "why_interested": "I'm passionate about travel technology and quality assurance. Wander's innovative approach to hospitality and their commitment to exceptional user experiences aligns perfectly with my career goals and values.",
-            
-            "experience": "I have 5 years of experience in quality assurance, specializing in automated testing frameworks, mobile app testing, and API testing. I've worked with tools like Selenium, Cypress, and Postman.",
-            
-            "strengths": "My key strengths include attention to detail, analytical thinking, and strong communication skills. I excel at identifying edge cases and collaborating with development teams to resolve issues efficiently.",
-            
-            "challenge": "In my previous role, I led the implementation of an automated testing pipeline that reduced regression testing time by 60% while improving test coverage. This required coordinating with multiple teams and learning new technologies quickly.",
-            
-            "motivation": "I'm motivated by the opportunity to ensure users have seamless, bug-free experiences with technology. There's great satisfaction in knowing that thorough testing prevents user frustration and protects company reputation.",
-            
-            "teamwork": "I believe in collaborative problem-solving and clear communication. I regularly participate in cross-functional meetings, provide detailed bug reports, and work closely with developers to understand root causes of issues.",
-            
-            "work_style": "I'm detail-oriented yet efficient, preferring to work systematically through test cases while staying adaptable to changing priorities. I value thorough documentation and believe in continuous learning.",
-            
-            "remote_experience": "I have 3 years of remote work experience and am comfortable with distributed teams. I'm proficient with collaboration tools like Slack, Zoom, and project management platforms.",
-            
-            "availability": "I can start within 2 weeks notice and am available for full-time employment. I'm flexible with working hours to accommodate team collaboration across time zones.",
-            
-            "questions": "I'm curious about Wander's quality assurance processes, the testing tools and frameworks currently in use, and opportunities for professional development in the QA team.",
-            
-            "travel": "I've traveled to over 15 countries and understand the importance of reliable technology when you're away from home. This personal experience fuels my passion for ensuring travel platforms work flawlessly.",
-            
-            "technology": "I'm comfortable with both manual and automated testing, experienced with various testing frameworks, and always eager to learn new tools and technologies to improve testing efficiency.",
-            
-            "career_goals": "I aim to grow into a senior QA role where I can mentor junior testers, contribute to testing strategy, and help build robust quality assurance processes that scale with company growth."
-        }
+    
+    "why_interested": "I'm passionate about travel technology and quality assurance. Wander's innovative approach to hospitality and their commitment to exceptional user experiences aligns perfectly with my career goals and values.",
+    
+    "experience": "I have 5 years of experience in quality assurance, specializing in automated testing frameworks, mobile app testing, and API testing. I've worked with tools like Selenium, Cypress, and Postman.",
+    
+    "strengths": "My key strengths include attention to detail, analytical thinking, and strong communication skills. I excel at identifying edge cases and collaborating with development teams to resolve issues efficiently.",
+    
+    "challenge": "In my previous role, I led the implementation of an automated testing pipeline that reduced regression testing time by 60% while improving test coverage. This required coordinating with multiple teams and learning new technologies quickly.",
+    
+    "motivation": "I'm motivated by the opportunity to ensure users have seamless, bug-free experiences with technology. There's great satisfaction in knowing that thorough testing prevents user frustration and protects company reputation.",
+    
+    "teamwork": "I believe in collaborative problem-solving and clear communication. I regularly participate in cross-functional meetings, provide detailed bug reports, and work closely with developers to understand root causes of issues.",
+    
+    "work_style": "I'm detail-oriented yet efficient, preferring to work systematically through test cases while staying adaptable to changing priorities. I value thorough documentation and believe in continuous learning.",
+    
+    "remote_experience": "I have 3 years of remote work experience and am comfortable with distributed teams. I'm proficient with collaboration tools like Slack, Zoom, and project management platforms.",
+    
+    "availability": "I can start within 2 weeks notice and am available for full-time employment. I'm flexible with working hours to accommodate team collaboration across time zones.",
+    
+    "questions": "I'm curious about Wander's quality assurance processes, the testing tools and frameworks currently in use, and opportunities for professional development in the QA team.",
+    
+    "travel": "I've traveled to over 15 countries and understand the importance of reliable technology when you're away from home. This personal experience fuels my passion for ensuring travel platforms work flawlessly.",
+    
+    "technology": "I'm comfortable with both manual and automated testing, experienced with various testing frameworks, and always eager to learn new tools and technologies to improve testing efficiency.",
+    
+    "career_goals": "I aim to grow into a senior QA role where I can mentor junior testers, contribute to testing strategy, and help build robust quality assurance processes that scale with company growth.",
+    
+    # Default to a shorter, more general response
+    "general": "I am excited about this opportunity and believe my skills and experience make me a strong candidate for this position."
+}
+
+
+def create_chrome_driver(headless=False, user_data_dir=None, launch_profile="default"):
+    """Launch Chrome with the options of a launch profile (see browser_profiles.LAUNCH_PROFILES)"""
+    # Selenium's webdriver package is only imported once a browser is actually needed
+    from selenium import webdriver
+
+    # A persistent profile directory already holds its own cache
+    cache_dir = None
+    if get_launch_profile(launch_profile)["seeded_disk_cache"] and not user_data_dir:
+        cache_dir = session_disk_cache_dir()
+    options = build_chrome_options(launch_profile, headless=headless, user_data_dir=user_data_dir,
+                                   disk_cache_dir=cache_dir)
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception:
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        raise
+    if cache_dir:
+        quit_browser = driver.quit
+
+        def quit_and_retire_cache():
+            try:
+                quit_browser()
+            finally:
+                retire_disk_cache(cache_dir)
+
+        driver.quit = quit_and_retire_cache
+    apply_network_blocking(driver, launch_profile)
+    return driver
+
+
+class EnhancedFormFiller:
+    """Enhanced form filler with contextual responses and file upload"""
+    
+    def __init__(self, bulk_fill=False, schema_cache=None, profile=None, session=None, launch_profile="default",
+                 tracer=None, responses=None, resume_path=None, semantic=False, resume_cache=None,
+                 incremental=False, journal=None, fill_plan=None, headless=False, demo_defaults=True):
+        self.driver = None
+        self.headless = headless
+        # Optional FillTracer: spans per phase and field; the shared disabled tracer costs nothing
+        self.tracer = tracer or NULL_TRACER
+        # Structured log records (posting, field, action, outcome); fill_log configures where they go
+        self.log = get_fill_logger()
+        self.waiter = None
+        # Handles of the form being filled, re-resolved in one call when React re-renders them
+        self.handles = None
+        # Job-board adapter of the posting being filled: its standard fields skip classification
+        self.board = GENERIC_BOARD
+        # "throughput" launches headless with images, media and analytics blocked
+        self.launch_profile = launch_profile
+        self.scroll_into_view = get_launch_profile(launch_profile)["scroll_into_view"]
+        self.last_metrics = {}
+        # Optional SessionManager: reuse one warm browser across fill_* calls instead of launching per run
+        self.session = session
+        self.last_filled_count = 0
+        # Opt-in: set all values in one injected script instead of typing each field
+        self.bulk_fill = bulk_fill
+        # Opt-in for retries: read current values first and only write fields that differ
+        self.incremental = incremental
+        self.last_skipped_writes = 0
+        # Optional ProgressJournal: committed fields and finished postings survive a crash
+        self.journal = journal
+        self._journal_posting = None
+        # Optional FormSchemaCache: reuse discovered schema and values while the form is unchanged
+        self.schema_cache = schema_cache
+        # Optional plan from fill_plan.build_fill_plan(): values resolved ahead of time, no heuristics at fill time
+        self.fill_plan = fill_plan
+        # demo_defaults=False (profile store candidates): nothing of the Taylor Johnson demo is merged in,
+        # so a missing answer is left blank instead of being filled with someone else's data
+        self.profile = dict(DEFAULT_PROFILE) if demo_defaults else {}
+        if profile:
+            self.profile.update(profile)
+        if not demo_defaults and self.profile.get("full_name"):
+            first, _, last = self.profile["full_name"].partition(" ")
+            self.profile.setdefault("first_name", first)
+            self.profile.setdefault("last_name", last)
+        
+        # Candidate-specific answers are layered over the defaults
+        self.responses = dict(DEFAULT_RESPONSES) if demo_defaults else {}
+        if responses:
+            self.responses.update(responses)
         
         # Create resume file path
-        self.resume_path = os.path.join(os.getcwd(), "Taylor_Johnson_QA_Resume.pdf")
-    
-    def start_browser(self):
-        """Start Chrome browser with minimal options"""
-        options = Options()
-        options.add_argument("--start-maximized")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
+        default_resume = os.path.join(os.getcwd(), DEFAULT_RESUME_FILENAME) if demo_defaults else None
+        self.resume_path = resume_path or default_resume
+        if resume_cache and not resume_path:
+            # Optional ResumeCache: generate (once per profile content) a resume for this profile
+            self.resume_path = resume_cache.get_or_build(self.profile) or self.resume_path
+        if not self.resume_path:
+            self.log.warning("⚠️  No resume for %s - resume fields will be left empty",
+                             self.profile.get("full_name", "this candidate"))
         
+        # Opt-in: route questions the keyword rules only reach a default for by TF-IDF similarity
+        self.semantic_matcher = None
+        if semantic:
+            if NUMPY_AVAILABLE:
+                self.semantic_matcher = SemanticMatcher.load_or_build(self.responses)
+            else:
+                self.log.warning("⚠️  Semantic matching needs numpy - using keyword rules only")
+    
+    @classmethod
+    def for_candidate(cls, store, candidate_id, **options):
+        """Filler for one candidate of a profile_store.ProfileStore; raises IncompleteProfile if it can't apply"""
+        require_resume = options.get("resume_cache") is None
+        return cls(**store.filler_options(candidate_id, require_resume), **options)
+    
+    def start_browser(self, headless=None):
+        """Start Chrome browser with the configured launch profile"""
+        headless = self.headless if headless is None else headless
         try:
-            self.driver = webdriver.Chrome(options=options)
-            print("✅ Browser started successfully")
+            self.attach_driver(create_chrome_driver(headless=headless, launch_profile=self.launch_profile))
+            self.log.info("✅ Browser started successfully", action="browser_start", outcome="ok")
             return True
         except Exception as e:
-            print(f"❌ Failed to start browser: {e}")
+            self.log.error("❌ Failed to start browser: %s", e, action="browser_start", outcome="error")
             return False
     
+    def attach_driver(self, driver):
+        """Use an already running browser session (e.g. from a pool) instead of starting one"""
+        self.driver = driver
+        self.waiter = PageWaiter(driver)
+        self.tracer.attach(driver)
+    
     def fill_wander_form(self):
         """Fill the Wander job application form with enhanced responses"""
-        if not self.start_browser():
+        return self.fill_form(WANDER_URL)
+    
+    def fill_form(self, url, review=True, journal_key=None):
+        """Fill a job application form with enhanced responses"""
+        posting = journal_key or url
+        self.log = get_fill_logger(posting)
+        # A tracer shared by batch workers reports only this posting's spans
+        trace_mark = self.tracer.mark()
+        if self.journal and self.journal.is_complete(posting):
+            self.log.info("⏭️  Already completed according to the progress journal: %s", posting,
+                          action="posting", outcome="skipped")
+            self.last_filled_count = 0
+            return True
+        # Browsers attached from outside are left running for their owner
+        if self.session:
+            try:
+                self.attach_driver(self.session.acquire())
+            except Exception as e:
+                self.log.error("❌ Failed to start browser: %s", e, action="browser_start", outcome="error")
+                return False
+        owns_browser = self.driver is None
+        if owns_browser and not self.start_browser():
             return False
+        self.last_filled_count = 0
+        self.last_skipped_writes = 0
         
         try:
-            url = "https://jobs.ashbyhq.com/wander/121c24e0-eeff-49a8-ac56-793d2dbc9fcd/application"
-            print(f"🌐 Loading: {url}")
-            
-            self.driver.get(url)
-            print("⏳ Waiting for page to load...")
-            time.sleep(8)
+            load_start = time.perf_counter()
+            with self.tracer.span("page_load", url=url) as span:
+                if self.incremental and self._current_url() == url:
+                    # A retry on the same page keeps what was already entered
+                    self.log.info("♻️  Re-using loaded form: %s", url, action="page_load", outcome="reused")
+                else:
+                    self.log.info("🌐 Loading: %s", url, action="page_load")
+                    apply_request_policy(self.driver, url, self.launch_profile)
+                    # Drop events from earlier postings so the network stats cover this page only
+                    drain_network_log(self.driver)
+                    self.driver.get(url)
+                self.log.info("⏳ Waiting for page to load...")
+                self.waiter.dom_ready()
+                field_count = self.waiter.form_fields_present()
+                span.set(fields=field_count)
+            if self.session:
+                self.session.record_page_load(time.perf_counter() - load_start)
+            self.log.info("   ✅ Page ready with %d interactable fields (%.2fs)", field_count, self.waiter.total_seconds(),
+                          action="page_load", outcome="ok")
+            self.board = detect_board(url, self.driver)
+            self.log.info("   🧭 Board: %s", self.board.name, action="detect_board", outcome=self.board.name)
+            self.last_metrics = collect_session_metrics(self.driver)
+            self.log.info("   📈 Session: %s", format_session_metrics(self.last_metrics))
             
-            print("\n🤖 STARTING ENHANCED FORM FILLING")
-            print("=" * 50)
-            print(f"Name: {self.profile['full_name']}")
-            print(f"Email: {self.profile['email']}")
-            print(f"Resume: {'✅ Available' if os.path.exists(self.resume_path) else '❌ Missing'}")
-            print("=" * 50)
+            self.log.info("\n🤖 STARTING ENHANCED FORM FILLING\n%s\nName: %s\nEmail: %s\nResume: %s\n%s",
+                          "=" * 50, self.profile["full_name"], self.profile["email"],
+                          "✅ Available" if self.resume_path and os.path.exists(self.resume_path) else "❌ Missing", "=" * 50)
             
             filled_count = 0
             
-            # Find and fill all visible elements
-            elements = self.driver.find_elements(By.CSS_SELECTOR, "input, textarea, select")
-            print(f"📋 Found {len(elements)} form elements")
+            with self.tracer.span("discover") as span:
+                fields, cached_values = self._load_fields(url)
+                span.set(fields=len(fields), cached_values=bool(cached_values))
+                self.handles = HandleCache(self.driver)
+                self.handles.track(fields)
+            chosen_values = {}
+            self.log.info("📋 Found %d form elements", len(fields), action="discover")
             
             # First, specifically look for and handle the resume upload field
-            resume_uploaded = False
-            try:
-                resume_input = self.driver.find_element(By.ID, "_systemfield_resume")
-                # File inputs can be hidden but still functional
-                if resume_input and resume_input.is_enabled():
-                    print(f"\n🔄 Resume Upload: Processing resume field")
-                    print(f"   📝 Field details: Visible={resume_input.is_displayed()}, Enabled={resume_input.is_enabled()}")
-                    if os.path.exists(self.resume_path):
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", resume_input)
-                            time.sleep(1)
-                            resume_input.send_keys(self.resume_path)
-                            print(f"   ✅ Uploaded resume: {os.path.basename(self.resume_path)}")
-                            
-                            # Wait for upload confirmation
-                            time.sleep(2)
-                            
-                            # Check if filename appears on page
-                            try:
-                                filename = os.path.basename(self.resume_path)
-                                if filename in self.driver.page_source:
-                                    print(f"   ✅ Confirmed: {filename} appears on page")
-                                else:
-                                    print("   ⚠️  Upload sent but filename not visible (may still be successful)")
-                            except:
-                                pass
-                            
-                            filled_count += 1
-                            resume_uploaded = True
-                        except Exception as upload_error:
-                            print(f"   ❌ Resume upload failed: {upload_error}")
-                    else:
-                        print("   ⚠️  Resume file not found - skipped upload")
-            except:
-                print("🔍 Resume field not found with ID '_systemfield_resume'")
+            resume_field = self.board.resume_field(fields)
+            # A posting the journal shows as half done is compared field by field, like incremental mode
+            resuming = bool(self.journal and self.journal.committed_fields(posting))
+            if resuming:
+                self.log.info("📒 Resuming: %d fields were committed before", self.journal.committed_fields(posting),
+                              action="posting", outcome="resumed")
+            self._journal_posting = posting if self.journal else None
+            compare = self.incremental or resuming
+            current_values = self._read_current_values(fields) if compare else {}
+            with self.tracer.span("resume_upload") as span:
+                if compare and self._resume_already_uploaded(resume_field):
+                    self.log.info("\n✔️  Resume already uploaded - skipped write", field=field_key(resume_field),
+                                  action="upload", outcome="unchanged")
+                    self.last_skipped_writes += 1
+                    resume_uploaded = True
+                else:
+                    resume_uploaded = self._upload_resume(resume_field)
+                span.set(uploaded=resume_uploaded)
+            if resume_uploaded:
+                filled_count += 1
+                if resume_field:
+                    self._journal_field(resume_field, os.path.basename(self.resume_path))
             
-            print(f"\n📝 Processing remaining {len(elements) - 1 if resume_uploaded else len(elements)} form elements...")
+            self.log.info("\n📝 Processing remaining %d form elements...", len(fields) - 1 if resume_uploaded else len(fields))
             
-            for i, element in enumerate(elements, 1):
-                try:
-                    # For file inputs, allow hidden elements (they can still function)
-                    tag = element.tag_name.lower()
-                    input_type = element.get_attribute("type") or ""
-                    
-                    if tag == "input" and input_type == "file":
-                        if not element.is_enabled():
-                            continue
-                    else:
-                        if not element.is_displayed() or not element.is_enabled():
-                            continue
-                    
-                    # Skip resume field if we already processed it
-                    element_id = element.get_attribute("id") or ""
-                    if element_id == "_systemfield_resume" and resume_uploaded:
-                        print(f"\n🔄 {i}. Skipping already processed resume field")
-                        continue
-                    
-                    name = element.get_attribute("name") or ""
-                    placeholder = element.get_attribute("placeholder") or ""
-                    
-                    # Get surrounding text for better context
-                    context = self._get_element_context(element)
-                    
-                    desc = f"{tag}"
-                    if input_type: desc += f"[{input_type}]"
-                    if name: desc += f" name='{name[:20]}...'" if len(name) > 20 else f" name='{name}'"
-                    
-                    print(f"\n🔄 {i}. Processing: {desc}")
-                    if context:
-                        print(f"   📝 Context: {context[:100]}..." if len(context) > 100 else f"   📝 Context: {context}")
-                    
-                    # Scroll to element
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                    time.sleep(1)
-                    
-                    # Get appropriate value
-                    value = self._get_contextual_value(tag, input_type, name, placeholder, context)
-                    
-                    if value:
-                        if tag == "input":
-                            if input_type == "file":
-                                if os.path.exists(self.resume_path):
-                                    try:
-                                        element.send_keys(self.resume_path)
-                                        print(f"   ✅ Uploaded resume: {os.path.basename(self.resume_path)}")
-                                        filled_count += 1
-                                    except Exception as upload_error:
-                                        print(f"   ❌ Resume upload failed: {upload_error}")
-                                else:
-                                    print("   ⚠️  Resume file not found - skipped upload")
-                            else:
-                                element.clear()
-                                element.send_keys(value)
-                                print(f"   ✅ Filled: {value}")
-                                filled_count += 1
-                        
-                        elif tag == "textarea":
-                            element.clear()
-                            element.send_keys(value)
-                            print(f"   ✅ Filled textarea ({len(value)} chars)")
-                            filled_count += 1
-                        
-                        elif tag == "select":
-                            try:
-                                select = Select(element)
-                                options = [opt.text.strip() for opt in select.options if opt.text.strip()]
-                                if len(options) > 1:
-                                    selected_option = self._choose_select_option(options, name, placeholder, context)
-                                    if selected_option:
-                                        select.select_by_visible_text(selected_option)
-                                        print(f"   ✅ Selected: {selected_option}")
-                                        filled_count += 1
-                            except Exception as e:
-                                print(f"   ❌ Select error: {e}")
-                        
-                        time.sleep(1)
-                    else:
-                        print("   ⏭️  Skipped (no suitable value)")
-                
-                except Exception as e:
-                    print(f"   ❌ Error: {e}")
+            pending = []
+            for i, field in enumerate(fields, 1):
+                # For file inputs, allow hidden elements (they can still function)
+                if not is_fillable(field):
                     continue
+                with self.tracer.span(f"field {i}", "field", selector=field["selector"], tag=field["tag"],
+                                      input_type=field["input_type"]) as span:
+                    try:
+                        filled_count += self._process_field(i, field, resume_uploaded, cached_values,
+                                                            chosen_values, pending, span,
+                                                            current_values.get(field["index"]))
+                    except Exception as e:
+                        self.log.error("   ❌ Error: %s", e, field=field_key(field), action="fill", outcome="error")
+                        span.set(action="error")
+            
+            if pending:
+                with self.tracer.span("bulk_fill", fields=len(pending)):
+                    filled_count += self._bulk_fill_fields(pending)
             
-            print(f"\n🎉 ENHANCED FORM FILLING COMPLETED!")
-            print(f"📊 Successfully filled {filled_count} fields")
-            print("\n🎯 IMPORTANT:")
-            print("- Form filled with contextual, varied responses")
-            print("- Resume uploaded if PDF file exists")
-            print("- Please review all fields before submitting")
-            print("- DO NOT submit unless you intend to apply")
+            handle_stats = self.handles.stats()
+            self.last_metrics.update(handle_stats)
+            if handle_stats["stale_errors"] or handle_stats["handles_re_resolved"]:
+                self.log.info("\n♻️  Re-resolved %d stale handles in %d batched lookups (%d stale errors, %d fields gone)",
+                              handle_stats["handles_re_resolved"], handle_stats["handle_refreshes"],
+                              handle_stats["stale_errors"], handle_stats["handles_missing"])
             
-            print("\n👀 Browser will stay open for review...")
-            input("Press Enter to close browser...")
+            if self.schema_cache:
+                if chosen_values != cached_values:
+                    self.schema_cache.put(url, fingerprint_fields(fields), fields, chosen_values, self._values_key())
+                self.schema_cache.flush()
+            
+            self.log.info("\n🎉 ENHANCED FORM FILLING COMPLETED!\n📊 Successfully filled %d fields", filled_count,
+                          action="posting", outcome="completed")
+            if compare:
+                self.log.info("✔️  %d fields already had the right value - writes skipped", self.last_skipped_writes)
+            if self.journal:
+                self.journal.complete_posting(posting, filled_count)
+            self.last_filled_count = filled_count
+            self.waiter.print_report(emit=self.log.info)
+            self.tracer.print_report(emit=self.log.info, since=trace_mark)
+            self.log.info("\n🎯 IMPORTANT:\n- Form filled with contextual, varied responses\n"
+                          "- Resume uploaded if PDF file exists\n- Please review all fields before submitting\n"
+                          "- DO NOT submit unless you intend to apply")
+            
+            if review:
+                self.log.info("\n👀 Browser will stay open for review...")
+                input("Press Enter to close browser...")
             
             return True
             
         except Exception as e:
-            print(f"❌ Error during form filling: {e}")
+            self.log.error("❌ Error during form filling: %s", e, action="posting", outcome="error")
             return False
         finally:
-            if self.driver:
+            self._journal_posting = None
+            if self.session:
+                # Only the page state is reset; the warm browser stays up for the next job
+                self.session.release()
+                self.driver = None
+            elif owns_browser and self.driver:
                 self.driver.quit()
-                print("🔒 Browser closed")
+                self.driver = None
+                self.log.info("🔒 Browser closed")
+    
+    def _process_field(self, i, field, resume_uploaded, cached_values, chosen_values, pending, span,
+                       current_value=None):
+        """Classify and fill (or queue) one fillable field; returns 1 when it was filled"""
+        log = self.log.bind(field=field_key(field))
+        # Skip resume field if we already processed it
+        if resume_uploaded and self.board.system_target(field) == RESUME_TARGET:
+            log.info("\n🔄 %d. Skipping already processed resume field", i, action="upload", outcome="skipped")
+            span.set(action="skipped")
+            return 0
+        
+        context = field["context"]
+        log.info("\n🔄 %d. Processing: %s", i, describe_field(field))
+        if context:
+            # Truncated by the format, so nothing is sliced when the level is off
+            log.info("   📝 Context: %.100s%s", context, "..." if len(context) > 100 else "")
+        
+        # Get appropriate value (reusing cached choices when the profile is unchanged)
+        key = str(field["index"])
+        if self._journal_posting and current_value and \
+                self.journal.field_committed(self._journal_posting, field_key(field), current_value):
+            # Committed by the interrupted run and still on the page: no classification, no write
+            log.info("   📒 Committed before - skipped", action="fill", outcome="journaled")
+            span.set(action="journaled")
+            if key in cached_values:
+                chosen_values[key] = cached_values[key]
+            self.last_skipped_writes += 1
+            return 1
+        if key in cached_values:
+            rule_id, value = cached_values[key]
+        else:
+            rule_id, value = self._resolve_field_value(field)
+        chosen_values[key] = [rule_id, value]
+        log.info("   🏷️  Rule: %s", rule_id or "none", rule=rule_id)
+        if rule_id and rule_id.startswith(SEMANTIC_RULE_PREFIX):
+            span.set(kind=rule_id, response_key=f"responses.{rule_id[len(SEMANTIC_RULE_PREFIX):]}")
+        elif rule_id and rule_id.startswith(SYSTEM_RULE_PREFIX):
+            span.set(kind=rule_id, response_key=rule_id[len(SYSTEM_RULE_PREFIX):])
+        else:
+            span.set(kind=rule_id, response_key=rule_target(rule_id))
+        
+        if not value:
+            log.info("   ⏭️  Skipped (no suitable value)", action="fill", outcome="skipped")
+            span.set(action="skipped")
+            return 0
+        if value_matches(current_value, value, field["input_type"]):
+            log.info("   ✔️  Already set - skipped write", action="fill", outcome="unchanged")
+            span.set(action="unchanged")
+            self.last_skipped_writes += 1
+            self._journal_field(field, value)
+            return 1
+        if self.bulk_fill and field["input_type"] != "file" and not field.get("combobox"):
+            pending.append((i, field, value))
+            log.info("   ⏳ Queued for bulk fill", action="fill", outcome="queued")
+            span.set(action="queued")
+            return 0
+        filled = self.handles.run(field, lambda: self._fill_field(field, value))
+        span.set(action="filled" if filled else "failed")
+        if filled:
+            self._journal_field(field, value)
+        return 1 if filled else 0
     
-    def _get_element_context(self, element):
-        """Get surrounding text context for better field understanding"""
+    def _journal_field(self, field, value):
+        """Record a committed field in the progress journal, if one is configured"""
+        if self._journal_posting:
+            self.journal.record_field(self._journal_posting, field_key(field), value)
+    
+    def _current_url(self):
         try:
-            # Try to find associated label or nearby text
-            parent = element.find_element(By.XPATH, "./..")
-            context_text = parent.text.strip()
-            
-            # Clean up the context
-            if context_text and len(context_text) < 500:
-                return context_text
-                
-            # Try grandparent if parent text is too long or empty
-            grandparent = parent.find_element(By.XPATH, "./..")
-            context_text = grandparent.text.strip()
-            
-            if context_text and len(context_text) < 500:
-                return context_text
-                
-        except:
-            pass
+            return self.driver.current_url
+        except Exception:
+            return None
+    
+    def _read_current_values(self, fields):
+        """Current DOM value of every fillable field, keyed by field index, in one script call"""
+        fillable = [field for field in fields if is_fillable(field)]
+        try:
+            values = read_values(self.driver, [field["element"] for field in fillable])
+        except Exception as e:
+            self.log.warning("⚠️  Could not read current values, writing every field: %s", e)
+            return {}
+        return {field["index"]: value for field, value in zip(fillable, values)}
+    
+    def _resume_already_uploaded(self, resume_field):
+        """Whether the upload widget already shows this resume (e.g. on a retried run)"""
+        if not resume_field or not self.resume_path:
+            return False
+        try:
+            return bool(self.driver.execute_script(UPLOAD_SHOWS_FILENAME_JS, resume_field["element"],
+                                                   os.path.basename(self.resume_path), None))
+        except Exception:
+            return False
+    
+    def _upload_resume(self, resume_field):
+        """Upload the resume into the dedicated resume field; returns True when uploaded"""
+        if not resume_field:
+            self.log.info("🔍 Resume field not found on this %s form", self.board.name, action="upload", outcome="missing")
+            return False
         
-        return ""
+        resume_input = resume_field["element"]
+        # File inputs can be hidden but still functional
+        if not resume_field["enabled"]:
+            return False
+        self.log.info("\n🔄 Resume Upload: Processing resume field\n   📝 Field details: Visible=%s, Enabled=%s",
+                      resume_field["visible"], resume_field["enabled"], field=field_key(resume_field))
+        return self.handles.run(resume_field, lambda: self._send_resume(resume_field))
     
-    def _get_contextual_value(self, tag, input_type, name, placeholder, context):
-        """Get contextual value based on element characteristics and surrounding text"""
-        # Combine all text sources for analysis
-        all_text = f"{name} {placeholder} {context}".lower()
+    def _send_resume(self, field):
+        """Validate the resume, send it to a file input and wait for the widget to show it"""
+        log = self.log.bind(field=field_key(field), action="upload")
+        problem = validate_resume(self.resume_path, field.get("accept", ""))
+        if problem:
+            log.warning("   ⚠️  Resume not uploaded: %s", problem, outcome="invalid")
+            return False
+        element = field["element"]
+        filename = os.path.basename(self.resume_path)
+        try:
+            if self.scroll_into_view:
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            element.send_keys(self.resume_path)
+            log.info("   ✅ Uploaded resume: %s", filename, outcome="sent")
+        except StaleElementReferenceException:
+            raise
+        except Exception as upload_error:
+            log.error("   ❌ Resume upload failed: %s", upload_error, outcome="error")
+            return False
         
-        # Email fields
-        if input_type == "email" or "email" in all_text:
-            return self.profile["email"]
+        # Checks only the widget around the input instead of the whole page source
+        fallback = f"input[id='{field['id']}']" if field["id"] else None
+        if self.waiter.upload_shows_filename(element, filename, fallback):
+            log.info("   ✅ Confirmed: %s appears on page", filename, outcome="ok")
+        else:
+            log.warning("   ⚠️  Upload sent but filename not visible (may still be successful)", outcome="unconfirmed")
+        return True
+    
+    def _load_fields(self, url):
+        """Form fields and cached values: from a fill plan, the schema cache when the form is unchanged, else live discovery"""
+        if self.fill_plan and self.fill_plan.get("url") in (None, url):
+            fields, values, unmatched = resolve_plan(self.driver, self.fill_plan)
+            self.log.info("⚡ Fill plan: %d of %d planned fields found on the page", len(values), len(self.fill_plan["steps"]),
+                          action="discover", outcome="plan")
+            if unmatched:
+                self.log.info("   🔍 %d planned fields missing - discovered %d fields live", unmatched, len(fields) - len(values))
+            if self.fill_plan.get("values_key") != self._values_key():
+                self.log.warning("   ⚠️  Plan was built for a different profile - resolving values live")
+                return fields, {}
+            return fields, values
+        if self.schema_cache:
+            fingerprint = form_fingerprint(self.driver)
+            entry = self.schema_cache.get(url, fingerprint)
+            if entry and resolve_fields(self.driver, entry["fields"]):
+                self.log.info("⚡ Schema cache hit: reusing %d cached selectors (fingerprint %s)", len(entry["fields"]),
+                              fingerprint, action="discover", outcome="cache_hit")
+                if entry["values_key"] == self._values_key():
+                    return entry["fields"], entry["values"]
+                return entry["fields"], {}
+            self.log.info("🔍 Schema cache miss - discovering form", action="discover", outcome="cache_miss")
         
-        # Phone fields
-        elif input_type == "tel" or any(word in all_text for word in ["phone", "tel", "mobile"]):
-            return self.profile["phone"]
+        # Discover every field (attributes, context and options) in one round trip
+        return discover_fields(self.driver), {}
+    
+    def _values_key(self):
+        """Cache key for chosen values: profile data plus the matching mode"""
+        return values_key(self.profile, self.responses, "semantic" if self.semantic_matcher else None)
+    
+    def _resolve_field_value(self, field, board=None):
+        """Rule id and value to enter for a field: text to type, or the option text for selects"""
+        # Comboboxes are classified like selects; their options only exist once opened
+        tag = "select" if field.get("combobox") else field["tag"]
+        # The board's standard fields map straight to a profile key; only custom questions are classified
+        target = (board or self.board).system_target(field)
+        if target and target != RESUME_TARGET and tag != "select":
+            return f"{SYSTEM_RULE_PREFIX}{target}", self._target_value(target)
+        rule, value = self._match_field(
+            tag, field["input_type"], field["name"], field["placeholder"], field["context"]
+        )
+        rule_id = rule["id"] if rule else None
+        if tag != "select":
+            return rule_id, value
         
-        # Name fields
-        elif "name" in all_text:
-            if "first" in all_text:
-                return self.profile["first_name"]
-            elif "last" in all_text:
-                return self.profile["last_name"]
-            else:
-                return self.profile["full_name"]
+        text = f"{field['name']} {field['placeholder']} {field['context']}"
+        select_rule = SELECT_CLASSIFIER.classify(text)
+        if field.get("combobox"):
+            # The option is chosen when the list is open; this is the value it is scored against
+            if not value and select_rule:
+                return select_rule["id"], select_rule["options"][0]
+            return rule_id, value
+        options = [opt["text"] for opt in field.get("options", []) if opt["text"]]
+        if len(options) > 1 and (value or select_rule):
+            return choose_option(options, text, value)
+        return rule_id, None
+    
+    def _target_value(self, target):
+        """Value of a 'profile.<key>' or 'responses.<key>' target"""
+        source, _, key = target.partition(".")
+        return (self.profile if source == "profile" else self.responses).get(key)
+    
+    def _fill_field(self, field, value):
+        """Type, select or upload a single value with WebDriver; returns True when filled"""
+        element = field["element"]
+        tag = field["tag"]
+        log = self.log.bind(field=field_key(field), action="fill")
         
-        # URL fields
-        elif input_type == "url" or any(word in all_text for word in ["linkedin", "github", "portfolio", "website"]):
-            if "linkedin" in all_text:
-                return self.profile["linkedin"]
-            elif "github" in all_text:
-                return self.profile["github"]
-            else:
-                return self.profile["portfolio"]
+        if tag == "input" and field["input_type"] == "file":
+            return self._send_resume(field)
         
-        # Salary fields
-        elif any(word in all_text for word in ["salary", "compensation", "pay"]):
-            return self.profile["salary"]
+        # Scroll to element (WebDriver scrolls on its own for send_keys, so this is only for watching)
+        if self.scroll_into_view:
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
         
-        # Experience fields
-        elif any(word in all_text for word in ["experience", "years"]) and tag != "textarea":
-            return self.profile["experience"]
+        if field.get("combobox"):
+            text = f"{field['name']} {field['placeholder']} {field['context']}"
+            chosen = fill_combobox(self.driver, self.waiter, field, value, text)
+            if chosen:
+                log.info("   ✅ Chose: %s", chosen, outcome="ok")
+                return True
+            log.error("   ❌ No combobox option matching '%s'", value, outcome="no_option")
+            return False
         
-        # Context-specific textarea responses
-        elif tag == "textarea":
-            return self._get_textarea_response(all_text)
+        if tag == "select":
+            try:
+                # One script: option position from the discovered option index, set natively
+                if not select_by_index(self.driver, field, value):
+                    from selenium.webdriver.support.ui import Select
+                    Select(element).select_by_visible_text(value)
+                self._report_commit(field, value, "Selected: %s", value)
+                return True
+            except StaleElementReferenceException:
+                raise
+            except Exception as e:
+                log.error("   ❌ Select error: %s", e, outcome="error")
+                return False
         
-        # Other text inputs - try to match context
-        elif tag == "input" and input_type in ["text", ""]:
-            return self._get_text_input_response(all_text)
+        if field["input_type"] in CHECKABLE_INPUT_TYPES:
+            # Typing into a radio or checkbox does nothing; filling it means checking it
+            if not element.is_selected():
+                element.click()
+            self._report_commit(field, value, "Checked: %s", field.get("label") or field["name"])
+            return True
         
-        return None
+        element.clear()
+        element.send_keys(value)
+        if tag == "textarea":
+            self._report_commit(field, value, "Filled textarea (%d chars)", len(value))
+        else:
+            self._report_commit(field, value, "Filled: %s", value)
+        return True
     
-    def _get_textarea_response(self, context):
-        """Get appropriate response for textarea based on context"""
-        context = context.lower()
+    def _bulk_fill_fields(self, pending):
+        """Set all queued values in one injected script, falling back to send_keys where they didn't stick"""
+        self.log.info("\n⚡ Bulk filling %d fields in one script call...", len(pending), action="bulk_fill")
+        # Handles queued while the page re-rendered are swapped for live ones before injecting
+        if self.handles.refresh():
+            gone = [field for _, field, _ in pending if field_key(field) not in self.handles.fields]
+            if gone:
+                self.log.warning("   ⚠️  %d queued fields left the page during the re-render", len(gone))
+                pending = [entry for entry in pending if field_key(entry[1]) in self.handles.fields]
+        try:
+            results = inject_values(self.driver, [(field["element"], value) for _, field, value in pending])
+        except Exception as e:
+            self.log.error("   ❌ Bulk fill failed, falling back to typing: %s", e, action="bulk_fill", outcome="error")
+            results = [False] * len(pending)
         
-        # Map context keywords to appropriate responses
-        if any(word in context for word in ["cover", "letter", "introduction", "tell us about yourself"]):
-            return self.responses["cover_letter"]
-        elif any(word in context for word in ["why", "interested", "motivation", "attracted"]):
-            return self.responses["why_interested"]
-        elif any(word in context for word in ["experience", "background", "qualifications"]):
-            return self.responses["experience"]
-        elif any(word in context for word in ["strength", "skills", "abilities"]):
-            return self.responses["strengths"]
-        elif any(word in context for word in ["challenge", "difficult", "problem", "overcome"]):
-            return self.responses["challenge"]
-        elif any(word in context for word in ["team", "collaboration", "work with others"]):
-            return self.responses["teamwork"]
-        elif any(word in context for word in ["work style", "approach", "methodology"]):
-            return self.responses["work_style"]
-        elif any(word in context for word in ["remote", "distributed", "home", "virtual"]):
-            return self.responses["remote_experience"]
-        elif any(word in context for word in ["available", "start", "notice"]):
-            return self.responses["availability"]
-        elif any(word in context for word in ["question", "ask", "curious", "learn more"]):
-            return self.responses["questions"]
-        elif any(word in context for word in ["travel", "trip", "journey", "destination"]):
-            return self.responses["travel"]
-        elif any(word in context for word in ["technology", "tools", "software", "technical"]):
-            return self.responses["technology"]
-        elif any(word in context for word in ["career", "goal", "future", "growth"]):
-            return self.responses["career_goals"]
-        elif any(word in context for word in ["motivate", "drive", "inspire"]):
-            return self.responses["motivation"]
-        else:
-            # Default to a shorter, more general response
-            return "I am excited about this opportunity and believe my skills and experience make me a strong candidate for this position."
-    
-    def _get_text_input_response(self, context):
-        """Get appropriate response for text inputs based on context"""
-        # For short text inputs, usually want brief answers
-        if any(word in context for word in ["salary", "compensation"]):
-            return self.profile["salary"]
-        elif any(word in context for word in ["experience", "years"]):
-            return self.profile["experience"]
+        filled = 0
+        fallbacks = 0
+        for (i, field, value), committed in zip(pending, results):
+            if committed:
+                filled += 1
+                self._journal_field(field, value)
+                self.log.debug("   ✅ Bulk filled %s", describe_field(field), field=field_key(field),
+                               action="bulk_fill", outcome="ok")
+                continue
+            fallbacks += 1
+            self.log.info("\n🔁 %d. Value didn't stick, typing instead: %s", i, describe_field(field),
+                          field=field_key(field), action="bulk_fill", outcome="fallback")
+            try:
+                if self.handles.run(field, lambda: self._fill_field(field, value)):
+                    filled += 1
+                    self._journal_field(field, value)
+            except Exception as e:
+                self.log.error("   ❌ Error: %s", e, field=field_key(field), action="fill", outcome="error")
+        
+        self.log.info("   ✅ Bulk filled %d fields, %d fell back to send_keys", len(pending) - fallbacks, fallbacks)
+        return filled
+    
+    def _report_commit(self, field, value, message, *args):
+        """Wait for the value to be committed to the DOM and log the outcome"""
+        log = self.log.bind(field=field_key(field), action="fill")
+        if self.waiter.value_committed(field["element"], value, timeout=5):
+            log.info("   ✅ " + message, *args, outcome="ok")
         else:
-            return self.profile["full_name"]
+            log.warning("   ⚠️  " + message + " (value not confirmed by the page)", *args, outcome="unconfirmed")
+    
+    def _match_field(self, tag, input_type, name, placeholder, context):
+        """Classify a field with the compiled rule table; returns (rule, value)"""
+        # Combine all text sources for analysis
+        all_text = f"{name} {placeholder} {context}"
+        
+        rule = FIELD_CLASSIFIER.classify(all_text, tag, input_type)
+        if self.semantic_matcher and self._semantic_applies(tag, input_type, rule):
+            # Label text only: generated names and placeholders like "Type here..." are noise
+            key, score = self.semantic_matcher.match(context or placeholder or name)
+            if key in self.responses:
+                return {"id": f"{SEMANTIC_RULE_PREFIX}{key}", "response": key, "score": score}, self.responses[key]
+        if not rule:
+            return None, None
+        if "profile" in rule:
+            return rule, self.profile.get(rule["profile"])
+        return rule, self.responses.get(rule["response"])
+    
+    @staticmethod
+    def _semantic_applies(tag, input_type, rule):
+        """Textareas are always scored semantically; short text inputs only when no keyword rule fired"""
+        if tag == "textarea":
+            return True
+        fallback = not rule or not (rule.get("keywords") or rule.get("type_triggers"))
+        return fallback and tag == "input" and input_type in ("text", "")
+    
+    def _get_contextual_value(self, tag, input_type, name, placeholder, context):
+        """Get contextual value based on element characteristics and surrounding text"""
+        return self._match_field(tag, input_type, name, placeholder, context)[1]
     
     def _choose_select_option(self, options, name, placeholder, context):
         """Choose appropriate option from dropdown with context awareness"""
-        all_text = f"{name} {placeholder} {context}".lower()
-        
-        # Remove empty and placeholder options
-        valid_options = [opt for opt in options if opt and not any(word in opt.lower() for word in ["select", "choose", "please", "--"])]
-        
-        if not valid_options:
-            return None
-        
-        # Context-based selection
-        if any(word in all_text for word in ["experience", "years"]):
-            for opt in valid_options:
-                if any(exp in opt for exp in ["3-5", "4-6", "5+", "5-7"]):
-                    return opt
-        elif any(word in all_text for word in ["work", "employment", "type"]):
-            for opt in valid_options:
-                if "full" in opt.lower():
-                    return opt
-        elif any(word in all_text for word in ["eligible", "authorized"]):
-            for opt in valid_options:
-                if "yes" in opt.lower():
-                    return opt
-        
-        return valid_options[0] if valid_options else None
+        return choose_option(options, f"{name} {placeholder} {context}")[1]
 
-def main():
-    print("🚀 Enhanced Form Filler for Wander Job Application")
-    print("=" * 55)
-    print("Features:")
-    print("• Contextual responses for different question types")
-    print("• Resume upload capability")
-    print("• Intelligent field matching")
-    print("• Non-headless browser mode")
-    print("\n⚠️  IMPORTANT: Review all data before submitting!")
-    
-    proceed = input("\n🤔 Continue? (y/N): ").lower().strip()
-    if proceed != 'y':
-        print("👋 Cancelled.")
-        return
-    
-    filler = EnhancedFormFiller()
-    success = filler.fill_wander_form()
-    
+def classify_schema(filler, schema):
+    """Offline preview of every schema field: (field, rule id, value), no browser needed"""
+    from fill_plan import plan_fields
+    fields = plan_fields(schema)
+    filler.board = detect_board(schema.get("url"), fields=fields)
+    preview = []
+    for field in fields:
+        if field["input_type"] == "file":
+            preview.append((field, "resume", os.path.basename(filler.resume_path) if filler.resume_path else None))
+        else:
+            preview.append((field, *filler._resolve_field_value(field)))
+    return preview
+
+
+def _filler_from_args(args, **options):
+    """Filler for the CLI's profile options (--candidate/--profile-store, --semantic)"""
+    options["semantic"] = args.semantic
+    if args.candidate:
+        from profile_store import open_profile_store
+        return EnhancedFormFiller.for_candidate(open_profile_store(args.profile_store), args.candidate, **options)
+    return EnhancedFormFiller(**options)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Fill job application forms with contextual responses")
+    profile_options = argparse.ArgumentParser(add_help=False)
+    profile_options.add_argument("--profile-store", help="candidate directory or SQLite file")
+    profile_options.add_argument("--candidate", help="candidate id in --profile-store (default: the built-in profile)")
+    profile_options.add_argument("--semantic", action="store_true", help="TF-IDF matching for free-text questions")
+
+    commands = parser.add_subparsers(dest="command")
+    classify = commands.add_parser("classify", parents=[profile_options],
+                                   help="preview the value chosen for every field of a schema (no browser)")
+    classify.add_argument("schema", nargs="?", default="extracted_fields.json")
+    classify.add_argument("--json", action="store_true", help="print the preview as JSON")
+
+    plan = commands.add_parser("plan", parents=[profile_options],
+                               help="resolve every value of a schema into a fill plan (no browser)")
+    plan.add_argument("schema", nargs="?", default="extracted_fields.json")
+    plan.add_argument("-o", "--output", default="fill_plan.json")
+
+    fill = commands.add_parser("fill", parents=[profile_options], help="fill one posting in Chrome (default)")
+    fill.add_argument("url", nargs="?", default=WANDER_URL)
+    fill.add_argument("--headless", action="store_true")
+    fill.add_argument("--launch-profile", default="default", help="see browser_profiles.LAUNCH_PROFILES")
+    fill.add_argument("--bulk-fill", action="store_true", help="set every value in one injected script")
+    fill.add_argument("--incremental", action="store_true", help="only write fields that differ")
+    fill.add_argument("--plan", help="fill plan written by the plan command")
+    fill.add_argument("--review", action="store_true", help="keep the browser open until Enter is pressed")
+    fill.add_argument("--trace", metavar="PATH",
+                      help="record phase and field spans to PATH (.jsonl: JSON lines, otherwise a Chrome trace)")
+    add_logging_arguments(fill)
+
+    # Parsed by batch_runner itself; listed here for --help
+    commands.add_parser("batch", add_help=False, help="fill every posting of a jobs file in parallel "
+                                                      "(options: batch_runner.py --help)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        from batch_runner import main as batch_main
+        return batch_main(argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv or ["fill"])
+    if args.candidate and not args.profile_store:
+        parser.error("--candidate needs --profile-store")
+
+    if args.command == "classify":
+        from fill_plan import load_schema
+        preview = classify_schema(_filler_from_args(args), load_schema(args.schema))
+        if args.json:
+            print(json.dumps([{"label": field["label"], "selector": field["selector"], "rule": rule_id, "value": value}
+                              for field, rule_id, value in preview], indent=2))
+            return 0
+        for field, rule_id, value in preview:
+            label = (field["label"] or field["name"] or field["selector"] or "")[:50]
+            shown = "⏭️  (no value)" if not value else str(value).replace("\n", " ")[:60]
+            print(f"{label:<50}  {rule_id or 'none':<26}  {shown}")
+        resolved = sum(1 for _, _, value in preview if value)
+        print(f"\n📋 {resolved} of {len(preview)} fields have a value")
+        return 0
+
+    if args.command == "plan":
+        from fill_plan import build_fill_plan, load_schema, save_plan
+        plan = build_fill_plan(load_schema(args.schema), _filler_from_args(args))
+        save_plan(plan, args.output)
+        resolved = sum(1 for step in plan["steps"] if step["value"])
+        print(f"✅ Planned {len(plan['steps'])} fields ({resolved} with values) to {args.output}")
+        return 0
+
+    # --review prompts on stdout, so records are written straight away instead of batched
+    configure_logging(**logging_options(args, buffered=not args.review))
+    fill_plan = None
+    if args.plan:
+        from fill_plan import load_plan
+        fill_plan = load_plan(args.plan)
+    tracer = FillTracer() if args.trace else None
+    filler = _filler_from_args(args, bulk_fill=args.bulk_fill, incremental=args.incremental,
+                               launch_profile=args.launch_profile, fill_plan=fill_plan, headless=args.headless,
+                               tracer=tracer)
+    log = get_fill_logger(args.url)
+    log.warning("⚠️  IMPORTANT: Review all data before submitting!")
+    success = filler.fill_form(args.url, review=args.review)
+    if tracer:
+        log.info("🔬 Wrote %d spans to %s", tracer.export(args.trace), args.trace)
     if success:
-        print("\n✨ Enhanced form filling completed successfully!")
-    else:
-        print("\n❌ Form filling failed - check error messages above")
+        log.info("\n✨ Enhanced form filling completed successfully!")
+        return 0
+    log.error("\n❌ Form filling failed - check error messages above")
+    return 1
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Single round-trip form field discovery via one injected script
+"""
+
+from page_waits import FORM_FIELD_SELECTOR
+
+# Collects everything the filler needs about every field in one execute_script call.
+# Context mirrors the old parent/grandparent .text lookup: the nearest ancestor
+# whose visible text is non-empty and shorter than 500 characters.
+DISCOVER_FIELDS_JS = """
+var selector = arguments[0];
+var maxContext = 500;
+
+function text(node) {
+    return node ? (node.innerText || node.textContent || '').trim() : '';
+}
+
+function quote(value) {
+    return "'" + value.replace(/\\\\/g, '\\\\\\\\').replace(/'/g, "\\\\'") + "'";
+}
+
+function isVisible(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.opacity !== '0';
+}
+
+function labelFor(el) {
+    if (el.labels && el.labels.length) return text(el.labels[0]);
+    var labelledBy = el.getAttribute('aria-labelledby');
+    if (labelledBy) {
+        var parts = labelledBy.split(/\\s+/).map(function (id) {
+            return text(document.getElementById(id));
+        });
+        return parts.join(' ').trim();
+    }
+    return (el.getAttribute('aria-label') || '').trim();
+}
+
+function contextFor(el) {
+    var parent = el.parentElement;
+    var parentText = text(parent);
+    if (parentText && parentText.length < maxContext) return parentText;
+    var grandparent = parent ? parent.parentElement : null;
+    var grandparentText = text(grandparent);
+    if (grandparentText && grandparentText.length < maxContext) return grandparentText;
+    return '';
+}
+
+var elements = document.querySelectorAll(selector);
+var fields = [];
+for (var i = 0; i < elements.length; i++) {
+    var el = elements[i];
+    var tag = el.tagName.toLowerCase();
+    // The input inside a combobox widget is driven through the combobox itself
+    if (el.parentElement && el.parentElement.closest('[role=combobox]')) continue;
+    var name = el.getAttribute('name') || '';
+    var id = el.id || '';
+    // Workday-style boards generate ids per render; their automation ids are stable
+    var automationId = el.getAttribute('data-automation-id') || '';
+    var stable = null;
+    if (name) stable = tag + '[name=' + quote(name) + ']';
+    else if (automationId) stable = tag + '[data-automation-id=' + quote(automationId) + ']';
+    else if (id) stable = tag + '[id=' + quote(id) + ']';
+    // Radio and checkbox groups share one name: each member is told apart by its value
+    if (stable && document.querySelectorAll(stable).length > 1) {
+        var value = el.getAttribute('value');
+        if (value !== null) stable += '[value=' + quote(value) + ']';
+        // Still ambiguous: no selector, so the field is keyed and re-found by document position
+        if (document.querySelectorAll(stable).length > 1) stable = null;
+    }
+    var field = {
+        element: el,
+        index: i,
+        position: i,
+        tag: tag,
+        input_type: tag === 'input' ? (el.getAttribute('type') || '').toLowerCase() : '',
+        id: id,
+        name: name,
+        placeholder: el.getAttribute('placeholder') || '',
+        label: labelFor(el),
+        context: contextFor(el),
+        required: el.required || el.getAttribute('aria-required') === 'true',
+        visible: isVisible(el),
+        enabled: !el.disabled,
+        selector: stable
+    };
+    if (automationId) {
+        field.automation_id = automationId;
+    }
+    if (field.input_type === 'file') {
+        field.accept = el.getAttribute('accept') || '';
+    }
+    if (tag !== 'select' && (el.getAttribute('role') === 'combobox' || el.getAttribute('aria-haspopup') === 'listbox')) {
+        field.combobox = true;
+    }
+    if (tag === 'select') {
+        field.options = Array.prototype.map.call(el.options, function (opt) {
+            return {value: opt.value, text: (opt.text || '').trim(), disabled: opt.disabled};
+        });
+    }
+    fields.push(field);
+}
+return fields;
+"""
+
+# Re-resolves element handles for known fields: stable selector first, then document position
+# (only for fields whose position is known; a plan's step numbers are not positions)
+RESOLVE_FIELDS_JS = """
+var fields = arguments[0];
+var all = document.querySelectorAll(arguments[1]);
+return fields.map(function (f) {
+    var el = f[0] ? document.querySelector(f[0]) : null;
+    if (!el && f[1] !== null) el = all[f[1]];
+    return el || null;
+});
+"""
+
+
+def discover_fields(driver, selector=FORM_FIELD_SELECTOR):
+    """Return a descriptor dict (with its WebElement handle) for every form field on the page"""
+    return driver.execute_script(DISCOVER_FIELDS_JS, selector) or []
+
+
+def describe_field(field):
+    """Short human-readable description of a field descriptor"""
+    desc = field["tag"]
+    if field["input_type"]:
+        desc += f"[{field['input_type']}]"
+    name = field["name"]
+    if name:
+        desc += f" name='{name[:20]}...'" if len(name) > 20 else f" name='{name}'"
+    return desc
+
+
+def is_fillable(field):
+    """File inputs may be hidden but still work; everything else must be visible and enabled"""
+    if field["tag"] == "input" and field["input_type"] == "file":
+        return field["enabled"]
+    return field["visible"] and field["enabled"]
+
+
+def resolve_fields(driver, fields, selector=FORM_FIELD_SELECTOR):
+    """Attach live element handles to stored descriptors in one call; False if any is missing"""
+    elements = driver.execute_script(RESOLVE_FIELDS_JS, [[f.get("selector"), f.get("position")] for f in fields], selector)
+    if not elements or any(element is None for element in elements):
+        return False
+    for field, element in zip(fields, elements):
+        field["element"] = element
+    return True
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Declarative field-classification rules compiled into a single keyword matcher
+"""
+
+import re
+
+# Rules are checked in priority order; the first rule whose constraints and
+# triggers are satisfied wins. Keys:
+#   id             - reported for every classified field
+#   tags           - only applies to these tags
+#   exclude_tags   - never applies to these tags
+#   input_types    - only applies to these input types
+#   type_triggers  - input types that trigger the rule without any keyword
+#   keywords       - triggers when any of these appear in the field text
+#   requires       - additionally needs any of these in the field text
+#   profile / response - where the value comes from
+# A rule with neither keywords nor type_triggers is a fallback for its tags.
+FIELD_RULES = [
+    {"id": "email", "type_triggers": ["email"], "keywords": ["email"], "profile": "email"},
+    {"id": "phone", "type_triggers": ["tel"], "keywords": ["phone", "tel", "mobile"], "profile": "phone"},
+    {"id": "first_name", "keywords": ["name"], "requires": ["first"], "profile": "first_name"},
+    {"id": "last_name", "keywords": ["name"], "requires": ["last"], "profile": "last_name"},
+    {"id": "full_name", "keywords": ["name"], "profile": "full_name"},
+    {"id": "linkedin", "keywords": ["linkedin"], "profile": "linkedin"},
+    {"id": "github", "keywords": ["github"], "profile": "github"},
+    {"id": "portfolio", "type_triggers": ["url"], "keywords": ["portfolio", "website"], "profile": "portfolio"},
+    {"id": "salary", "keywords": ["salary", "compensation", "pay"], "profile": "salary"},
+    {"id": "years_experience", "exclude_tags": ["textarea"], "keywords": ["experience", "years"], "profile": "experience"},
+
+    # Free-text questions
+    {"id": "cover_letter", "tags": ["textarea"], "keywords": ["cover", "letter", "introduction", "tell us about yourself"], "response": "cover_letter"},
+    {"id": "why_interested", "tags": ["textarea"], "keywords": ["why", "interested", "motivation", "attracted"], "response": "why_interested"},
+    {"id": "experience", "tags": ["textarea"], "keywords": ["experience", "background", "qualifications"], "response": "experience"},
+    {"id": "strengths", "tags": ["textarea"], "keywords": ["strength", "skills", "abilities"], "response": "strengths"},
+    {"id": "challenge", "tags": ["textarea"], "keywords": ["challenge", "difficult", "problem", "overcome"], "response": "challenge"},
+    {"id": "teamwork", "tags": ["textarea"], "keywords": ["team", "collaboration", "work with others"], "response": "teamwork"},
+    {"id": "work_style", "tags": ["textarea"], "keywords": ["work style", "approach", "methodology"], "response": "work_style"},
+    {"id": "remote_experience", "tags": ["textarea"], "keywords": ["remote", "distributed", "home", "virtual"], "response": "remote_experience"},
+    {"id": "availability", "tags": ["textarea"], "keywords": ["available", "start", "notice"], "response": "availability"},
+    {"id": "questions", "tags": ["textarea"], "keywords": ["question", "ask", "curious", "learn more"], "response": "questions"},
+    {"id": "travel", "tags": ["textarea"], "keywords": ["travel", "trip", "journey", "destination"], "response": "travel"},
+    {"id": "technology", "tags": ["textarea"], "keywords": ["technology", "tools", "software", "technical"], "response": "technology"},
+    {"id": "career_goals", "tags": ["textarea"], "keywords": ["career", "goal", "future", "growth"], "response": "career_goals"},
+    {"id": "motivation", "tags": ["textarea"], "keywords": ["motivate", "drive", "inspire"], "response": "motivation"},
+    {"id": "textarea_default", "tags": ["textarea"], "response": "general"},
+
+    # Other short text inputs
+    {"id": "text_default", "tags": ["input"], "input_types": ["text", ""], "profile": "full_name"},
+]
+
+# Dropdown rules: field text selects the rule, `options` picks the first option containing one of them
+SELECT_RULES = [
+    {"id": "select_experience", "keywords": ["experience", "years"], "options": ["3-5", "4-6", "5+", "5-7"]},
+    # Before employment: "authorized to work" questions also mention work
+    {"id": "select_eligibility", "keywords": ["eligible", "authorized"], "options": ["yes"]},
+    {"id": "select_employment", "keywords": ["work", "employment", "type"], "options": ["full"]},
+]
+
+# Option texts that are prompts rather than real choices
+PLACEHOLDER_OPTION_KEYWORDS = ["select", "choose", "please", "--"]
+
+
+class KeywordMatcher:
+    """Finds every keyword occurring anywhere in a text with one regex pass"""
+
+    def __init__(self, keywords):
+        self.keywords = sorted(set(k.lower() for k in keywords), key=len, reverse=True)
+        # A zero-width lookahead tries every position, so overlapping hits are found.
+        # At each position the longest keyword wins; shorter keywords that are its
+        # prefixes are added back from this table.
+        self._prefixes = {
+            k: [p for p in self.keywords if p != k and k.startswith(p)] for k in self.keywords
+        }
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        self._pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE) if self.keywords else None
+
+    def scan(self, text):
+        """Set of keywords occurring in text"""
+        if not self._pattern or not text:
+            return set()
+        found = set()
+        for match in self._pattern.finditer(text):
+            keyword = match.group(1).lower()
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._prefixes[keyword])
+        return found
+
+    def contains_any(self, text):
+        """True if any keyword occurs in text"""
+        return bool(self._pattern and text and self._pattern.search(text))
+
+
+class RuleClassifier:
+    """Compiles a rule table once and classifies field text in a single pass"""
+
+    def __init__(self, rules):
+        self.rules = [dict(rule, priority=i) for i, rule in enumerate(rules)]
+        keywords = set()
+        self._by_keyword = {}
+        self._by_type = {}
+        self._fallbacks = []
+        for rule in self.rules:
+            triggers = [k.lower() for k in rule.get("keywords", [])]
+            keywords.update(triggers)
+            keywords.update(k.lower() for k in rule.get("requires", []))
+            for keyword in triggers:
+                self._by_keyword.setdefault(keyword, []).append(rule)
+            for input_type in rule.get("type_triggers", []):
+                self._by_type.setdefault(input_type, []).append(rule)
+            if not triggers and not rule.get("type_triggers"):
+                self._fallbacks.append(rule)
+        self.matcher = KeywordMatcher(keywords)
+
+    def _applies(self, rule, tag, input_type, hits):
+        if "tags" in rule and tag not in rule["tags"]:
+            return False
+        if tag in rule.get("exclude_tags", []):
+            return False
+        if "input_types" in rule and input_type not in rule["input_types"]:
+            return False
+        if "requires" in rule and not hits.intersection(rule["requires"]):
+            return False
+        return True
+
+    def classify(self, text, tag="", input_type=""):
+        """Highest-priority rule matching the field, or None"""
+        hits = self.matcher.scan(text)
+        candidates = list(self._fallbacks)
+        candidates.extend(self._by_type.get(input_type, []))
+        for keyword in hits:
+            candidates.extend(self._by_keyword.get(keyword, []))
+        for rule in sorted(candidates, key=lambda r: r["priority"]):
+            if self._applies(rule, tag, input_type, hits):
+                return rule
+        return None
+
+
+FIELD_CLASSIFIER = RuleClassifier(FIELD_RULES)
+SELECT_CLASSIFIER = RuleClassifier(SELECT_RULES)
+PLACEHOLDER_OPTION_MATCHER = KeywordMatcher(PLACEHOLDER_OPTION_KEYWORDS)
+_SELECT_OPTION_MATCHERS = {rule["id"]: KeywordMatcher(rule["options"]) for rule in SELECT_RULES}
+_RULES_BY_ID = {rule["id"]: rule for rule in FIELD_RULES}
+
+
+def rule_target(rule_id):
+    """Where a field rule takes its value from: 'profile.<key>', 'responses.<key>' or None"""
+    rule = _RULES_BY_ID.get(rule_id)
+    if not rule:
+        return None
+    return f"profile.{rule['profile']}" if "profile" in rule else f"responses.{rule['response']}"
+
+
+_OPTION_WORD_PATTERN = re.compile(r"[a-z0-9]+\+?")
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_RANGE_PATTERN = re.compile(_NUMBER + r"\s*(?:-|–|—|to)\s*" + _NUMBER)
+_AT_LEAST_PATTERN = re.compile(_NUMBER + r"\s*(?:\+|or more|and above|and up|or above)|at least\s*" + _NUMBER)
+_MORE_THAN_PATTERN = re.compile(r"(?:more than|over|greater than|>)\s*" + _NUMBER)
+_LESS_THAN_PATTERN = re.compile(r"(?:less than|under|fewer than|<)\s*" + _NUMBER)
+_SINGLE_NUMBER_PATTERN = re.compile(r"^\D*" + _NUMBER + r"\D*$")
+_TARGET_NUMBER_PATTERN = re.compile(r"^" + _NUMBER + r"(?:\s*(?:years?|yrs?))?$")
+
+# Minimum score for an option to count as the target value
+OPTION_MATCH_THRESHOLD = 0.5
+
+
+def normalize_option_text(text):
+    """Lowercased words of an option text ('Full-time ' -> 'full time', '5+ years' -> '5+ years')"""
+    return " ".join(_OPTION_WORD_PATTERN.findall(str(text).lower()))
+
+
+def _numeric_score(option, number):
+    """1.0 if an option's numeric range contains number, 0.0 if it doesn't, None if it has no range"""
+    text = option.lower()
+    match = _RANGE_PATTERN.search(text)
+    if match:
+        return 1.0 if float(match.group(1)) <= number <= float(match.group(2)) else 0.0
+    match = _AT_LEAST_PATTERN.search(text)
+    if match:
+        return 1.0 if number >= float(match.group(1) or match.group(2)) else 0.0
+    match = _MORE_THAN_PATTERN.search(text)
+    if match:
+        return 1.0 if number > float(match.group(1)) else 0.0
+    match = _LESS_THAN_PATTERN.search(text)
+    if match:
+        return 1.0 if number < float(match.group(1)) else 0.0
+    match = _SINGLE_NUMBER_PATTERN.match(text)
+    if match:
+        return 1.0 if number == float(match.group(1)) else 0.0
+    return None
+
+
+def score_option(option, target):
+    """How well an option text matches a target value, from 0.0 to 1.0
+
+    Exact (normalized) text scores 1.0, a whole-word containment 0.8 and a partial
+    word overlap up to 0.7. A numeric target such as a years-of-experience "5" is
+    scored against ranges like "3-5", "5+" or "Less than 2".
+    """
+    option_text = normalize_option_text(option)
+    target_text = normalize_option_text(target)
+    if not option_text or not target_text:
+        return 0.0
+    if option_text == target_text:
+        return 1.0
+    number = _TARGET_NUMBER_PATTERN.match(str(target).strip().lower())
+    if number:
+        score = _numeric_score(str(option), float(number.group(1)))
+        if score is not None:
+            return score
+    if f" {target_text} " in f" {option_text} " or f" {option_text} " in f" {target_text} ":
+        return 0.8
+    option_words = set(option_text.split())
+    target_words = set(target_text.split())
+    return 0.7 * len(option_words & target_words) / len(option_words | target_words)
+
+
+class OptionIndex:
+    """Normalized option text -> option position, built once per dropdown"""
+
+    def __init__(self, options):
+        # Discovery descriptors ({"text", "value", "disabled"}) or plain option texts
+        self.options = [opt if isinstance(opt, dict) else {"text": opt, "value": opt, "disabled": False}
+                        for opt in options]
+        self.positions = {}
+        for position, opt in enumerate(self.options):
+            if not opt.get("disabled"):
+                self.positions.setdefault(normalize_option_text(opt["text"]), position)
+
+    def position(self, text):
+        """Position of the option whose text equals text (ignoring case and punctuation), or None"""
+        return self.positions.get(normalize_option_text(text))
+
+    def best(self, target, threshold=OPTION_MATCH_THRESHOLD):
+        """(position, score) of the option matching target best, or (None, 0.0) below threshold"""
+        position = self.position(target)
+        if position is not None:
+            return position, 1.0
+        best_position, best_score = None, 0.0
+        for position, opt in enumerate(self.options):
+            if opt.get("disabled") or PLACEHOLDER_OPTION_MATCHER.contains_any(opt["text"]):
+                continue
+            score = score_option(opt["text"], target)
+            if score > best_score:
+                best_position, best_score = position, score
+        if best_score < threshold:
+            return None, 0.0
+        return best_position, round(best_score, 3)
+
+
+def choose_option(options, text, target=None):
+    """Pick a dropdown option for the field text; returns (rule id, option text) or (None, None)
+
+    The option scoring best against target (the value the field rules chose) wins;
+    otherwise the select rule's preferred keywords, then the first real option.
+    """
+    valid_options = [opt for opt in options if opt and not PLACEHOLDER_OPTION_MATCHER.contains_any(opt)]
+    if not valid_options:
+        return None, None
+
+    rule = SELECT_CLASSIFIER.classify(text)
+    if target:
+        position, _ = OptionIndex(valid_options).best(target)
+        if position is not None:
+            return (rule["id"] if rule else "select_best_match"), valid_options[position]
+    if rule:
+        matcher = _SELECT_OPTION_MATCHERS[rule["id"]]
+        for opt in valid_options:
+            if matcher.contains_any(opt):
+                return rule["id"], opt
+    return "select_first_option", valid_options[0]
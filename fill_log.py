@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Structured fill logging: leveled records per posting and field, written in batches off the filling threads
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+LOGGER_NAME = "form_filler"
+
+LOG_FORMATS = ("human", "json")
+
+# Structured attributes a record can carry; FillLogger accepts them as keyword arguments
+RECORD_FIELDS = ("posting", "field", "action", "outcome", "rule")
+
+
+class HumanFormatter(logging.Formatter):
+    """The classic emoji console output, optionally prefixed with the posting when several run at once"""
+
+    def __init__(self, show_posting=False):
+        super().__init__()
+        self.show_posting = show_posting
+
+    def format(self, record):
+        message = record.getMessage()
+        if self.show_posting and getattr(record, "posting", None):
+            prefix = f"[{record.posting}] "
+            message = "\n".join(prefix + line if line else line for line in message.split("\n"))
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, message and the structured fill attributes"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage().strip(),
+        }
+        for key in RECORD_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that writes formatted records in batches instead of one write per record
+
+    Errors are written at once. stream=None means whatever sys.stdout is at write time,
+    so contextlib.redirect_stdout() still captures the output.
+    """
+
+    def __init__(self, stream=None, capacity=256, flush_interval=0.5):
+        super().__init__(stream)
+        self._target = stream
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._lines = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def stream(self):
+        return self._target or sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        self._target = value
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.acquire()
+        try:
+            self._lines.append(line)
+            if len(self._lines) >= self.capacity or record.levelno >= logging.ERROR or \
+                    time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write()
+        finally:
+            self.release()
+
+    def _write(self):
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + self.terminator)
+            self._lines = []
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._write()
+        finally:
+            self.release()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue has been idle for flush_interval"""
+
+    def __init__(self, log_queue, handler, flush_interval):
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get(False)
+        while True:
+            try:
+                return self.queue.get(True, self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+class FillLogger(logging.LoggerAdapter):
+    """Logger adapter stamping fixed attributes (posting, field) on every record
+
+    The RECORD_FIELDS can be passed directly: log.info("✅ Filled", action="fill", outcome="ok").
+    """
+
+    def process(self, msg, kwargs):
+        extra = dict(self.extra)
+        extra.update(kwargs.pop("extra", None) or {})
+        for key in RECORD_FIELDS:
+            if key in kwargs:
+                extra[key] = kwargs.pop(key)
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+    def bind(self, **attributes):
+        """Adapter with more fixed attributes, e.g. the field being processed"""
+        return FillLogger(self.logger, {**self.extra, **attributes})
+
+
+def get_fill_logger(posting=None, **attributes):
+    """Adapter on the form_filler logger for one posting (or none)"""
+    return FillLogger(logging.getLogger(LOGGER_NAME), dict(attributes, posting=posting))
+
+
+class LogSink:
+    """The installed handler pipeline; stop() drains the queue and flushes what is buffered"""
+
+    def __init__(self, handler, listener=None):
+        self.handler = handler
+        self.listener = listener
+        self.stopped = False
+
+    def stop(self):
+        if self.stopped:
+            return
+        self.stopped = True
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        self.handler.flush()
+        if self.handler.stream not in (sys.stdout, sys.stderr):
+            self.handler.close()
+            self.handler.stream.close()
+
+
+_active_sink = None
+
+
+def configure_logging(log_format="human", level=logging.INFO, quiet=False, path=None, stream=None,
+                      buffered=True, capacity=256, flush_interval=0.5, show_posting=False):
+    """Install the form_filler log pipeline, replacing any earlier one; returns its LogSink
+
+    quiet keeps warnings and errors only. With buffered=True records are handed to a
+    queue and written in batches by a background thread, so filling threads never
+    block on stdout or the log file.
+    """
+    global _active_sink
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}' (choose from {', '.join(LOG_FORMATS)})")
+    if _active_sink:
+        _active_sink.stop()
+
+    if path:
+        stream = open(path, "a", encoding="utf-8")
+    handler = BufferedStreamHandler(stream, capacity=capacity if buffered else 1, flush_interval=flush_interval)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else HumanFormatter(show_posting))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.WARNING if quiet else level)
+    logger.propagate = False
+    listener = None
+    if buffered:
+        log_queue = queue.SimpleQueue()
+        listener = _FlushingQueueListener(log_queue, handler, flush_interval)
+        listener.start()
+        logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    else:
+        logger.handlers = [handler]
+    _active_sink = LogSink(handler, listener)
+    return _active_sink
+
+
+def shutdown_logging():
+    """Flush and stop the active pipeline; later records go straight to stdout again"""
+    configure_logging(buffered=False)
+
+
+def add_logging_arguments(parser):
+    """--log-format, --log-file and --quiet options for a CLI"""
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="human")
+    parser.add_argument("--log-file", help="append log records to this file instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="only log warnings and errors")
+
+
+def logging_options(args, **overrides):
+    """configure_logging() keyword arguments for parsed add_logging_arguments() options"""
+    return dict({"log_format": args.log_format, "path": args.log_file, "quiet": args.quiet}, **overrides)
+
+
+# Until a CLI configures logging, records go straight to stdout in the human format,
+# exactly like the print() output they replaced
+configure_logging(buffered=False)
+atexit.register(lambda: _active_sink.stop())
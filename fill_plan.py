@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Schema-driven fill plans: extract a form schema once, resolve every value ahead of time
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from page_waits import FORM_FIELD_SELECTOR, PageWaiter
+from field_discovery import discover_fields, is_fillable
+from board_adapters import detect_board
+
+# Looks up every plan selector in one call, with the state is_fillable() needs and the
+# element's document position among form fields (step numbers are not positions)
+RESOLVE_PLAN_JS = """
+var all = Array.prototype.slice.call(document.querySelectorAll(arguments[1]));
+return arguments[0].map(function (selector) {
+    var el = null;
+    try { el = selector ? document.querySelector(selector) : null; } catch (e) {}
+    if (!el) return null;
+    var style = window.getComputedStyle(el);
+    var position = all.indexOf(el);
+    return {
+        element: el,
+        visible: el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0',
+        enabled: !el.disabled,
+        position: position === -1 ? null : position
+    };
+});
+"""
+
+_PAGE_METADATA_JS = """
+var h1 = document.querySelector('h1');
+return {title: document.title, url: location.href, page_heading: h1 ? h1.innerText.trim() : ''};
+"""
+
+
+def schema_field_from_descriptor(field):
+    """extracted_fields.json entry for a discovered field descriptor"""
+    entry = {
+        "type": "file" if field["input_type"] == "file" else field["tag"],
+        "input_type": field["input_type"],
+        "name": field["name"],
+        "id": field["id"],
+        "label": field["label"] or field["context"],
+        "placeholder": field["placeholder"],
+        "required": field["required"],
+        "selector": field["selector"],
+    }
+    if field.get("accept"):
+        entry["accept"] = field["accept"]
+    if field.get("combobox"):
+        entry["combobox"] = True
+    if field.get("automation_id"):
+        entry["automation_id"] = field["automation_id"]
+    if field.get("options"):
+        entry["options"] = [opt["text"] for opt in field["options"]]
+    return entry
+
+
+def extract_schema(driver, url=None, waiter=None):
+    """Schema of the form on the current page (navigating to url first if given)
+
+    Waits for the same readiness conditions as fill_form first, so forms rendered
+    client-side (Ashby, Lever) are complete; raises RuntimeError if no field appears.
+    """
+    if url:
+        driver.get(url)
+    waiter = waiter or PageWaiter(driver)
+    waiter.dom_ready()
+    if not waiter.form_fields_present():
+        raise RuntimeError(f"no form fields appeared within {waiter.timeout}s - not writing an empty schema")
+    metadata = driver.execute_script(_PAGE_METADATA_JS)
+    fields = [schema_field_from_descriptor(field) for field in discover_fields(driver) if is_fillable(field)]
+    return {
+        "url": metadata["url"],
+        "extracted_at": datetime.now().isoformat(),
+        "form_metadata": metadata,
+        "fields": fields,
+    }
+
+
+def load_schema(path="extracted_fields.json"):
+    """Read a schema written by extract_schema() (or the original extractor)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def plan_fields(schema):
+    """Filler field descriptors for a schema, one per distinct field"""
+    fields = []
+    seen = set()
+    for position, entry in enumerate(schema["fields"]):
+        is_file = entry["type"] == "file" or entry.get("input_type") == "file"
+        key = entry.get("id") or entry.get("selector") or f"#{position}"
+        # Unlabelled optional widgets (e.g. a reCAPTCHA response textarea) are never filled
+        if key in seen or not (entry.get("label") or entry.get("required")):
+            continue
+        seen.add(key)
+        tag = "input" if is_file else entry["type"]
+        fields.append({
+            "index": len(fields),
+            "tag": tag,
+            "input_type": "file" if is_file else entry.get("input_type", ""),
+            "id": entry.get("id", ""),
+            "name": entry.get("name", ""),
+            "placeholder": entry.get("placeholder") or "",
+            "label": entry.get("label", ""),
+            "context": entry.get("label", ""),
+            "required": entry.get("required", False),
+            "selector": entry.get("selector"),
+            "accept": entry.get("accept", ""),
+            "combobox": entry.get("combobox", False),
+            "automation_id": entry.get("automation_id", ""),
+            "options": [{"value": text, "text": text, "disabled": False} for text in entry.get("options", [])],
+        })
+    return fields
+
+
+def build_fill_plan(schema, filler):
+    """Resolve every field's value once, offline, with the filler's profile and rules"""
+    fields = plan_fields(schema)
+    filler.board = detect_board(schema.get("url"), fields=fields)
+    steps = []
+    for field in fields:
+        if field["input_type"] == "file":
+            rule_id, value = None, None
+        else:
+            rule_id, value = filler._resolve_field_value(field)
+        steps.append(dict(field, rule=rule_id, value=value))
+    return {
+        "url": schema.get("url"),
+        "board": filler.board.name,
+        "created_at": datetime.now().isoformat(),
+        "values_key": filler._values_key(),
+        "steps": steps,
+    }
+
+
+def save_plan(plan, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+
+
+def load_plan(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_plan(driver, plan, selector=FORM_FIELD_SELECTOR):
+    """Attach live elements to plan steps in one call, then discover whatever the plan didn't cover
+
+    Returns (fields, values, unmatched): values are keyed like the schema cache's,
+    unmatched counts plan steps whose selector no longer matches the page.
+    """
+    steps = plan["steps"]
+    found = driver.execute_script(RESOLVE_PLAN_JS, [step["selector"] for step in steps], selector) or [None] * len(steps)
+    fields = []
+    values = {}
+    for step, live in zip(steps, found):
+        if live is None:
+            continue
+        field = {key: value for key, value in step.items() if key not in ("rule", "value")}
+        field.update(live)
+        fields.append(field)
+        values[str(field["index"])] = [step["rule"], step["value"]]
+    unmatched = len(steps) - len(fields)
+
+    # Fields the plan doesn't know about (or whose selector changed) go through live discovery
+    if unmatched or not steps:
+        known = {field["selector"] for field in fields}
+        offset = len(steps)
+        for field in discover_fields(driver, selector):
+            if field["selector"] and field["selector"] in known:
+                continue
+            # Keyed past the plan's step numbers; "position" keeps the document position
+            field["index"] += offset
+            fields.append(field)
+    return fields, values, unmatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract form schemas and precompute fill plans")
+    commands = parser.add_subparsers(dest="command", required=True)
+    extract = commands.add_parser("extract", help="write the schema of a live form")
+    extract.add_argument("url")
+    extract.add_argument("-o", "--output", default="extracted_fields.json")
+    extract.add_argument("--headless", action="store_true")
+    build = commands.add_parser("build", help="resolve every value of a schema into a fill plan")
+    build.add_argument("schema", nargs="?", default="extracted_fields.json")
+    build.add_argument("-o", "--output", default="fill_plan.json")
+    args = parser.parse_args()
+
+    from enhanced_form_filler import EnhancedFormFiller, create_chrome_driver
+
+    if args.command == "extract":
+        driver = create_chrome_driver(headless=args.headless)
+        try:
+            schema = extract_schema(driver, args.url)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            driver.quit()
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(schema, f, indent=2)
+        print(f"✅ Extracted {len(schema['fields'])} fields to {args.output}")
+    else:
+        plan = build_fill_plan(load_schema(args.schema), EnhancedFormFiller())
+        save_plan(plan, args.output)
+        resolved = sum(1 for step in plan["steps"] if step["value"])
+        print(f"✅ Planned {len(plan['steps'])} fields ({resolved} with values) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
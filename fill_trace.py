@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Per-phase and per-field timing spans with JSON lines and Chrome trace export
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """Span returned while tracing is disabled; every operation is a no-op"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """One timed phase or field; attributes can be added while it is open"""
+
+    def __init__(self, tracer, name, category, attrs):
+        self.tracer = tracer
+        self.record = {"name": name, "category": category, **attrs}
+
+    def set(self, **attrs):
+        self.record.update(attrs)
+
+    def __enter__(self):
+        tracer = self.tracer
+        # Calls are counted per thread, so a batch worker's spans don't include its neighbours' calls
+        self._calls = tracer._thread_calls()
+        # Spans nest per thread: batch workers sharing a tracer each get their own parent chain
+        stack = tracer._stack
+        self.record["parent"] = stack[-1] if stack else None
+        self.record["tid"] = threading.get_ident()
+        with tracer._lock:
+            self.record["id"] = len(tracer.spans)
+            tracer.spans.append(self.record)
+        stack.append(self.record["id"])
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        tracer = self.tracer
+        end = time.perf_counter()
+        self.record["start_ms"] = round((self._start - tracer.origin) * 1000, 3)
+        self.record["duration_ms"] = round((end - self._start) * 1000, 3)
+        # Includes calls made by nested spans
+        self.record["webdriver_calls"] = tracer._thread_calls() - self._calls
+        if exc_type is not None:
+            self.record["error"] = f"{exc_type.__name__}: {exc}"
+        tracer._stack.pop()
+        return False
+
+
+class FillTracer:
+    """Records spans for fill phases and fields, counting WebDriver commands issued inside each
+
+    One tracer can be shared by the threads of a batch run: spans nest and count calls per
+    thread, and webdriver_calls is the total over all of them.
+    """
+
+    def __init__(self, enabled=True, run_id=None):
+        self.enabled = enabled
+        self.run_id = run_id or f"{os.getpid()}-{int(time.time() * 1000)}"
+        self.spans = []
+        self.webdriver_calls = 0
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        """Open span ids of the calling thread, innermost last"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _thread_calls(self):
+        """WebDriver commands sent so far by the calling thread"""
+        return getattr(self._local, "calls", 0)
+
+    def attach(self, driver):
+        """Count every WebDriver command the driver sends (wraps driver.execute on this instance only)
+
+        Idempotent: a wrapper left by an earlier attach (e.g. the previous job's tracer on a
+        pooled browser) is replaced, never stacked, and a disabled tracer just removes it.
+        """
+        execute = detach(driver)
+        if not self.enabled:
+            return driver
+
+        def counted_execute(*args, **kwargs):
+            self._local.calls = self._thread_calls() + 1
+            with self._lock:
+                self.webdriver_calls += 1
+            return execute(*args, **kwargs)
+
+        counted_execute._fill_tracer = self
+        counted_execute._original_execute = execute
+        driver.execute = counted_execute
+        return driver
+
+    def span(self, name, category="phase", **attrs):
+        """Context manager timing one phase or field"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, attrs)
+
+    def reset(self, run_id=None):
+        """Drop recorded spans and start a new run"""
+        self.run_id = run_id or f"{os.getpid()}-{int(time.time() * 1000)}"
+        self.spans = []
+        self.webdriver_calls = 0
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+
+    def mark(self):
+        """Where the calling thread is in the trace; print_report(since=mark) covers only later spans"""
+        return threading.get_ident(), len(self.spans)
+
+    def _spans_since(self, since):
+        if since is None:
+            return self.spans
+        tid, start = since
+        return [span for span in self.spans[start:] if span["tid"] == tid]
+
+    def export(self, path):
+        """Write the trace to path: JSON lines for a .jsonl file, else a Chrome trace document"""
+        if path.endswith(".jsonl"):
+            return self.export_jsonl(path)
+        return self.export_chrome_trace(path)
+
+    def export_jsonl(self, path, append=True):
+        """Write one JSON object per span, tagged with the run id; appends so many runs share a file"""
+        with open(path, "a" if append else "w", encoding="utf-8") as f:
+            for span in self.spans:
+                f.write(json.dumps({"run": self.run_id, **span}) + "\n")
+        return len(self.spans)
+
+    def to_chrome_trace(self):
+        """Spans as a Chrome trace document (load in chrome://tracing or Perfetto)"""
+        events = []
+        for span in self.spans:
+            if "duration_ms" not in span:
+                continue
+            args = {k: v for k, v in span.items() if k not in ("name", "category", "start_ms", "duration_ms", "tid")}
+            events.append({
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start_ms"] * 1000,
+                "dur": span["duration_ms"] * 1000,
+                "pid": os.getpid(),
+                # One track per filling thread, so concurrent postings don't draw over each other
+                "tid": span["tid"],
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run": self.run_id}}
+
+    def export_chrome_trace(self, path):
+        """Write the Chrome trace document to path"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return len(self.spans)
+
+    def slowest(self, count=5, category="field", since=None):
+        """The slowest finished spans of a category"""
+        spans = [s for s in self._spans_since(since) if s["category"] == category and "duration_ms" in s]
+        return sorted(spans, key=lambda s: s["duration_ms"], reverse=True)[:count]
+
+    def summary(self, since=None):
+        """Total time, span count and WebDriver calls per phase name"""
+        summary = {}
+        for span in self._spans_since(since):
+            if span["category"] != "phase" or "duration_ms" not in span:
+                continue
+            entry = summary.setdefault(span["name"], {"count": 0, "total_ms": 0.0, "webdriver_calls": 0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + span["duration_ms"], 3)
+            entry["webdriver_calls"] += span["webdriver_calls"]
+        return summary
+
+    def print_report(self, slowest=5, emit=print, since=None):
+        """Print (or pass to emit, e.g. a logger method) per-phase totals and the slowest fields
+
+        since: a mark() taken by the calling thread, to report only its spans after that point
+        """
+        if not self.enabled:
+            return
+        spans = self._spans_since(since)
+        calls = self.webdriver_calls if since is None else \
+            sum(span.get("webdriver_calls", 0) for span in spans if span["parent"] is None)
+        lines = [f"\n🔬 Trace: {len(spans)} spans, {calls} WebDriver calls"]
+        for name, entry in self.summary(since).items():
+            lines.append(f"   • {name}: {entry['total_ms']:.0f} ms, {entry['webdriver_calls']} calls")
+        fields = self.slowest(slowest, since=since)
+        if fields:
+            lines.append("   Slowest fields:")
+            for span in fields:
+                lines.append(f"   • {span.get('selector') or span['name']}: {span['duration_ms']:.0f} ms, "
+                             f"{span['webdriver_calls']} calls ({span.get('kind') or 'unclassified'})")
+        emit("\n".join(lines))
+
+
+def detach(driver):
+    """Remove a FillTracer's counting wrapper from driver.execute; returns the original execute"""
+    original = getattr(driver.execute, "_original_execute", None)
+    if original is None:
+        return driver.execute
+    driver.execute = original
+    return original
+
+
+# Shared disabled tracer: the default for fillers that don't ask for tracing
+NULL_TRACER = FillTracer(enabled=False, run_id="disabled")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Element handle cache that survives re-renders: stale handles are re-resolved in one batched call
+"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from page_waits import FORM_FIELD_SELECTOR
+from progress_journal import field_key
+
+# Remembers each field's node in a page-side map. WebDriver refuses detached elements as
+# script arguments, so later checks refer to nodes by key instead of passing handles back.
+REGISTER_HANDLES_JS = """
+var map = window.__formFillerHandles = window.__formFillerHandles || {};
+arguments[0].forEach(function (entry) { map[entry[0]] = entry[1]; });
+return arguments[0].length;
+"""
+
+# For every [key, selector, position]: null while the remembered node is still attached,
+# else the node now at the stable selector (or document position, when known), or false if gone
+REFRESH_HANDLES_JS = """
+var entries = arguments[0], selector = arguments[1];
+var map = window.__formFillerHandles = window.__formFillerHandles || {};
+var all = null;
+return entries.map(function (entry) {
+    var el = map[entry[0]];
+    if (el && el.isConnected) return null;
+    var found = null;
+    try { found = entry[1] ? document.querySelector(entry[1]) : null; } catch (e) {}
+    if (!found && entry[2] !== null) {
+        all = all || document.querySelectorAll(selector);
+        found = all[entry[2]] || null;
+    }
+    if (!found) return false;
+    map[entry[0]] = found;
+    return found;
+});
+"""
+
+
+class HandleCache:
+    """Field descriptors keyed by stable selector, with their element handles kept fresh"""
+
+    def __init__(self, driver, selector=FORM_FIELD_SELECTOR):
+        self.driver = driver
+        self.selector = selector
+        self.fields = {}
+        self.stale_errors = 0
+        self.refreshes = 0
+        self.re_resolved = 0
+        self.missing = 0
+
+    def track(self, fields):
+        """Start tracking fields (descriptors with an "element"), in one script call"""
+        for field in fields:
+            self.fields[field_key(field)] = field
+        self.driver.execute_script(REGISTER_HANDLES_JS, [[field_key(field), field["element"]] for field in fields])
+
+    def refresh(self):
+        """Re-resolve every stale handle in one call, updating descriptors in place; returns how many"""
+        if not self.fields:
+            return 0
+        keys = list(self.fields)
+        entries = [[key, self.fields[key].get("selector"), self.fields[key].get("position")] for key in keys]
+        results = self.driver.execute_script(REFRESH_HANDLES_JS, entries, self.selector) or []
+        self.refreshes += 1
+        resolved = 0
+        for key, element in zip(keys, results):
+            if element is None:
+                continue
+            if element is False:
+                self.missing += 1
+                # Gone from the page: stop tracking it so later refreshes don't look again
+                del self.fields[key]
+                continue
+            self.fields[key]["element"] = element
+            resolved += 1
+        self.re_resolved += resolved
+        return resolved
+
+    def run(self, field, action, retries=1):
+        """Call action(); if the field's handle went stale, refresh all stale handles and retry"""
+        for attempt in range(retries + 1):
+            try:
+                return action()
+            except StaleElementReferenceException:
+                self.stale_errors += 1
+                if attempt == retries:
+                    raise
+                self.refresh()
+                if field_key(field) not in self.fields:
+                    raise
+
+    def stats(self):
+        """Stale errors seen, batched refreshes, handles re-resolved and fields that disappeared"""
+        return {
+            "stale_errors": self.stale_errors,
+            "handle_refreshes": self.refreshes,
+            "handles_re_resolved": self.re_resolved,
+            "handles_missing": self.missing,
+        }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Event-driven page readiness waits used instead of fixed sleeps
+"""
+
+import time
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+# ARIA comboboxes cover custom dropdowns (Ashby, React-Select) built from divs
+FORM_FIELD_SELECTOR = "input, textarea, select, [role='combobox']"
+
+# Counts form fields that are rendered and interactable (file inputs may be hidden)
+COUNT_READY_FIELDS_JS = """
+var fields = document.querySelectorAll(arguments[0]);
+var ready = 0;
+for (var i = 0; i < fields.length; i++) {
+    var el = fields[i];
+    if (el.disabled) continue;
+    if (el.type === 'file' || el.getClientRects().length > 0) ready++;
+}
+return ready;
+"""
+
+# True once the upload widget around the file input mentions the filename
+UPLOAD_SHOWS_FILENAME_JS = """
+var el = arguments[0], filename = arguments[1], fallbackSelector = arguments[2];
+if (!el || !el.isConnected) {
+    el = fallbackSelector ? document.querySelector(fallbackSelector) : null;
+}
+if (!el) return false;
+var node = el.parentElement;
+for (var depth = 0; node && depth < 6; depth++, node = node.parentElement) {
+    if ((node.textContent || '').indexOf(filename) !== -1) return true;
+}
+return false;
+"""
+
+# True once the element reports the expected value back from the DOM
+VALUE_COMMITTED_JS = """
+var el = arguments[0], expected = arguments[1].replace(/\\r\\n/g, '\\n');
+if (el.type === 'radio' || el.type === 'checkbox') return el.checked;
+if (el.tagName === 'SELECT') {
+    var opt = el.options[el.selectedIndex];
+    return !!opt && (opt.text.trim() === expected || opt.value === expected);
+}
+return (el.value || '').replace(/\\r\\n/g, '\\n') === expected;
+"""
+
+
+class PageWaiter:
+    """Waits on explicit page conditions and records how long each wait took"""
+
+    def __init__(self, driver, timeout=20, poll_frequency=0.1):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.timings = []
+
+    def _wait(self, name, condition, timeout=None):
+        """Poll condition until truthy, logging elapsed time whether or not it was met"""
+        # Imported here: selenium.webdriver loads every browser binding (~150 ms)
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        wait = WebDriverWait(
+            self.driver,
+            timeout or self.timeout,
+            poll_frequency=self.poll_frequency,
+            ignored_exceptions=(StaleElementReferenceException,),
+        )
+        start = time.perf_counter()
+        try:
+            result = wait.until(condition)
+            satisfied = True
+        except TimeoutException:
+            result = None
+            satisfied = False
+        self.timings.append({
+            "wait": name,
+            "seconds": round(time.perf_counter() - start, 3),
+            "satisfied": satisfied,
+        })
+        return result
+
+    def dom_ready(self, timeout=None):
+        """Wait until document.readyState is 'complete'"""
+        return bool(self._wait(
+            "dom_ready",
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout,
+        ))
+
+    def form_fields_present(self, selector=FORM_FIELD_SELECTOR, minimum=1, timeout=None):
+        """Wait until at least `minimum` interactable form fields are rendered"""
+        def condition(driver):
+            count = driver.execute_script(COUNT_READY_FIELDS_JS, selector)
+            return count if count >= minimum else False
+
+        return self._wait("form_fields_present", condition, timeout) or 0
+
+    def upload_shows_filename(self, file_input, filename, fallback_selector=None, timeout=None):
+        """Wait until the upload widget around a file input displays the filename"""
+        return bool(self._wait(
+            "upload_shows_filename",
+            lambda d: d.execute_script(UPLOAD_SHOWS_FILENAME_JS, file_input, filename, fallback_selector),
+            timeout,
+        ))
+
+    def value_committed(self, element, value, timeout=None):
+        """Wait until the field's DOM value matches what was entered"""
+        return bool(self._wait(
+            "value_committed",
+            lambda d: d.execute_script(VALUE_COMMITTED_JS, element, value),
+            timeout,
+        ))
+
+    def script_result(self, name, script, *args, timeout=None):
+        """Wait until a script returns something truthy and return it (None on timeout)"""
+        return self._wait(name, lambda d: d.execute_script(script, *args), timeout)
+
+    def total_seconds(self):
+        """Total time spent waiting across all recorded waits"""
+        return round(sum(t["seconds"] for t in self.timings), 3)
+
+    def summary(self):
+        """Aggregate timings per wait type: count, total, max and unmet count"""
+        summary = {}
+        for timing in self.timings:
+            entry = summary.setdefault(timing["wait"], {"count": 0, "total": 0.0, "max": 0.0, "unmet": 0})
+            entry["count"] += 1
+            entry["total"] = round(entry["total"] + timing["seconds"], 3)
+            entry["max"] = max(entry["max"], timing["seconds"])
+            if not timing["satisfied"]:
+                entry["unmet"] += 1
+        return summary
+
+    def print_report(self, emit=print):
+        """Print (or pass to emit, e.g. a logger method) how long each kind of wait actually took"""
+        lines = [f"\n⏱️  Wait time: {self.total_seconds():.2f}s across {len(self.timings)} waits"]
+        for name, entry in self.summary().items():
+            unmet = f", {entry['unmet']} timed out" if entry["unmet"] else ""
+            lines.append(f"   • {name}: {entry['count']}x, total {entry['total']:.2f}s, max {entry['max']:.2f}s{unmet}")
+        emit("\n".join(lines))
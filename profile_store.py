@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Candidate profile stores: many profiles, response sets and resumes loaded lazily from disk
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Record layout shared by every backend:
+#   {"id": "...", "profile": {...}, "responses": {...}, "resume_path": "..."}
+# A record is used as-is: the filler's demo profile and answers are never merged in, so
+# it needs full_name, email and phone (REQUIRED_PROFILE_KEYS) and a resume, and every
+# answer it leaves out stays blank. A relative resume_path is resolved against the store.
+RECORD_KEYS = ("profile", "responses", "resume_path")
+
+# Identity every stored candidate must have; the demo profile is never merged under a store record
+REQUIRED_PROFILE_KEYS = ("full_name", "email", "phone")
+
+
+class ProfileNotFound(KeyError):
+    """No candidate with this id in the store"""
+
+
+class IncompleteProfile(ValueError):
+    """A stored candidate lacks identity keys or a resume, so it can't apply"""
+
+
+class ProfileStore(ABC):
+    """Base store: memoizes up to cache_size parsed records, least recently used evicted first"""
+
+    def __init__(self, cache_size=256):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _read(self, candidate_id):
+        """Raw record for one candidate, or None"""
+
+    @abstractmethod
+    def _write(self, candidate_id, record):
+        """Store a record, replacing any previous one"""
+
+    @abstractmethod
+    def ids(self):
+        """Candidate ids, without parsing any record"""
+
+    @abstractmethod
+    def _base_dir(self):
+        """Directory relative resume paths are resolved against"""
+
+    def get(self, candidate_id):
+        """Parsed record for a candidate, read from disk on first use"""
+        with self._lock:
+            if candidate_id in self._cache:
+                self._cache.move_to_end(candidate_id)
+                self.hits += 1
+                return self._cache[candidate_id]
+        record = self._read(candidate_id)
+        if record is None:
+            raise ProfileNotFound(candidate_id)
+        record = self._normalize(candidate_id, record)
+        with self._lock:
+            self.misses += 1
+            self._cache[candidate_id] = record
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def put(self, candidate_id, profile=None, responses=None, resume_path=None):
+        """Add or replace a candidate record"""
+        record = {"id": candidate_id, "profile": profile or {}, "responses": responses or {}}
+        if resume_path:
+            record["resume_path"] = resume_path
+        self._write(candidate_id, record)
+        with self._lock:
+            self._cache.pop(candidate_id, None)
+
+    def _normalize(self, candidate_id, record):
+        record = {"id": candidate_id, **{k: record.get(k) for k in RECORD_KEYS}}
+        if record["resume_path"] and not os.path.isabs(record["resume_path"]):
+            record["resume_path"] = os.path.join(self._base_dir(), record["resume_path"])
+        return record
+
+    def missing_keys(self, candidate_id, require_resume=True):
+        """Identity keys (and "resume_path") a candidate's record lacks; empty when it can apply"""
+        record = self.get(candidate_id)
+        profile = record["profile"] or {}
+        missing = [key for key in REQUIRED_PROFILE_KEYS if not profile.get(key)]
+        if require_resume and not (record["resume_path"] and os.path.isfile(record["resume_path"])):
+            missing.append("resume_path")
+        return missing
+
+    def filler_options(self, candidate_id, require_resume=True):
+        """Keyword arguments for EnhancedFormFiller for one candidate
+
+        Raises IncompleteProfile when the record lacks name, email or phone, or (unless
+        require_resume is False, e.g. when a ResumeCache generates one) an existing resume.
+        """
+        missing = self.missing_keys(candidate_id, require_resume)
+        if missing:
+            raise IncompleteProfile(f"candidate '{candidate_id}' is missing {', '.join(missing)}")
+        record = self.get(candidate_id)
+        return dict({k: record[k] for k in RECORD_KEYS}, demo_defaults=False)
+
+    def stats(self):
+        """Memoization counters"""
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def __contains__(self, candidate_id):
+        try:
+            self.get(candidate_id)
+            return True
+        except ProfileNotFound:
+            return False
+
+
+class DirectoryProfileStore(ProfileStore):
+    """One <candidate_id>.json file per candidate in a directory"""
+
+    def __init__(self, path, cache_size=256):
+        super().__init__(cache_size)
+        self.path = os.path.abspath(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, candidate_id):
+        if os.sep in candidate_id or candidate_id.startswith("."):
+            raise ProfileNotFound(candidate_id)
+        return os.path.join(self.path, f"{candidate_id}.json")
+
+    def _read(self, candidate_id):
+        try:
+            with open(self._file(candidate_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, candidate_id, record):
+        path = self._file(candidate_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _base_dir(self):
+        return self.path
+
+    def ids(self):
+        with os.scandir(self.path) as entries:
+            return sorted(e.name[:-5] for e in entries if e.name.endswith(".json"))
+
+
+class SQLiteProfileStore(ProfileStore):
+    """All candidates in one SQLite file, looked up by primary key"""
+
+    def __init__(self, path, cache_size=256):
+        super().__init__(cache_size)
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS candidates (id TEXT PRIMARY KEY, record TEXT NOT NULL)")
+
+    def _connection(self):
+        # sqlite3 connections can't be shared across threads; batch workers each get their own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+        return conn
+
+    def _read(self, candidate_id):
+        row = self._connection().execute("SELECT record FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, candidate_id, record):
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO candidates (id, record) VALUES (?, ?)",
+                         (candidate_id, json.dumps(record)))
+
+    def _base_dir(self):
+        return os.path.dirname(self.path)
+
+    def ids(self):
+        return [row[0] for row in self._connection().execute("SELECT id FROM candidates ORDER BY id")]
+
+
+def open_profile_store(path, cache_size=256):
+    """SQLite store for .db/.sqlite files, directory store otherwise"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteProfileStore(path, cache_size)
+    return DirectoryProfileStore(path, cache_size)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Append-only progress journal so interrupted fills and batches resume where they stopped
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# When buffered records are forced to disk:
+#   always  - flush and fsync after every record
+#   posting - flush and fsync when a posting completes (and every flush_every records)
+#   never   - leave it to the OS; survives a crash of this process but not of the machine
+FSYNC_POLICIES = ("always", "posting", "never")
+
+
+def value_hash(value):
+    """Short hash of a committed value; the journal never stores the value itself"""
+    # Normalized like bulk_fill.value_matches(), so a value read back from the page hashes the same
+    text = str(value).replace("\r\n", "\n").strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def field_key(field):
+    """Stable journal key for a field descriptor"""
+    return field.get("selector") or f"#{field['index']}"
+
+
+class ProgressJournal:
+    """JSON-lines journal of committed fields and completed postings, replayed on open"""
+
+    def __init__(self, path=".progress/journal.jsonl", fsync="posting", flush_every=64,
+                 compact_ratio=4, compact_min_records=10000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}' (choose from {', '.join(FSYNC_POLICIES)})")
+        self.path = os.path.abspath(path)
+        self.fsync = fsync
+        self.flush_every = flush_every
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self._lock = threading.Lock()
+        self._buffer = []
+        # posting -> {"filled": n} once complete
+        self.completed = {}
+        # posting -> {field key: value hash} for postings still in progress
+        self.fields = {}
+        self.records_on_disk = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Next file size (in records) at which compaction is considered; checked on open and after writes
+        self._compact_at = compact_min_records
+        self._file = None
+        self._replay()
+        self._maybe_compact_locked()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _replay(self):
+        """Rebuild state from the journal; a torn last line from a crash is ignored"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.records_on_disk += 1
+                self._apply(record)
+
+    def _apply(self, record):
+        posting = record["posting"]
+        if record["type"] == "field":
+            if posting not in self.completed:
+                self.fields.setdefault(posting, {})[record["field"]] = record["hash"]
+        elif record["type"] == "posting":
+            self.completed[posting] = {"filled": record.get("filled", 0)}
+            self.fields.pop(posting, None)
+
+    def _live_records(self):
+        return len(self.completed) + sum(len(fields) for fields in self.fields.values())
+
+    def _append(self, record, sync_now=False):
+        with self._lock:
+            self._apply(record)
+            self._buffer.append(json.dumps(record, separators=(",", ":")))
+            if self.fsync == "always" or sync_now or len(self._buffer) >= self.flush_every:
+                self._flush_locked(sync=self.fsync == "always" or (sync_now and self.fsync == "posting"))
+
+    def _write_buffer_locked(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self.records_on_disk += len(self._buffer)
+            self._buffer = []
+
+    def _flush_locked(self, sync=False):
+        self._write_buffer_locked()
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self._maybe_compact_locked()
+
+    def _maybe_compact_locked(self):
+        """Compact once the file holds compact_ratio times more records than the live state"""
+        if self.records_on_disk < self._compact_at:
+            return
+        live = max(1, self._live_records())
+        if self.records_on_disk > self.compact_ratio * live:
+            self._compact_locked()
+        # Counting live records walks every posting, so the next check waits until the file has grown again
+        self._compact_at = max(self.compact_min_records, self.compact_ratio * live, self.records_on_disk + 1)
+
+    def record_field(self, posting, key, value):
+        """Note that a field of a posting was committed with this value"""
+        self._append({"type": "field", "posting": posting, "field": key, "hash": value_hash(value)})
+
+    def complete_posting(self, posting, filled=0):
+        """Note that a posting is done; it is skipped on later runs"""
+        self._append({"type": "posting", "posting": posting, "filled": filled, "at": round(time.time(), 3)},
+                     sync_now=True)
+
+    def is_complete(self, posting):
+        return posting in self.completed
+
+    def field_committed(self, posting, key, value):
+        """Whether this exact value was already committed to this field"""
+        return self.fields.get(posting, {}).get(key) == value_hash(value)
+
+    def committed_fields(self, posting):
+        """Number of fields journaled for a posting still in progress"""
+        return len(self.fields.get(posting, {}))
+
+    def flush(self):
+        """Write buffered records (fsync unless the policy is 'never')"""
+        with self._lock:
+            self._flush_locked(sync=self.fsync != "never")
+
+    def compact(self):
+        """Rewrite the journal with only the live state: completed postings and in-progress fields"""
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._write_buffer_locked()
+            return self._compact_locked()
+
+    def _compact_locked(self):
+        reopen = self._file is not None and not self._file.closed
+        if reopen:
+            self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for posting, info in self.completed.items():
+                f.write(json.dumps({"type": "posting", "posting": posting, **info}, separators=(",", ":")) + "\n")
+                count += 1
+            for posting, fields in self.fields.items():
+                for key, digest in fields.items():
+                    f.write(json.dumps({"type": "field", "posting": posting, "field": key, "hash": digest},
+                                       separators=(",", ":")) + "\n")
+                    count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.records_on_disk = count
+        if reopen:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return count
+
+    def stats(self):
+        """Completed postings, in-progress postings and records on disk"""
+        return {
+            "completed": len(self.completed),
+            "in_progress": len(self.fields),
+            "records_on_disk": self.records_on_disk,
+        }
+
+    def close(self):
+        """Flush, fsync and close the journal"""
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked(sync=self.fsync != "never")
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Resume artifacts: content-hashed generation cache and pre-upload validation
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from create_resume import REPORTLAB_AVAILABLE, resume_filename, resume_template
+from fill_log import get_fill_logger
+
+log = get_fill_logger()
+
+# Profile keys that appear on the generated resume; other profile changes don't rebuild it
+RESUME_PROFILE_KEYS = ["full_name", "email", "phone", "linkedin", "github", "portfolio", "experience"]
+
+# Bump when create_resume.py's layout or wording changes so cached PDFs are rebuilt
+RESUME_TEMPLATE_VERSION = 1
+
+# Most application forms reject uploads above this size
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+
+# Leading bytes of each accepted document type
+FILE_SIGNATURES = {
+    ".pdf": b"%PDF-",
+    ".docx": b"PK\x03\x04",
+    ".doc": b"\xd0\xcf\x11\xe0",
+}
+
+
+def resume_content_hash(profile):
+    """Hash of everything that ends up on a generated resume"""
+    data = {"template": RESUME_TEMPLATE_VERSION, "profile": {k: profile.get(k) for k in RESUME_PROFILE_KEYS}}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _accepted(extension, accept):
+    """Whether a file extension satisfies a file input's accept attribute"""
+    if not accept:
+        return True
+    mime_types = {".pdf": "application/pdf", ".doc": "application/msword",
+                  ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+    for item in (a.strip().lower() for a in accept.split(",")):
+        if item == extension or item == mime_types.get(extension) or item in ("*", "*/*"):
+            return True
+        if item == "application/*" and extension in mime_types:
+            return True
+    return False
+
+
+def validate_resume(path, accept="", max_bytes=MAX_RESUME_BYTES):
+    """Check a resume before uploading it; returns None when valid, else the reason it isn't"""
+    if not path or not os.path.isfile(path):
+        return "file not found"
+    size = os.path.getsize(path)
+    if size == 0:
+        return "file is empty"
+    if size > max_bytes:
+        return f"file is {size / 1024 / 1024:.1f} MB (limit {max_bytes / 1024 / 1024:.0f} MB)"
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_SIGNATURES:
+        return f"unsupported file type '{extension or 'none'}'"
+    if not _accepted(extension, accept):
+        return f"'{extension}' not accepted by the form ({accept})"
+    with open(path, "rb") as f:
+        header = f.read(len(FILE_SIGNATURES[extension]))
+    if header != FILE_SIGNATURES[extension]:
+        return f"file content is not a valid {extension} document"
+    return None
+
+
+def _render_atomic(profile, path):
+    """Render a profile's resume under a temporary name, then move it into place; returns its size"""
+    # Concurrent workers never upload (or skip on) a half-written PDF; the temporary name is
+    # unique per call, so threads of one process rendering the same resume don't share it
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        resume_template().render(profile, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return os.path.getsize(path)
+
+
+def _render_job(job):
+    """Process-pool task: (key, path, size or None, error or None)"""
+    key, profile, path = job
+    try:
+        return key, path, _render_atomic(profile, path), None
+    except Exception as e:
+        return key, path, None, str(e)
+
+
+def _start_context():
+    # fork shares the parent's imported reportlab; spawn-only platforms import it per worker
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+class ResumeCache:
+    """Generated resumes stored by content hash; a resume is rebuilt only when its profile data changes"""
+
+    def __init__(self, cache_dir=".resume_cache"):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.hits = 0
+        self.builds = 0
+
+    def path_for(self, profile):
+        """Cache path of the resume for a profile (it may not exist yet)"""
+        name, extension = os.path.splitext(resume_filename(profile))
+        return os.path.join(self.cache_dir, f"{name}-{resume_content_hash(profile)}{extension}")
+
+    def get_or_build(self, profile):
+        """Path of the profile's resume, generating it on a cache miss; None if it can't be generated"""
+        path = self.path_for(profile)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        if not REPORTLAB_AVAILABLE:
+            log.warning("⚠️  reportlab is not installed - cannot generate a resume PDF")
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _render_atomic(profile, path)
+        self.builds += 1
+        return path
+
+    def build_all(self, profiles, workers=None):
+        """Generate the resumes of many profiles ({key: profile}) across processes; returns a summary
+
+        Profiles whose content hash already has a PDF are skipped without rendering.
+        The template's styles are built once per worker process, not once per resume.
+        """
+        start = time.perf_counter()
+        paths = {key: self.path_for(profile) for key, profile in profiles.items()}
+        # Candidates with identical resume content share one PDF
+        pending = {}
+        for key, profile in profiles.items():
+            if not os.path.exists(paths[key]):
+                pending.setdefault(paths[key], (key, profile, paths[key]))
+        jobs = list(pending.values())
+        skipped = len(profiles) - len(jobs)
+        self.hits += skipped
+        results = []
+        if jobs and not REPORTLAB_AVAILABLE:
+            log.warning("⚠️  reportlab is not installed - cannot generate resume PDFs")
+            results = [(key, path, None, "reportlab is not installed") for key, _, path in jobs]
+        elif jobs:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            workers = min(workers or os.cpu_count() or 1, len(jobs))
+            if workers == 1:
+                # Starting a pool costs more than a few ~10 ms renders
+                results = [_render_job(job) for job in jobs]
+            else:
+                resume_template()
+                with ProcessPoolExecutor(max_workers=workers, mp_context=_start_context()) as executor:
+                    chunksize = max(1, math.ceil(len(jobs) / (workers * 4)))
+                    results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+        elapsed = time.perf_counter() - start
+
+        built = [size for _, _, size, error in results if error is None]
+        self.builds += len(built)
+        failed = {key: error for key, _, _, error in results if error is not None}
+        return {
+            "profiles": len(profiles),
+            "built": len(built),
+            "skipped": skipped,
+            "failed": len(failed),
+            "workers": workers if jobs else 0,
+            "elapsed_seconds": round(elapsed, 3),
+            "pdfs_per_second": round(len(built) / elapsed, 1) if built and elapsed else 0.0,
+            "bytes_written": sum(built),
+            "avg_pdf_kb": round(sum(built) / len(built) / 1024, 1) if built else None,
+            "errors": failed,
+            "paths": {key: path for key, path in paths.items() if key not in failed},
+        }
+
+    def stats(self):
+        """Hit and build counters"""
+        return {"hits": self.hits, "builds": self.builds}
+
+
+def print_build_summary(summary):
+    """Print a build_all() summary"""
+    print(f"📄 Resumes: {summary['built']} built, {summary['skipped']} unchanged, {summary['failed']} failed "
+          f"({summary['profiles']} profiles)")
+    if summary["built"]:
+        print(f"   ⚡ {summary['pdfs_per_second']} PDFs/s on {summary['workers']} workers "
+              f"({summary['elapsed_seconds']:.2f}s), {summary['bytes_written'] / 1024:.1f} KB written, "
+              f"{summary['avg_pdf_kb']} KB per PDF")
+    for key, error in summary["errors"].items():
+        print(f"   ❌ {key}: {error}")
+
+
+def candidate_profiles(store, candidate_ids=None):
+    """Resume profiles ({candidate id: profile}) of a profile store's candidates without their own resume
+
+    Candidates lacking name, email or phone are skipped with a warning rather than
+    rendered with the demo profile's details.
+    """
+    profiles = {}
+    for candidate_id in candidate_ids or store.ids():
+        record = store.get(candidate_id)
+        if record["resume_path"]:
+            continue
+        missing = store.missing_keys(candidate_id, require_resume=False)
+        if missing:
+            log.warning("⚠️  %s: no resume generated, profile is missing %s", candidate_id, ", ".join(missing))
+            continue
+        profiles[candidate_id] = dict(record["profile"])
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the resume PDF of every candidate in a profile store")
+    parser.add_argument("profile_store", help="candidate directory or SQLite file")
+    parser.add_argument("--cache-dir", default=".resume_cache")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU core)")
+    args = parser.parse_args()
+
+    from profile_store import open_profile_store
+    summary = ResumeCache(args.cache_dir).build_all(candidate_profiles(open_profile_store(args.profile_store)),
+                                                    workers=args.workers)
+    print_build_summary(summary)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Persistent form-schema cache keyed by posting URL and DOM fingerprint
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from page_waits import FORM_FIELD_SELECTOR
+
+# Cheap structural signature of the form: tag, type, name and id of every field
+FINGERPRINT_JS = """
+var fields = document.querySelectorAll(arguments[0]);
+var signature = [];
+for (var i = 0; i < fields.length; i++) {
+    var el = fields[i];
+    signature.push([el.tagName.toLowerCase(), el.tagName === 'INPUT' ? (el.getAttribute('type') || '').toLowerCase() : '',
+                    el.getAttribute('name') || '', el.id || '']);
+}
+return signature;
+"""
+
+# Field descriptor keys worth persisting (everything except the live element handle)
+SCHEMA_KEYS = ["index", "tag", "input_type", "id", "name", "placeholder", "label", "context",
+               "required", "visible", "enabled", "selector", "options", "accept", "combobox",
+               "automation_id", "position"]
+
+
+def _digest(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_signature(signature):
+    """Fingerprint from a list of [tag, input_type, name, id] entries"""
+    return _digest([list(entry) for entry in signature])
+
+
+def fingerprint_fields(fields):
+    """Fingerprint of discovered field descriptors, comparable with form_fingerprint()"""
+    return fingerprint_signature([[f["tag"], f["input_type"], f["name"], f["id"]] for f in fields])
+
+
+def form_fingerprint(driver, selector=FORM_FIELD_SELECTOR):
+    """Fingerprint of the live form in one round trip"""
+    return fingerprint_signature(driver.execute_script(FINGERPRINT_JS, selector) or [])
+
+
+def values_key(profile, responses, matcher=None):
+    """Identifies the profile data (and matching mode, if not the default) that cached values were chosen from"""
+    data = {"profile": profile, "responses": responses}
+    if matcher:
+        data["matcher"] = matcher
+    return _digest(data)
+
+
+def schema_from_fields(fields):
+    """Strip live element handles so descriptors can be stored as JSON"""
+    return [{key: field[key] for key in SCHEMA_KEYS if key in field} for field in fields]
+
+
+class FormSchemaCache:
+    """Size-bounded LRU cache of form schemas and chosen values, one JSON file per posting
+
+    Safe to share between the filling threads of a batch run: reads and updates of the
+    index, and the files written with it, happen under one lock.
+    """
+
+    def __init__(self, cache_dir=".form_cache", max_entries=5000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+        # Stored oldest-first, so the OrderedDict's front is the LRU end
+        return OrderedDict(sorted(entries.items(), key=lambda item: item[1]["last_used"]))
+
+    def _write_json(self, path, data):
+        # Unique temporary name: other processes may be writing the same cache directory
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _url_key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+
+    def get(self, url, fingerprint):
+        """Cached entry for url if its fingerprint still matches, else None"""
+        key = self._url_key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if not meta or meta["fingerprint"] != fingerprint:
+                self.misses += 1
+                return None
+            try:
+                with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            meta["last_used"] = time.time()
+            self._index.move_to_end(key)
+            self._dirty = True
+            self.hits += 1
+            return entry
+
+    def put(self, url, fingerprint, fields, values=None, values_key=None):
+        """Store the schema (and optionally chosen values) for url, evicting least recently used entries"""
+        key = self._url_key(url)
+        entry = {
+            "url": url,
+            "fingerprint": fingerprint,
+            "fields": schema_from_fields(fields),
+            "values": values or {},
+            "values_key": values_key,
+            "cached_at": time.time(),
+        }
+        with self._lock:
+            self._write_json(self._entry_path(key), entry)
+            self._index[key] = {"url": url, "fingerprint": fingerprint, "last_used": time.time()}
+            self._index.move_to_end(key)
+            while len(self._index) > self.max_entries:
+                old_key, _ = self._index.popitem(last=False)
+                try:
+                    os.remove(self._entry_path(old_key))
+                except OSError:
+                    pass
+                self.evictions += 1
+            self._write_json(self.index_path, self._index)
+            self._dirty = False
+
+    def invalidate(self, url):
+        """Drop the cached entry for url"""
+        key = self._url_key(url)
+        with self._lock:
+            if self._index.pop(key, None) is not None:
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+                self._write_json(self.index_path, self._index)
+
+    def flush(self):
+        """Persist recency updates from cache hits"""
+        with self._lock:
+            if self._dirty:
+                self._write_json(self.index_path, self._index)
+                self._dirty = False
+
+    def __len__(self):
+        return len(self._index)
+
+    def stats(self):
+        """Hit/miss/eviction counters and current size"""
+        return {"entries": len(self._index), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
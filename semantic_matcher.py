@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Offline TF-IDF matching of question text to response keys, scored as one matrix product
+"""
+
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import re
+from collections import Counter
+
+# numpy is only imported when an index is built or loaded; it costs ~100 ms at startup
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+DEFAULT_INDEX_DIR = ".form_cache"
+
+# Rule ids reported for semantically matched fields are "semantic:<response key>"
+SEMANTIC_RULE_PREFIX = "semantic:"
+
+# Generic intent phrasings per response key (how postings tend to ask, not any one form's
+# labels). A key's document is its name, these phrasings and its answer text, so keys a
+# candidate record adds (e.g. "typing_speed") are indexed by their name and answer alone.
+# The optional keys below are only indexed when a candidate's record provides an answer.
+RESPONSE_QUERIES = {
+    "cover_letter": ["cover letter", "tell us about yourself", "introduce yourself"],
+    "why_interested": ["why are you interested in this role", "why do you want to join us", "what attracted you to the company"],
+    "experience": ["describe your relevant experience", "professional background", "qualifications for this role"],
+    "strengths": ["what are your greatest strengths", "what are you good at", "what makes you great at your job",
+                  "what does excellence mean to you"],
+    "challenge": ["describe a difficult problem you solved", "how do you approach hard problems", "overcoming obstacles"],
+    "teamwork": ["how do you work with a team", "collaboration with colleagues", "cross functional work"],
+    "work_style": ["describe your work style", "approach to your work", "work ethic", "how do you organize your work"],
+    "remote_experience": ["experience working remotely", "working from home", "distributed teams"],
+    "availability": ["when can you start", "notice period", "start date"],
+    "questions": ["questions for us", "anything you would like to ask"],
+    "travel": ["experience with travel", "places you have traveled", "willingness to travel"],
+    "technology": ["comfort with technology", "software tools you use", "technical skills"],
+    "career_goals": ["career plans", "where do you see yourself in five years", "long term goals",
+                     "how long do you plan to stay", "your ideal or perfect job",
+                     "what you want from work"],
+    "motivation": ["what motivates you", "what drives you", "what inspires you"],
+    # Optional keys for candidate records
+    "employment_type": ["full time or part time", "type of employment you are seeking", "contract or permanent"],
+    "work_environment": ["fast paced environment", "startup culture", "company culture", "async work",
+                         "asynchronous communication", "working independently", "autonomy"],
+    "workspace": ["home office setup", "desk setup", "workstation and equipment", "internet connection"],
+    "hobbies": ["what do you do outside of work", "hobbies and interests", "free time", "a normal weekend"],
+    "languages": ["languages you speak", "native language", "second language"],
+}
+
+_STOPWORDS = frozenset("""
+a about an and are as at be being by can could do does for from have how i if in is it its like
+look looks me my of on or our so that the their there this to us want we what when where which who
+would you your yours some any
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercased word tokens without stopwords, with plural/verb suffixes stripped"""
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+
+def response_documents(responses):
+    """Text indexed for each response key"""
+    return {
+        key: " ".join([key.replace("_", " ")] + RESPONSE_QUERIES.get(key, []) + [str(text)])
+        for key, text in responses.items()
+    }
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+def _digest(documents):
+    return hashlib.sha256(json.dumps(documents, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class SemanticMatcher:
+    """TF-IDF index over response keys; fields are scored against every key at once"""
+
+    def __init__(self, keys, vocabulary, idf, matrix, threshold=0.2):
+        self.keys = list(keys)
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.matrix = matrix
+        self.threshold = threshold
+        # Weight given to query words the index has never seen, so they lower the score
+        self._unknown_weight = float(idf.max()) if len(idf) else 1.0
+
+    @classmethod
+    def build(cls, responses, threshold=0.2):
+        """Index responses from scratch"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("semantic matching needs numpy (pip install numpy)")
+        np = _numpy()
+        documents = response_documents(responses)
+        keys = list(documents)
+        counts = [Counter(tokenize(documents[key])) for key in keys]
+        vocabulary = sorted(set().union(*counts)) if counts else []
+        index = {term: i for i, term in enumerate(vocabulary)}
+
+        df = np.zeros(len(vocabulary))
+        for count in counts:
+            for term in count:
+                df[index[term]] += 1
+        idf = np.log((1 + len(keys)) / (1 + df)) + 1
+
+        matrix = np.zeros((len(keys), len(vocabulary)), dtype=np.float32)
+        for row, count in enumerate(counts):
+            for term, n in count.items():
+                matrix[row, index[term]] = 1 + math.log(n)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        return cls(keys, vocabulary, idf.astype(np.float32), matrix, threshold)
+
+    @classmethod
+    def load_or_build(cls, responses, cache_dir=DEFAULT_INDEX_DIR, threshold=0.2):
+        """Index from the .npz cache for these response documents, else build and save it"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("semantic matching needs numpy (pip install numpy)")
+        digest = _digest(response_documents(responses))
+        # One file per response set, so candidates with different answers don't evict each other
+        path = os.path.join(cache_dir, f"semantic_index_{digest}.npz") if cache_dir else None
+        if path and os.path.exists(path):
+            try:
+                with _numpy().load(path, allow_pickle=False) as data:
+                    if str(data["digest"]) == digest:
+                        return cls(data["keys"].tolist(), data["vocabulary"].tolist(), data["idf"],
+                                   data["matrix"], threshold)
+            except (OSError, KeyError, ValueError):
+                pass
+        matcher = cls.build(responses, threshold)
+        if path:
+            matcher.save(path, digest)
+        return matcher
+
+    def save(self, path, digest):
+        """Write the index to an .npz file"""
+        np = _numpy()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, keys=np.array(self.keys), vocabulary=np.array(vocabulary),
+                            idf=self.idf, matrix=self.matrix, digest=np.array(digest))
+        os.replace(tmp_path, path)
+
+    def _vectors(self, texts):
+        np = _numpy()
+        vectors = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        unknown = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term, n in Counter(tokenize(text)).items():
+                weight = 1 + math.log(n)
+                column = self.vocabulary.get(term)
+                if column is None:
+                    unknown[row] += (weight * self._unknown_weight) ** 2
+                else:
+                    vectors[row, column] = weight * self.idf[column]
+        norms = np.sqrt((vectors ** 2).sum(axis=1) + unknown)
+        return vectors / np.where(norms == 0, 1, norms)[:, None]
+
+    def scores(self, texts):
+        """Cosine similarity of every text against every response key (texts x keys)"""
+        return self._vectors(texts) @ self.matrix.T
+
+    def match_many(self, texts):
+        """(key, score) per text, key None when below the confidence threshold"""
+        if not self.keys:
+            return [(None, 0.0)] * len(texts)
+        scores = self.scores(texts)
+        best = scores.argmax(axis=1)
+        results = []
+        for row, column in enumerate(best):
+            score = float(scores[row, column])
+            results.append((self.keys[column] if score >= self.threshold else None, round(score, 3)))
+        return results
+
+    def match(self, text):
+        """Best response key for one question text and its score"""
+        return self.match_many([text])[0]
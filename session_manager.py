@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Warm browser session reuse across multiple form fills
+"""
+
+import os
+import time
+from urllib.parse import urlparse
+
+from enhanced_form_filler import create_chrome_driver
+from fill_log import get_fill_logger
+
+# Clears per-page storage without touching cookies or the HTTP cache
+_RESET_PAGE_STATE_JS = """
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def origin_of(url):
+    """scheme://host of a URL"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class SessionManager:
+    """Keeps one Chrome session warm (persistent profile, cookies, cache) across fill_* calls"""
+
+    def __init__(self, profile_dir=".chrome_profile", preload_origin=None, headless=False, launch_profile="default"):
+        self.profile_dir = os.path.abspath(profile_dir)
+        self.preload_origin = preload_origin
+        self.headless = headless
+        self.launch_profile = launch_profile
+        self.driver = None
+        # Launch + preload time waiting to be charged to the first page load after a launch
+        self._pending_launch_cost = None
+        self._last_reset = 0.0
+        self.timings = {"launch": [], "preload": [], "reset": [], "cold_start": [], "warm_start": []}
+
+    def acquire(self):
+        """The warm session, launching (and preloading) it on first use"""
+        if self.driver is not None:
+            try:
+                # Cheap liveness probe; a crashed browser is relaunched
+                self.driver.current_url
+                return self.driver
+            except Exception:
+                self.driver = None
+
+        start = time.perf_counter()
+        self.driver = create_chrome_driver(headless=self.headless, user_data_dir=self.profile_dir,
+                                           launch_profile=self.launch_profile)
+        launch = time.perf_counter() - start
+        self.timings["launch"].append(round(launch, 3))
+
+        preload = 0.0
+        if self.preload_origin:
+            start = time.perf_counter()
+            try:
+                self.driver.get(self.preload_origin)
+            except Exception as e:
+                get_fill_logger(self.preload_origin).warning("⚠️  Could not preload %s: %s", self.preload_origin, e,
+                                                             action="preload", outcome="error")
+            preload = time.perf_counter() - start
+            self.timings["preload"].append(round(preload, 3))
+        self._pending_launch_cost = launch + preload
+        return self.driver
+
+    def record_page_load(self, seconds):
+        """Record a job's page load: cold right after a launch, warm on a reused session"""
+        if self._pending_launch_cost is not None:
+            self.timings["cold_start"].append(round(self._pending_launch_cost + seconds, 3))
+            self._pending_launch_cost = None
+        else:
+            self.timings["warm_start"].append(round(self._last_reset + seconds, 3))
+
+    def release(self):
+        """Reset page state between jobs, keeping the browser, cookies and cache"""
+        if self.driver is None:
+            return
+        start = time.perf_counter()
+        try:
+            self.driver.execute_script(_RESET_PAGE_STATE_JS)
+            self.driver.get("about:blank")
+        except Exception:
+            self.close()
+            return
+        self._last_reset = time.perf_counter() - start
+        self.timings["reset"].append(round(self._last_reset, 3))
+
+    def close(self):
+        """Quit the browser; the profile directory is kept for the next warm start"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def report(self):
+        """Cold-start vs warm-start timings and the estimated savings per job"""
+        def avg(values):
+            return round(sum(values) / len(values), 3) if values else None
+
+        report = {
+            "launches": len(self.timings["launch"]),
+            "avg_launch": avg(self.timings["launch"]),
+            "avg_preload": avg(self.timings["preload"]),
+            "avg_reset": avg(self.timings["reset"]),
+            "cold_starts": len(self.timings["cold_start"]),
+            "warm_starts": len(self.timings["warm_start"]),
+            "avg_cold_start": avg(self.timings["cold_start"]),
+            "avg_warm_start": avg(self.timings["warm_start"]),
+        }
+        if report["avg_cold_start"] is not None and report["avg_warm_start"] is not None:
+            report["saved_per_job"] = round(report["avg_cold_start"] - report["avg_warm_start"], 3)
+        return report
+
+    def print_report(self, emit=print):
+        """Print (or pass to emit, e.g. a logger method) cold vs warm start timings"""
+        report = self.report()
+        lines = [
+            "\n🔥 Session timings",
+            f"   • Launches: {report['launches']} (avg {report['avg_launch']}s, preload {report['avg_preload']}s)",
+            f"   • Cold start: {report['cold_starts']}x, avg {report['avg_cold_start']}s (launch + first load)",
+            f"   • Warm start: {report['warm_starts']}x, avg {report['avg_warm_start']}s (reset + load)",
+        ]
+        if "saved_per_job" in report:
+            lines.append(f"   • Warm start saves ~{report['saved_per_job']}s per job")
+        emit("\n".join(lines))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
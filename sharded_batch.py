@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Multi-process batch mode: shard postings across worker processes, each with its own browser pool
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+# Imported in the parent so forked workers inherit loaded modules (selenium, compiled
+# rule tables, JS constants) instead of importing them again. The filler only imports
+# selenium.webdriver when it launches a browser, so it is imported explicitly here.
+import selenium.webdriver
+import selenium.webdriver.chrome.options
+
+from batch_runner import BatchRunner, BrowserPool, load_jobs, normalize_job
+from fill_log import configure_logging, shutdown_logging, add_logging_arguments, logging_options
+from profile_store import open_profile_store
+
+
+def shard_jobs(jobs, shards):
+    """Split jobs round-robin so every shard gets a similar mix"""
+    return [jobs[i::shards] for i in range(shards)]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _start_context():
+    # fork shares the parent's already-imported modules; spawn-only platforms re-import per worker
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def _worker(shard_index, jobs, options, results):
+    """Worker process: fill one shard on a private browser pool, streaming every record back"""
+    # A forked worker has no copy of the parent's log writer thread, so it starts its own
+    configure_logging(**(options.get("logging") or {"buffered": False}))
+    try:
+        profile_store = open_profile_store(options["profile_store"]) if options.get("profile_store") else None
+        runner = BatchRunner(
+            concurrency=options["concurrency"],
+            job_timeout=options["job_timeout"],
+            retries=options["retries"],
+            pool=BrowserPool(size=options["concurrency"], launch_profile=options["launch_profile"]),
+            filler_options=options.get("filler_options"),
+            profile_store=profile_store,
+        )
+        summary = runner.run(jobs, on_result=lambda record: results.put(("result", shard_index, record)))
+        summary.pop("results", None)
+        summary.pop("failures", None)
+        results.put(("done", shard_index, summary))
+    except Exception as e:
+        results.put(("error", shard_index, str(e)))
+    finally:
+        # Workers exit without running atexit hooks
+        shutdown_logging()
+
+
+class ShardedBatchRunner:
+    """Runs BatchRunner shards in N processes and aggregates their streamed results"""
+
+    def __init__(self, workers=None, concurrency_per_worker=2, job_timeout=180, retries=1,
+                 launch_profile="throughput", profile_store=None, filler_options=None, log_options=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.concurrency_per_worker = concurrency_per_worker
+        self.job_timeout = job_timeout
+        self.retries = retries
+        self.launch_profile = launch_profile
+        # Path, not a store object: each worker opens its own (SQLite handles don't survive fork)
+        self.profile_store = profile_store
+        self.filler_options = filler_options or {}
+        # configure_logging() arguments for the workers (default: unbuffered human output)
+        self.log_options = log_options
+
+    def run(self, jobs, on_result=None):
+        """Fill all jobs across worker processes; returns the aggregated summary"""
+        jobs = [normalize_job(job) for job in jobs]
+        shards = [shard for shard in shard_jobs(jobs, min(self.workers, len(jobs)) or 1) if shard]
+        context = _start_context()
+        results_queue = context.Queue()
+        options = {
+            "concurrency": self.concurrency_per_worker,
+            "job_timeout": self.job_timeout,
+            "retries": self.retries,
+            "launch_profile": self.launch_profile,
+            "profile_store": self.profile_store,
+            "filler_options": self.filler_options,
+            "logging": self.log_options,
+        }
+
+        start = time.perf_counter()
+        processes = []
+        for index, shard in enumerate(shards):
+            process = context.Process(target=_worker, args=(index, shard, options, results_queue),
+                                      name=f"fill-shard-{index}", daemon=True)
+            process.start()
+            processes.append(process)
+
+        records = []
+        finished = {}
+        reported = [set() for _ in shards]
+        while len(finished) < len(shards):
+            try:
+                kind, index, payload = results_queue.get(timeout=1)
+            except queue.Empty:
+                # A worker that died without reporting (OOM kill, segfault) fails its remaining jobs
+                for index, process in enumerate(processes):
+                    if index not in finished and not process.is_alive() and results_queue.empty():
+                        finished[index] = {"error": f"worker exited with code {process.exitcode}"}
+                        records.extend(self._lost_records(shards[index], reported[index], finished[index]["error"]))
+                continue
+            if kind == "result":
+                reported[index].add((payload["url"], payload.get("candidate")))
+                payload["worker"] = index
+                records.append(payload)
+                if on_result:
+                    on_result(payload)
+            elif kind == "done":
+                finished[index] = payload
+            else:
+                finished[index] = {"error": payload}
+                records.extend(self._lost_records(shards[index], reported[index], payload))
+
+        for process in processes:
+            process.join(timeout=10)
+        return self._aggregate(records, finished, time.perf_counter() - start)
+
+    @staticmethod
+    def _lost_records(shard, reported, error):
+        """Failure records for the jobs of a shard whose worker never reported them"""
+        return [
+            {"url": job["url"], "candidate": job["candidate"], "success": False, "filled": 0, "attempts": 0,
+             "seconds": None, "error": error, "metrics": {}, "worker": None}
+            for job in shard if (job["url"], job["candidate"]) not in reported
+        ]
+
+    def _aggregate(self, records, finished, elapsed):
+        succeeded = [r for r in records if r["success"]]
+        latencies = [r["seconds"] for r in records if r["seconds"] is not None]
+        return {
+            "jobs": len(records),
+            "workers": len(finished),
+            "succeeded": len(succeeded),
+            "failed": len(records) - len(succeeded),
+            "retries": sum(max(0, r["attempts"] - 1) for r in records),
+            "fields_filled": sum(r["filled"] for r in records),
+            "elapsed_seconds": round(elapsed, 3),
+            "jobs_per_minute": round(len(records) / elapsed * 60, 2) if elapsed else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_max": max(latencies) if latencies else None,
+            "browsers_launched": sum(s.get("browsers_launched", 0) for s in finished.values()),
+            "worker_errors": {index: s["error"] for index, s in finished.items() if "error" in s},
+            "failures": [{"url": r["url"], "error": r["error"]} for r in records if not r["success"]],
+            "results": records,
+        }
+
+
+def print_sharded_summary(summary):
+    """Print an aggregated multi-process batch summary"""
+    print("\n📦 SHARDED BATCH COMPLETED")
+    print("=" * 50)
+    print(f"Jobs: {summary['jobs']} across {summary['workers']} workers "
+          f"({summary['succeeded']} succeeded, {summary['failed']} failed, {summary['retries']} retries)")
+    print(f"Fields filled: {summary['fields_filled']}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.1f}s ({summary['jobs_per_minute']:.1f} jobs/min)")
+    print(f"Latency: p50 {summary['latency_p50']}s, p95 {summary['latency_p95']}s, max {summary['latency_max']}s")
+    print(f"Browsers launched: {summary['browsers_launched']}")
+    for index, error in summary["worker_errors"].items():
+        print(f"   💥 worker {index}: {error}")
+    for failure in summary["failures"]:
+        print(f"   ❌ {failure['url']}: {failure['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill many job applications across several worker processes")
+    parser.add_argument("jobs_file", help="text file with one posting URL (and optional candidate id) per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: half the CPU cores)")
+    parser.add_argument("--concurrency", type=int, default=2, help="browsers per worker")
+    parser.add_argument("--timeout", type=int, default=180, help="per-job timeout in seconds")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--profile-store", help="candidate directory or SQLite file for jobs that name a candidate")
+    parser.add_argument("--output", help="also write the summary as JSON")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+
+    runner = ShardedBatchRunner(workers=args.workers, concurrency_per_worker=args.concurrency,
+                                job_timeout=args.timeout, retries=args.retries,
+                                profile_store=args.profile_store,
+                                log_options=logging_options(args, show_posting=True))
+    summary = runner.run(load_jobs(args.jobs_file),
+                         on_result=lambda r: print(f"{'✅' if r['success'] else '❌'} [w{r['worker']}] {r['url']}"))
+    print_sharded_summary(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
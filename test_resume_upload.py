@@ -3,11 +3,11 @@
 Simple test script specifically for testing resume upload
 """
 
-import time
 import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from page_waits import PageWaiter
 
 def test_resume_upload():
     """Test only the resume upload functionality"""
@@ -31,6 +31,7 @@ def test_resume_upload():
     
     try:
         driver = webdriver.Chrome(options=options)
+        waiter = PageWaiter(driver)
         print("✅ Browser started successfully")
         
         # Load the page
@@ -39,7 +40,9 @@ def test_resume_upload():
         driver.get(url)
         
         print("⏳ Waiting for page to load...")
-        time.sleep(8)
+        waiter.dom_ready()
+        waiter.form_fields_present()
+        print(f"✅ Page ready ({waiter.total_seconds():.2f}s)")
         
         # Find resume upload field
         print("\n🔍 Looking for resume upload field...")
@@ -88,29 +91,21 @@ def test_resume_upload():
         try:
             # Scroll to element
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", resume_element)
-            time.sleep(2)
             
             # Highlight the element for visual confirmation
             driver.execute_script("arguments[0].style.border='3px solid red'", resume_element)
-            time.sleep(1)
             
             # Upload file
             resume_element.send_keys(resume_path)
             print(f"✅ Resume upload successful!")
             
-            # Wait a moment for upload to process
-            time.sleep(3)
-            
-            # Check if file name appears somewhere
-            try:
-                page_text = driver.page_source
-                filename = os.path.basename(resume_path)
-                if filename in page_text:
-                    print(f"✅ Confirmed: {filename} appears on page")
-                else:
-                    print("⚠️  File name not visible on page (but upload may have worked)")
-            except:
-                pass
+            # Wait for the upload widget to show the file name
+            filename = os.path.basename(resume_path)
+            if waiter.upload_shows_filename(resume_element, filename, "input[type='file']"):
+                print(f"✅ Confirmed: {filename} appears on page")
+            else:
+                print("⚠️  File name not visible on page (but upload may have worked)")
+            waiter.print_report()
             
             print("\n🎯 SUCCESS: Resume upload completed!")
             print("👀 Please verify the upload worked in the browser window")
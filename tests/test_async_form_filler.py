@@ -0,0 +1,79 @@
+import asyncio
+
+from async_form_filler import AsyncFormFiller, AsyncWebDriverError
+from bulk_fill import INJECT_VALUES_JS
+from field_discovery import DISCOVER_FIELDS_JS
+
+
+def text_field(index, name, label):
+    return {"element": f"el{index}", "index": index, "tag": "input", "input_type": "text", "id": name,
+            "name": name, "placeholder": "", "label": label, "context": label, "required": True,
+            "visible": True, "enabled": True, "selector": f"input[name='{name}']"}
+
+
+class FakeSession:
+    def __init__(self, fields, committed=True):
+        self.fields = fields
+        self.committed = committed
+
+    async def get(self, url):
+        pass
+
+    async def execute_script(self, script, *args):
+        if script == DISCOVER_FIELDS_JS:
+            return self.fields
+        return len(self.fields) if self.fields else None
+
+    async def execute_async_script(self, script, payload):
+        assert script == INJECT_VALUES_JS
+        return [self.committed] * len(payload)
+
+    async def clear(self, element):
+        raise AsyncWebDriverError("stale element reference")
+
+    async def send_keys(self, element, value):
+        pass
+
+
+def fill(session, url="https://example.com/apply"):
+    filler = AsyncFormFiller(poll_interval=0, wait_timeout=0.01)
+    return asyncio.run(filler.fill_form(session, url))
+
+
+def test_success_when_every_value_commits():
+    result = fill(FakeSession([text_field(0, "email", "Email"), text_field(1, "phone", "Phone")]))
+    assert result["success"] and result["filled"] == 2 and result["failed"] == 0
+    assert result["resume_uploaded"] is None
+
+
+def test_failure_when_values_do_not_stick(caplog):
+    result = fill(FakeSession([text_field(0, "email", "Email")], committed=False))
+    assert not result["success"] and result["error"] == "1 of 1 values not committed"
+    # The typing fallback's error goes through the fill logger, stamped with the posting
+    [record] = [r for r in caplog.records if r.name == "form_filler"]
+    assert record.levelname == "ERROR" and record.posting == "https://example.com/apply"
+    assert record.action == "fill" and "stale element reference" in record.getMessage()
+
+
+def test_failure_when_no_form_is_found():
+    result = fill(FakeSession([]))
+    assert not result["success"] and result["error"] == "no form fields found"
+
+
+class FakeService:
+    async def start(self):
+        return self
+
+    async def new_session(self, headless=True):
+        raise OSError("chrome failed to start")
+
+    async def stop(self):
+        pass
+
+
+def test_session_start_failure_fails_only_that_posting(monkeypatch, caplog):
+    monkeypatch.setattr("async_form_filler.ChromeDriverService", lambda executable: FakeService())
+    summary = asyncio.run(AsyncFormFiller(concurrency=2).run(["https://a.example", "https://b.example"]))
+    assert summary["jobs"] == 2 and summary["succeeded"] == 0
+    assert all(r["error"] == "OSError: chrome failed to start" for r in summary["results"])
+    assert sorted(r.posting for r in caplog.records if r.outcome == "error") == ["https://a.example", "https://b.example"]
@@ -0,0 +1,53 @@
+from selenium.common.exceptions import InvalidSessionIdException
+
+from batch_runner import BatchRunner, BrowserPool, error_text, normalize_job
+
+
+class FakeDriver:
+    def __init__(self, error=None):
+        self.error = error
+        self.quit_calls = 0
+
+    def set_page_load_timeout(self, seconds):
+        if self.error:
+            raise self.error
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def runner_with(driver, size=1, timeout=5):
+    return BatchRunner(concurrency=1, job_timeout=timeout, retries=0, pool=BrowserPool(size=size, factory=lambda: driver))
+
+
+def test_error_text_names_the_exception_type():
+    import queue
+    assert error_text(queue.Empty()) == "Empty"
+    assert error_text(ValueError("bad job")) == "ValueError: bad job"
+
+
+def test_non_browser_error_keeps_the_pooled_browser():
+    driver = FakeDriver()
+    runner = runner_with(driver)
+    # Names a candidate without a profile store: fails before the browser is used
+    success, filled, error, _ = runner._attempt(normalize_job({"url": "https://example.com", "candidate": "c1"}))
+    assert not success and error.startswith("ValueError: ")
+    assert runner.pool.discarded == 0 and driver.quit_calls == 0
+    assert runner.pool.acquire(timeout=0) is driver
+
+
+def test_session_error_discards_the_browser():
+    driver = FakeDriver(InvalidSessionIdException("session deleted"))
+    runner = runner_with(driver)
+    success, _, error, _ = runner._attempt(normalize_job("https://example.com"))
+    assert not success and error.startswith("InvalidSessionIdException")
+    assert runner.pool.discarded == 1
+
+
+def test_pool_timeout_is_recorded_with_its_type():
+    runner = runner_with(FakeDriver(), size=0, timeout=0.05)
+    record = runner._run_job(normalize_job("https://example.com"))
+    assert record["success"] is False and record["error"] == "Empty"
@@ -0,0 +1,56 @@
+import pytest
+
+from board_adapters import (BOARD_ADAPTERS, BOARDS_BY_NAME, GENERIC_BOARD, RESUME_TARGET, check_fixtures,
+                            detect_board, load_fixture)
+
+BOARDS = [adapter.name for adapter in BOARD_ADAPTERS]
+
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_fixture_is_detected_as_its_board(name):
+    _, fields = load_fixture(name)
+    assert detect_board(fields=fields) is BOARDS_BY_NAME[name]
+
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_fixture_system_field_map(name):
+    adapter = BOARDS_BY_NAME[name]
+    _, fields = load_fixture(name)
+    assert {field["index"]: adapter.system_target(field) for field in fields} == \
+        {field["index"]: field["expect"] for field in fields}
+    # Custom questions are left to the keyword rules
+    assert any(field["expect"] is None for field in fields)
+    resume = adapter.resume_field(fields)
+    assert resume is not None and resume["expect"] == RESUME_TARGET
+
+
+@pytest.mark.parametrize("url, name", [
+    ("https://jobs.ashbyhq.com/acme/123/application", "ashby"),
+    ("https://boards.greenhouse.io/acme/jobs/1", "greenhouse"),
+    ("https://jobs.lever.co/acme/abc/apply", "lever"),
+    ("https://acme.wd5.myworkdayjobs.com/en-US/careers/job/1", "workday"),
+])
+def test_detect_board_by_url(url, name):
+    assert detect_board(url) is BOARDS_BY_NAME[name]
+
+
+def test_unknown_board_is_generic():
+    assert detect_board("https://careers.example.com/apply") is GENERIC_BOARD
+    assert GENERIC_BOARD.resume_field([{"input_type": "file", "id": "resume", "name": "resume"}]) is None
+
+
+class MarkerDriver:
+    def __init__(self, name):
+        self.name = name
+
+    def execute_script(self, script, markers):
+        assert self.name in [marker[0] for marker in markers]
+        return self.name
+
+
+def test_detect_board_by_dom_marker():
+    assert detect_board("https://careers.example.com/apply", MarkerDriver("lever")) is BOARDS_BY_NAME["lever"]
+
+
+def test_check_fixtures_reports_no_problems():
+    assert check_fixtures() == {name: [] for name in BOARDS}
@@ -0,0 +1,104 @@
+import os
+import re
+
+import pytest
+
+import browser_profiles
+from browser_profiles import (ANALYTICS_URL_PATTERNS, DOMAIN_REQUEST_POLICIES, MEDIA_URL_PATTERNS,
+                              blocked_patterns, build_chrome_options, get_launch_profile, match_domain)
+
+POSTING_URLS = [
+    "https://jobs.ashbyhq.com/acme/1234/application",
+    "https://boards.greenhouse.io/acme/jobs/1234",
+    "https://jobs.lever.co/acme/1234/apply",
+    "https://acme.wd5.myworkdayjobs.com/en-US/careers/job/1234/apply",
+]
+
+# Requests a user needs to get a form submitted
+NEVER_BLOCKED = ["https://www.google.com/recaptcha/api2/bframe?k=abc", "https://www.google.com/recaptcha/api.js"]
+
+
+def blocks(pattern, url):
+    """Network.setBlockedURLs matching: the whole URL against the pattern, '*' standing for any run"""
+    return re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) is not None
+
+
+def is_blocked(patterns, url):
+    return any(blocks(p, url) for p in patterns)
+
+
+def test_analytics_and_media_patterns_match_real_urls():
+    assert is_blocked(ANALYTICS_URL_PATTERNS, "https://www.google-analytics.com/g/collect?v=2")
+    assert is_blocked(ANALYTICS_URL_PATTERNS, "https://www.googletagmanager.com/gtm.js?id=GTM-X")
+    assert is_blocked(MEDIA_URL_PATTERNS, "https://cdn.example.com/logo.png")
+    assert is_blocked(MEDIA_URL_PATTERNS, "https://fonts.gstatic.com/s/inter/v12/font.woff2")
+    assert not is_blocked(MEDIA_URL_PATTERNS, "https://cdn.example.com/app.js")
+
+
+def test_ashby_policy_blocks_datadog_intake_hosts():
+    patterns = blocked_patterns(POSTING_URLS[0])
+    assert is_blocked(patterns, "https://browser-intake-datadoghq.com/api/v2/rum?ddsource=browser")
+    assert is_blocked(patterns, "https://browser-intake-datadoghq.eu/api/v2/logs")
+    assert is_blocked(patterns, "https://o123.ingest.sentry.io/api/1/envelope/")
+    # Anchored to the host: a path that merely mentions it is left alone
+    assert not is_blocked(patterns, "https://jobs.ashbyhq.com/docs/browser-intake-setup")
+
+
+@pytest.mark.parametrize("posting_url", POSTING_URLS)
+@pytest.mark.parametrize("launch_profile", ["default", "throughput"])
+def test_policies_never_block_the_posting_or_recaptcha(posting_url, launch_profile):
+    patterns = blocked_patterns(posting_url, launch_profile)
+    assert not is_blocked(patterns, posting_url)
+    for url in NEVER_BLOCKED:
+        assert not is_blocked(patterns, url)
+
+
+def test_blocked_patterns_apply_board_allow_and_block():
+    workday = blocked_patterns(POSTING_URLS[3], "throughput")
+    assert "*.woff2" not in workday and "*.svg" not in workday and "*.png" in workday
+    assert workday.count("*sentry.io*") == 1
+    assert blocked_patterns("https://example.com/careers", "default") == []
+    assert blocked_patterns(POSTING_URLS[0], "default") == DOMAIN_REQUEST_POLICIES["ashbyhq.com"]["block"]
+
+
+def test_match_domain_uses_closest_parent():
+    assert match_domain(POSTING_URLS[3], DOMAIN_REQUEST_POLICIES) == "myworkdayjobs.com"
+    assert match_domain("https://JOBS.Lever.co/x", DOMAIN_REQUEST_POLICIES) == "lever.co"
+    assert match_domain("https://notlever.co/x", DOMAIN_REQUEST_POLICIES) is None
+    assert match_domain("not a url", DOMAIN_REQUEST_POLICIES) is None
+
+
+def test_unknown_launch_profile_raises():
+    with pytest.raises(ValueError, match="throughput"):
+        get_launch_profile("fast")
+
+
+def test_build_chrome_options_follow_the_profile():
+    throughput = build_chrome_options("throughput", disk_cache_dir="/tmp/cache")
+    assert "--headless=new" in throughput.arguments and "--window-size=1024,768" in throughput.arguments
+    assert "--disk-cache-dir=/tmp/cache" in throughput.arguments
+    assert throughput.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    default = build_chrome_options("default")
+    assert "--start-maximized" in default.arguments and "--headless=new" not in default.arguments
+    assert "--window-size=1280,900" in build_chrome_options("default", headless=True).arguments
+
+
+def test_first_warmed_cache_becomes_the_template(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_profiles, "DISK_CACHE_TEMPLATE_DIR", str(tmp_path / "template"))
+    monkeypatch.setattr(browser_profiles, "DISK_CACHE_SESSIONS_DIR", str(tmp_path / "sessions"))
+
+    cold = browser_profiles.session_disk_cache_dir()
+    browser_profiles.retire_disk_cache(cold)
+    # Nothing was cached, so no empty template is kept
+    assert not os.path.exists(cold) and not (tmp_path / "template").exists()
+
+    first = browser_profiles.session_disk_cache_dir()
+    with open(os.path.join(first, "bundle.js"), "w") as f:
+        f.write("cached")
+    browser_profiles.retire_disk_cache(first)
+    assert (tmp_path / "template" / "bundle.js").exists()
+
+    seeded = browser_profiles.session_disk_cache_dir()
+    assert os.path.exists(os.path.join(seeded, "bundle.js"))
+    browser_profiles.retire_disk_cache(seeded)
+    assert not os.path.exists(seeded) and (tmp_path / "template" / "bundle.js").exists()
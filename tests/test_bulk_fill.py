@@ -0,0 +1,48 @@
+from bulk_fill import INJECT_VALUES_JS, READ_VALUES_JS, inject_values, read_values, value_matches
+
+
+def test_value_matches_text():
+    assert value_matches("Taylor Johnson ", "Taylor Johnson")
+    assert value_matches("line one\r\nline two", "line one\nline two")
+    assert not value_matches("", "Taylor Johnson")
+    assert not value_matches(None, "Taylor Johnson")
+    assert not value_matches("anything", None)
+
+
+def test_value_matches_checkables_by_checked_state():
+    # read_values gives the option value of a checked box and '' for an unchecked one
+    assert value_matches("on", "Yes", "checkbox")
+    assert value_matches("remote", "Remote", "radio")
+    assert not value_matches("", "Yes", "checkbox")
+    assert not value_matches("", "on", "checkbox")
+
+
+class ScriptDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.result
+
+    execute_async_script = execute_script
+
+
+def test_inject_values_is_one_call_and_flags_each_pair():
+    driver = ScriptDriver([True, 0])
+    assert inject_values(driver, [("a", "1"), ("b", "2")]) == [True, False]
+    script, (payload,) = driver.calls[0]
+    assert script == INJECT_VALUES_JS and payload == [{"element": "a", "value": "1"}, {"element": "b", "value": "2"}]
+    assert inject_values(driver, []) == [] and len(driver.calls) == 1
+
+
+def test_inject_values_without_a_result_reports_nothing_committed():
+    assert inject_values(ScriptDriver(None), [("a", "1"), ("b", "2")]) == [False, False]
+
+
+def test_read_values():
+    driver = ScriptDriver(["x", None])
+    assert read_values(driver, ("a", "b")) == ["x", None]
+    assert driver.calls[0] == (READ_VALUES_JS, (["a", "b"],))
+    assert read_values(ScriptDriver(None), ["a"]) == [None]
@@ -0,0 +1,110 @@
+import pytest
+
+from domain_scheduler import DomainScheduler, TokenBucket, format_scheduler_metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def scheduler(clock, rate=1.0, burst=1, max_concurrent=5, **options):
+    limits = {"board.com": {"rate": rate, "burst": burst, "max_concurrent": max_concurrent}}
+    return DomainScheduler(limits=limits, clock=clock, **options)
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+    bucket.take(0.0)
+    bucket.take(0.0)
+    assert bucket.wait_time(0.0) == 0.5
+    assert bucket.wait_time(0.5) == 0.0
+
+
+def test_domain_for_matches_parent_domains(clock):
+    s = scheduler(clock)
+    assert s.domain_for("https://jobs.board.com/a") == "board.com"
+    assert s.domain_for("https://Careers.Example.org/x") == "careers.example.org"
+
+
+def test_start_rate_is_limited(clock):
+    s = scheduler(clock, rate=0.5)
+    for n in range(3):
+        s.submit("https://board.com/%d" % n, n)
+    assert s.next_job(timeout=0) == ("board.com", 0)
+    assert s.next_job(timeout=0) is None
+    clock.advance(2)
+    assert s.next_job(timeout=0) == ("board.com", 1)
+
+
+def test_concurrency_cap_and_priority(clock):
+    s = scheduler(clock, rate=100, burst=10, max_concurrent=1)
+    s.submit("https://board.com/low", "low", priority=5)
+    s.submit("https://board.com/high", "high", priority=0)
+    assert s.next_job(timeout=0) == ("board.com", "high")
+    assert s.next_job(timeout=0) is None
+    s.done("board.com", 1.0, success=True)
+    assert s.next_job(timeout=0) == ("board.com", "low")
+
+
+def test_failures_back_off_exponentially_and_halve_the_rate(clock):
+    s = scheduler(clock, rate=1.0, burst=5, base_backoff=2.0)
+    for n in range(4):
+        s.submit("https://board.com/%d" % n, n)
+    s.next_job(timeout=0)
+    s.done("board.com", 1.0, success=False)
+    state = s.domains["board.com"]
+    assert state.backoff_until == clock.now + 2.0 and state.bucket.rate == 0.5
+    assert s.next_job(timeout=0) is None
+    clock.advance(2)
+    s.next_job(timeout=0)
+    s.done("board.com", 1.0, success=False)
+    assert state.backoff_until == clock.now + 4.0 and state.bucket.rate == 0.25
+    # The rate never drops below min_rate_factor x the configured rate
+    clock.advance(4)
+    s.next_job(timeout=0)
+    s.done("board.com", 1.0, success=False)
+    assert state.bucket.rate == 0.25
+    # Successes restore it additively
+    clock.advance(8)
+    s.next_job(timeout=0)
+    s.done("board.com", 1.0, success=True)
+    assert state.bucket.rate == pytest.approx(0.35) and state.streak == 0
+    assert s.metrics()["domains"]["board.com"]["backoffs"] == 3
+
+
+def test_slow_loads_count_as_backoff(clock):
+    s = scheduler(clock, rate=100, burst=10, slow_factor=2.0)
+    for n in range(5):
+        s.submit("https://board.com/%d" % n, n)
+    for _ in range(4):
+        s.next_job(timeout=0)
+        s.done("board.com", 1.0, success=True)
+    s.next_job(timeout=0)
+    s.done("board.com", 3.0, success=True)
+    metrics = s.metrics()["domains"]["board.com"]
+    assert metrics["slow"] == 1 and metrics["backoffs"] == 1 and metrics["completed"] == 5
+
+
+def test_requeue_and_drain(clock):
+    s = scheduler(clock, rate=100, burst=10)
+    s.submit("https://board.com/a", "a")
+    s.close()
+    assert s.next_job(timeout=0) == ("board.com", "a")
+    s.done("board.com", 1.0, success=False, requeue="a again", url="https://board.com/a", priority=-1)
+    clock.advance(60)
+    assert s.next_job(timeout=0) == ("board.com", "a again")
+    s.done("board.com", 1.0, success=True)
+    assert s.next_job() is None
+    assert "queue 0" in format_scheduler_metrics(s.metrics())
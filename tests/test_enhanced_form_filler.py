@@ -0,0 +1,197 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import enhanced_form_filler
+from enhanced_form_filler import EnhancedFormFiller, main
+from fill_trace import NULL_SPAN
+from handle_cache import HandleCache
+
+
+def field(index, name, label, input_type="text"):
+    return {"element": f"el{index}", "index": index, "tag": "input", "input_type": input_type, "id": name,
+            "name": name, "placeholder": "", "label": label, "context": label, "required": True,
+            "visible": True, "enabled": True, "selector": f"input[name='{name}']"}
+
+
+class ScriptDriver:
+    """Answers every script with a fixed result and records the calls"""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.result
+
+    execute_async_script = execute_script
+
+
+def filler_on(driver, **options):
+    filler = EnhancedFormFiller(**options)
+    filler.driver = driver
+    filler.handles = HandleCache(driver)
+    filler.typed = []
+
+    def fill_field(field, value):
+        filler.typed.append((field["name"], value))
+        return True
+
+    filler._fill_field = fill_field
+    return filler
+
+
+def process(filler, entry, current_value, pending=None):
+    chosen = {}
+    filled = filler._process_field(1, entry, False, {}, chosen, [] if pending is None else pending, NULL_SPAN,
+                                   current_value=current_value)
+    return filled, chosen
+
+
+def test_incremental_skips_fields_already_holding_the_value():
+    filler = filler_on(ScriptDriver(), incremental=True)
+    filled, chosen = process(filler, field(0, "email", "Email", "email"), " taylor.johnson@example.com\n")
+    assert filled == 1 and filler.typed == [] and filler.last_skipped_writes == 1
+    assert chosen == {"0": ["email", "taylor.johnson@example.com"]}
+
+
+def test_incremental_writes_fields_that_differ_or_are_empty():
+    filler = filler_on(ScriptDriver(), incremental=True)
+    assert process(filler, field(0, "email", "Email", "email"), "old@example.com")[0] == 1
+    assert process(filler, field(1, "phone", "Phone", "tel"), "")[0] == 1
+    assert filler.typed == [("email", "taylor.johnson@example.com"), ("phone", "(555) 123-4567")]
+    assert filler.last_skipped_writes == 0
+
+
+def test_incremental_checkbox_is_skipped_only_while_checked():
+    filler = filler_on(ScriptDriver(), incremental=True)
+    filler._resolve_field_value = lambda entry, board=None: ("consent", "Yes")
+    consent = field(0, "consent", "I agree to the privacy policy", "checkbox")
+    # read_values reports an unchecked box as '' even though its value attribute is set
+    assert process(filler, consent, "")[0] == 1 and len(filler.typed) == 1
+    assert process(filler, consent, "on")[0] == 1 and len(filler.typed) == 1
+    assert filler.last_skipped_writes == 1
+
+
+def test_unchanged_fields_are_not_queued_for_bulk_fill():
+    filler = filler_on(ScriptDriver(), incremental=True, bulk_fill=True)
+    pending = []
+    process(filler, field(0, "email", "Email", "email"), "taylor.johnson@example.com", pending)
+    process(filler, field(1, "phone", "Phone", "tel"), "", pending)
+    assert [(i, entry["name"], value) for i, entry, value in pending] == [(1, "phone", "(555) 123-4567")]
+    assert filler.typed == []
+
+
+def test_read_current_values_only_covers_fillable_fields():
+    driver = ScriptDriver(["a@b.c"])
+    filler = filler_on(driver)
+    hidden = dict(field(1, "token", "Token"), visible=False)
+    assert filler._read_current_values([field(0, "email", "Email", "email"), hidden]) == {0: "a@b.c"}
+    _, (elements,) = driver.calls[0]
+    assert elements == ["el0"]
+
+
+def queued(*fields):
+    return [(entry["index"] + 1, entry, f"value {entry['index']}") for entry in fields]
+
+
+def test_bulk_fill_types_only_values_that_did_not_stick():
+    driver = ScriptDriver([True, False, True])
+    filler = filler_on(driver, bulk_fill=True)
+    fields = [field(0, "first", "First name"), field(1, "last", "Last name"), field(2, "city", "City")]
+    assert filler._bulk_fill_fields(queued(*fields)) == 3
+    assert filler.typed == [("last", "value 1")]
+    # One injection for the whole form, nothing else sent
+    assert len(driver.calls) == 1
+
+
+def test_bulk_fill_falls_back_to_typing_everything_when_injection_fails():
+    class FailingDriver(ScriptDriver):
+        def execute_async_script(self, script, *args):
+            raise RuntimeError("script timeout")
+
+    filler = filler_on(FailingDriver(), bulk_fill=True)
+    assert filler._bulk_fill_fields(queued(field(0, "first", "First name"), field(1, "last", "Last name"))) == 2
+    assert filler.typed == [("first", "value 0"), ("last", "value 1")]
+
+
+def test_bulk_fill_counts_failed_fallbacks_as_not_filled():
+    filler = filler_on(ScriptDriver([False, False]), bulk_fill=True)
+    filler._fill_field = lambda entry, value: entry["name"] == "first"
+    assert filler._bulk_fill_fields(queued(field(0, "first", "First name"), field(1, "last", "Last name"))) == 1
+
+
+def test_bulk_fill_drops_fields_that_left_the_page_before_injecting():
+    class ReRenderingDriver(ScriptDriver):
+        def execute_script(self, script, *args):
+            self.calls.append((script, args))
+            # REFRESH_HANDLES_JS: first handle re-resolved, second gone
+            return ["fresh0", False] if len(args) == 2 else None
+
+    driver = ReRenderingDriver([True])
+    filler = filler_on(driver, bulk_fill=True)
+    fields = [field(0, "first", "First name"), field(1, "last", "Last name")]
+    filler.handles.track(fields)
+    assert filler._bulk_fill_fields(queued(*fields)) == 1
+    _, (payload,) = driver.calls[-1]
+    assert payload == [{"element": "fresh0", "value": "value 0"}]
+
+
+SCHEMA = {
+    "url": "https://jobs.ashbyhq.com/acme/1/application",
+    "fields": [
+        {"type": "input", "input_type": "text", "name": "_systemfield_name", "id": "_systemfield_name",
+         "label": "Name", "placeholder": "Type here...", "required": True,
+         "selector": "input[name='_systemfield_name']"},
+        {"type": "input", "input_type": "email", "name": "_systemfield_email", "id": "_systemfield_email",
+         "label": "Email", "placeholder": "", "required": True, "selector": "input[name='_systemfield_email']"},
+        {"type": "input", "input_type": "file", "name": "_systemfield_resume", "id": "_systemfield_resume",
+         "label": "Resume", "placeholder": "", "required": True, "selector": "input[name='_systemfield_resume']"},
+    ],
+}
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "extracted_fields.json"
+    path.write_text(json.dumps(SCHEMA))
+    return str(path)
+
+
+def test_classify_cli_prints_each_fields_value(schema_path, capsys):
+    assert main(["classify", schema_path, "--json"]) == 0
+    preview = json.loads(capsys.readouterr().out)
+    assert [(row["label"], row["value"]) for row in preview] == [
+        ("Name", "Taylor Johnson"), ("Email", "taylor.johnson@example.com"), ("Resume", "Taylor_Johnson_QA_Resume.pdf")]
+
+    assert main(["classify", schema_path]) == 0
+    assert "📋 3 of 3 fields have a value" in capsys.readouterr().out
+
+
+def test_plan_cli_writes_a_plan(schema_path, tmp_path, capsys):
+    output = tmp_path / "plan.json"
+    assert main(["plan", schema_path, "-o", str(output)]) == 0
+    plan = json.loads(output.read_text())
+    assert plan["url"] == SCHEMA["url"]
+    assert [(step["selector"], step["value"]) for step in plan["steps"]] == [
+        ("input[name='_systemfield_name']", "Taylor Johnson"),
+        ("input[name='_systemfield_email']", "taylor.johnson@example.com"),
+        ("input[name='_systemfield_resume']", None)]
+    assert f"Planned 3 fields (2 with values) to {output}" in capsys.readouterr().out
+
+
+def test_candidate_needs_a_profile_store(schema_path):
+    with pytest.raises(SystemExit):
+        main(["classify", schema_path, "--candidate", "taylor"])
+
+
+def test_offline_commands_do_not_load_the_browser_stack(schema_path):
+    script = ("import sys, enhanced_form_filler; enhanced_form_filler.main(['classify', sys.argv[1], '--json']); "
+              "print([m for m in ('selenium.webdriver', 'reportlab') if m in sys.modules], file=sys.stderr)")
+    result = subprocess.run([sys.executable, "-c", script, schema_path], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(enhanced_form_filler.__file__)), check=True)
+    assert result.stderr.strip() == "[]"
@@ -0,0 +1,141 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from field_discovery import DISCOVER_FIELDS_JS, RESOLVE_FIELDS_JS, describe_field, is_fillable, resolve_fields
+from page_waits import FORM_FIELD_SELECTOR
+
+
+def field(tag="input", input_type="text", name="email", visible=True, enabled=True):
+    return {"tag": tag, "input_type": input_type, "name": name, "visible": visible, "enabled": enabled}
+
+
+def test_is_fillable():
+    assert is_fillable(field())
+    assert not is_fillable(field(visible=False))
+    assert not is_fillable(field(enabled=False))
+    # Upload widgets hide the real file input
+    assert is_fillable(field(input_type="file", visible=False))
+    assert not is_fillable(field(input_type="file", enabled=False))
+
+
+def test_describe_field():
+    assert describe_field(field()) == "input[text] name='email'"
+    assert describe_field(field(tag="textarea", input_type="", name="")) == "textarea"
+    long_name = "8280aedc-c8cc-44b9-bd58-3dcab50e39de"
+    assert describe_field(field(tag="textarea", input_type="", name=long_name)) == "textarea name='8280aedc-c8cc-44b9-b...'"
+
+
+class ResolvingDriver:
+    def __init__(self, elements):
+        self.elements = elements
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.elements
+
+
+def test_resolve_fields_attaches_handles_in_one_call():
+    fields = [{"selector": "input[name='a']", "position": 0}, {"selector": None, "position": 3}, {"selector": "x"}]
+    driver = ResolvingDriver(["el-a", "el-3", "el-x"])
+    assert resolve_fields(driver, fields)
+    assert [f["element"] for f in fields] == ["el-a", "el-3", "el-x"]
+    [(script, (entries, selector))] = driver.calls
+    assert script == RESOLVE_FIELDS_JS and selector == FORM_FIELD_SELECTOR
+    # A descriptor without a known position never falls back to one
+    assert entries == [["input[name='a']", 0], [None, 3], ["x", None]]
+
+
+def test_resolve_fields_fails_when_any_field_is_gone():
+    fields = [{"selector": "input[name='a']", "position": 0}, {"selector": "input[name='b']", "position": 1}]
+    assert not resolve_fields(ResolvingDriver(["el-a", None]), fields)
+    assert "element" not in fields[0]
+    assert not resolve_fields(ResolvingDriver(None), fields)
+
+
+# Just enough DOM for the discovery script: elements with attributes, labels and parents,
+# and querySelectorAll for FORM_FIELD_SELECTOR and tag[attr='value'] selectors
+STUB_DOM_JS = r"""
+var nodes = {};
+function node(tag, attrs, extra) {
+    var el = Object.assign({
+        tagName: tag.toUpperCase(), attrs: attrs, id: attrs.id || '', parentElement: null,
+        disabled: false, required: false, rects: [1],
+        getAttribute: function (k) { return k in this.attrs ? this.attrs[k] : null; },
+        getClientRects: function () { return this.rects; },
+        closest: function () { return null; }
+    }, extra || {});
+    if (el.id) nodes[el.id] = el;
+    return el;
+}
+function container(text, parent, closest) {
+    return {innerText: text, parentElement: parent || null, closest: function () { return closest || null; }};
+}
+var section = container('Contact details');
+var fields = [
+    node('input', {type: 'text', name: 'first'}, {labels: [{innerText: ' First name '}],
+                                                   parentElement: container('First name *', section)}),
+    node('input', {type: 'email', id: 'email-1', 'aria-labelledby': 'l1 l2'}, {required: true}),
+    node('input', {type: 'tel', id: 'gen-123', 'data-automation-id': 'phone', 'aria-label': 'Phone '}),
+    node('input', {type: 'radio', name: 'remote', value: 'yes'}),
+    node('input', {type: 'radio', name: 'remote', value: 'no'}),
+    node('input', {type: 'checkbox', name: 'c'}),
+    node('input', {type: 'checkbox', name: 'c'}),
+    node('input', {type: 'text', name: "it's"}),
+    node('select', {name: 'country'}, {options: [{value: '', text: 'Select...', disabled: true},
+                                                   {value: 'us', text: ' United States ', disabled: false}]}),
+    node('input', {type: 'text'}, {parentElement: container('', null, {})}),
+    node('input', {type: 'file', name: 'resume', accept: '.pdf'}, {rects: []})
+];
+node('span', {id: 'l1'}, {innerText: 'Email'});
+node('span', {id: 'l2'}, {innerText: 'address'});
+var document = {
+    getElementById: function (id) { return nodes[id] || null; },
+    querySelectorAll: function (selector) {
+        if (selector === SELECTOR) return fields;
+        var match = /^(\w+)((?:\[[\w-]+='(?:[^'\\]|\\.)*'\])*)$/.exec(selector);
+        var conditions = [], re = /\[([\w-]+)='((?:[^'\\]|\\.)*)'\]/g, c;
+        while ((c = re.exec(match[2]))) conditions.push([c[1], c[2].replace(/\\(.)/g, '$1')]);
+        return fields.filter(function (el) {
+            return el.tagName.toLowerCase() === match[1] &&
+                conditions.every(function (c) { return el.getAttribute(c[0]) === c[1]; });
+        });
+    }
+};
+var window = {getComputedStyle: function () { return {visibility: 'visible', opacity: '1'}; }};
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the injected script")
+def test_discovery_script_derives_selectors_and_labels():
+    program = (f"var SELECTOR = {json.dumps(FORM_FIELD_SELECTOR)};\n{STUB_DOM_JS}\n"
+               f"var found = (function () {{ {DISCOVER_FIELDS_JS} }}).apply(null, [SELECTOR]);\n"
+               "found.forEach(function (f) { delete f.element; });\n"
+               "console.log(JSON.stringify(found));")
+    result = subprocess.run(["node", "-e", program], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    found = json.loads(result.stdout)
+
+    assert [f["selector"] for f in found] == [
+        "input[name='first']",
+        "input[id='email-1']",
+        "input[data-automation-id='phone']",
+        "input[name='remote'][value='yes']",
+        "input[name='remote'][value='no']",
+        None,  # same name, no value: keyed by position instead
+        None,
+        "input[name='it\\'s']",
+        "select[name='country']",
+        "input[name='resume']",
+    ]
+    by_index = {f["index"]: f for f in found}
+    assert 9 not in by_index  # the input inside a combobox
+    assert all(f["position"] == f["index"] for f in found)
+    assert [by_index[i]["label"] for i in (0, 1, 2)] == ["First name", "Email address", "Phone"]
+    assert by_index[0]["context"] == "First name *" and by_index[1]["required"]
+    assert by_index[2]["automation_id"] == "phone" and by_index[2]["id"] == "gen-123"
+    assert by_index[8]["options"][1] == {"value": "us", "text": "United States", "disabled": False}
+    assert by_index[10]["accept"] == ".pdf" and not by_index[10]["visible"] and is_fillable(by_index[10])
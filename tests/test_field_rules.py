@@ -0,0 +1,132 @@
+import itertools
+import json
+import os
+
+import pytest
+
+from field_rules import FIELD_CLASSIFIER, FIELD_RULES, SELECT_RULES, KeywordMatcher, choose_option
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_field_source(tag, input_type, text):
+    """The keyword chain of _get_contextual_value/_get_textarea_response before the rule table"""
+    all_text = text.lower()
+    if input_type == "email" or "email" in all_text:
+        return "profile.email"
+    elif input_type == "tel" or any(word in all_text for word in ["phone", "tel", "mobile"]):
+        return "profile.phone"
+    elif "name" in all_text:
+        if "first" in all_text:
+            return "profile.first_name"
+        elif "last" in all_text:
+            return "profile.last_name"
+        return "profile.full_name"
+    elif input_type == "url" or any(word in all_text for word in ["linkedin", "github", "portfolio", "website"]):
+        if "linkedin" in all_text:
+            return "profile.linkedin"
+        elif "github" in all_text:
+            return "profile.github"
+        return "profile.portfolio"
+    elif any(word in all_text for word in ["salary", "compensation", "pay"]):
+        return "profile.salary"
+    elif any(word in all_text for word in ["experience", "years"]) and tag != "textarea":
+        return "profile.experience"
+    elif tag == "textarea":
+        chain = [
+            (["cover", "letter", "introduction", "tell us about yourself"], "cover_letter"),
+            (["why", "interested", "motivation", "attracted"], "why_interested"),
+            (["experience", "background", "qualifications"], "experience"),
+            (["strength", "skills", "abilities"], "strengths"),
+            (["challenge", "difficult", "problem", "overcome"], "challenge"),
+            (["team", "collaboration", "work with others"], "teamwork"),
+            (["work style", "approach", "methodology"], "work_style"),
+            (["remote", "distributed", "home", "virtual"], "remote_experience"),
+            (["available", "start", "notice"], "availability"),
+            (["question", "ask", "curious", "learn more"], "questions"),
+            (["travel", "trip", "journey", "destination"], "travel"),
+            (["technology", "tools", "software", "technical"], "technology"),
+            (["career", "goal", "future", "growth"], "career_goals"),
+            (["motivate", "drive", "inspire"], "motivation"),
+        ]
+        for words, response in chain:
+            if any(word in all_text for word in words):
+                return f"responses.{response}"
+        return "responses.general"
+    elif tag == "input" and input_type in ["text", ""]:
+        return "profile.full_name"
+    return None
+
+
+def legacy_select_option(options, text):
+    """_choose_select_option before the rule table"""
+    all_text = text.lower()
+    valid = [opt for opt in options if opt and not any(w in opt.lower() for w in ["select", "choose", "please", "--"])]
+    if not valid:
+        return None
+    if any(word in all_text for word in ["experience", "years"]):
+        for opt in valid:
+            if any(exp in opt for exp in ["3-5", "4-6", "5+", "5-7"]):
+                return opt
+    elif any(word in all_text for word in ["work", "employment", "type"]):
+        for opt in valid:
+            if "full" in opt.lower():
+                return opt
+    elif any(word in all_text for word in ["eligible", "authorized"]):
+        for opt in valid:
+            if "yes" in opt.lower():
+                return opt
+    return valid[0]
+
+
+def rule_source(rule):
+    if rule is None:
+        return None
+    return f"profile.{rule['profile']}" if "profile" in rule else f"responses.{rule['response']}"
+
+
+def corpus():
+    """Every rule keyword alone and in pairs, plus the labels of extracted_fields.json"""
+    keywords = sorted({k for rule in FIELD_RULES for k in rule.get("keywords", []) + rule.get("requires", [])})
+    texts = ["", "Anything else?"] + keywords + [f"{a} {b}" for a, b in itertools.combinations(keywords, 2)]
+    with open(os.path.join(ROOT, "extracted_fields.json"), encoding="utf-8") as f:
+        texts += [entry.get("label") or "" for entry in json.load(f)["fields"]]
+    return texts
+
+
+KINDS = [("input", "text"), ("input", ""), ("input", "email"), ("input", "tel"), ("input", "url"),
+         ("input", "number"), ("textarea", ""), ("select", "")]
+
+
+@pytest.mark.parametrize("tag, input_type", KINDS)
+def test_rule_table_matches_legacy_chain(tag, input_type):
+    mismatches = [(text, legacy_field_source(tag, input_type, text), rule_source(rule))
+                  for text in corpus()
+                  for rule in [FIELD_CLASSIFIER.classify(text, tag, input_type)]
+                  if rule_source(rule) != legacy_field_source(tag, input_type, text)]
+    assert mismatches == []
+
+
+OPTIONS = ["Select...", "0-2", "3-5", "5+", "Full-time", "Part-time", "Yes", "No"]
+
+
+def test_select_rules_match_legacy_chain():
+    keywords = sorted({k for rule in SELECT_RULES for k in rule["keywords"]})
+    texts = keywords + [f"{a} {b}" for a, b in itertools.combinations(keywords, 2)]
+    for text in texts:
+        # Deliberate change: eligibility questions ("authorized to work") are checked before employment type
+        if any(k in text for k in ("eligible", "authorized")) and any(k in text for k in ("work", "employment", "type")):
+            continue
+        for options in (OPTIONS, OPTIONS[::-1], ["--", "Contract", "Other"]):
+            assert choose_option(options, text)[1] == legacy_select_option(options, text), (text, options)
+
+
+def test_authorized_to_work_picks_yes():
+    assert choose_option(OPTIONS, "Are you authorized to work in the US?") == ("select_eligibility", "Yes")
+
+
+def test_keyword_matcher_finds_overlapping_and_prefix_keywords():
+    matcher = KeywordMatcher(["tel", "telephone", "phone", "work style"])
+    assert matcher.scan("Your Telephone") == {"tel", "telephone", "phone"}
+    assert matcher.scan("describe your work style") == {"work style"}
+    assert not matcher.contains_any("email")
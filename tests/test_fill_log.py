@@ -0,0 +1,90 @@
+import io
+import json
+import logging
+
+import pytest
+
+from fill_log import (BufferedStreamHandler, HumanFormatter, JsonFormatter, configure_logging, get_fill_logger,
+                      shutdown_logging)
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def record(message, level=logging.INFO, **attributes):
+    entry = logging.LogRecord("form_filler", level, __file__, 1, message, (), None)
+    entry.__dict__.update(attributes)
+    return entry
+
+
+def test_buffered_handler_writes_in_batches():
+    stream = CountingStream()
+    handler = BufferedStreamHandler(stream, capacity=3, flush_interval=60)
+    for i in range(5):
+        handler.emit(record(f"line {i}"))
+    # One write for the first full batch; the rest waits for the next batch or a flush
+    assert stream.writes == 1 and stream.getvalue() == "line 0\nline 1\nline 2\n"
+    handler.flush()
+    assert stream.writes == 2 and stream.getvalue().endswith("line 3\nline 4\n")
+
+
+def test_buffered_handler_writes_errors_at_once():
+    stream = CountingStream()
+    handler = BufferedStreamHandler(stream, capacity=100, flush_interval=60)
+    handler.emit(record("queued"))
+    handler.emit(record("failed", logging.ERROR))
+    assert stream.getvalue() == "queued\nfailed\n"
+
+
+def test_shutdown_drains_the_queue(tmp_path):
+    path = tmp_path / "fill.log"
+    configure_logging(path=str(path), capacity=1000, flush_interval=60)
+    try:
+        log = get_fill_logger("https://a.example")
+        for i in range(50):
+            log.info("record %d", i)
+    finally:
+        shutdown_logging()
+    assert path.read_text().splitlines() == [f"record {i}" for i in range(50)]
+
+
+def test_human_formatter_prefixes_every_line_with_the_posting():
+    entry = record("\n🔄 1. Processing\n   📝 Context", posting="https://a.example", field="#1")
+    assert HumanFormatter().format(entry) == "\n🔄 1. Processing\n   📝 Context"
+    assert HumanFormatter(show_posting=True).format(entry) == \
+        "\n[https://a.example] 🔄 1. Processing\n[https://a.example]    📝 Context"
+
+
+def test_json_formatter_carries_the_structured_attributes():
+    entry = record("   ✅ Filled: %s", posting="https://a.example", field="#1", action="fill", outcome="ok", rule=None)
+    entry.args = ("Taylor",)
+    data = json.loads(JsonFormatter().format(entry))
+    assert data["message"] == "✅ Filled: Taylor" and data["level"] == "INFO"
+    assert {key: data[key] for key in ("posting", "field", "action", "outcome")} == \
+        {"posting": "https://a.example", "field": "#1", "action": "fill", "outcome": "ok"}
+    assert "rule" not in data
+
+
+def test_fill_logger_keyword_attributes_and_bind(tmp_path):
+    path = tmp_path / "fill.jsonl"
+    configure_logging(log_format="json", path=str(path), buffered=False)
+    try:
+        log = get_fill_logger("https://a.example").bind(field="#2")
+        log.warning("⚠️  Not confirmed", action="fill", outcome="unconfirmed")
+    finally:
+        shutdown_logging()
+    [data] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert (data["posting"], data["field"], data["outcome"], data["level"]) == \
+        ("https://a.example", "#2", "unconfirmed", "WARNING")
+
+
+def test_unknown_log_format_is_rejected():
+    with pytest.raises(ValueError, match="json"):
+        configure_logging(log_format="xml")
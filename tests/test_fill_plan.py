@@ -0,0 +1,69 @@
+import pytest
+
+from field_discovery import DISCOVER_FIELDS_JS
+from fill_plan import extract_schema
+from page_waits import COUNT_READY_FIELDS_JS, PageWaiter
+
+
+def email_field():
+    return {"element": "el0", "index": 0, "tag": "input", "input_type": "email", "id": "email", "name": "email",
+            "placeholder": "", "label": "Email", "context": "Email", "required": True, "visible": True,
+            "enabled": True, "selector": "input[name='email']"}
+
+
+class RenderingDriver:
+    """A client-rendered form: the fields appear only after a few polls"""
+
+    def __init__(self, render_after=3):
+        self.render_after = render_after
+        self.polls = 0
+        self.visited = None
+
+    def get(self, url):
+        self.visited = url
+
+    def execute_script(self, script, *args):
+        if script == "return document.readyState":
+            return "complete"
+        if script == COUNT_READY_FIELDS_JS:
+            self.polls += 1
+            return 1 if self.polls >= self.render_after else 0
+        if script == DISCOVER_FIELDS_JS:
+            return [email_field()] if self.polls >= self.render_after else []
+        return {"title": "Apply", "url": self.visited, "page_heading": "Engineer"}
+
+
+def test_extract_waits_for_client_rendered_fields():
+    driver = RenderingDriver()
+    schema = extract_schema(driver, "https://jobs.example.com/apply", PageWaiter(driver, poll_frequency=0))
+    assert [field["name"] for field in schema["fields"]] == ["email"]
+    assert schema["url"] == "https://jobs.example.com/apply"
+
+
+def test_extract_refuses_to_write_an_empty_schema():
+    driver = RenderingDriver(render_after=10 ** 9)
+    with pytest.raises(RuntimeError, match="no form fields"):
+        extract_schema(driver, "https://jobs.example.com/apply", PageWaiter(driver, timeout=0.05, poll_frequency=0))
+
+
+class PlannedPageDriver:
+    """The plan's first step is on the page; the second's selector changed; discovery finds one extra"""
+
+    def execute_script(self, script, *args):
+        if script == DISCOVER_FIELDS_JS:
+            extra = dict(email_field(), index=1, position=1, selector="input[name='work_email']", element="el1")
+            planned = dict(email_field(), index=0, position=0)
+            return [planned, extra]
+        selectors, _ = args
+        return [{"element": "el0", "visible": True, "enabled": True, "position": 0}, None][:len(selectors)]
+
+
+def test_resolve_plan_keeps_document_positions():
+    from fill_plan import resolve_plan
+    steps = [dict(email_field(), index=0, rule="email", value="a@b.c"),
+             dict(email_field(), index=1, selector="input[name='gone']", rule="phone", value="555")]
+    for step in steps:
+        step.pop("element")
+    fields, values, unmatched = resolve_plan(PlannedPageDriver(), {"steps": steps})
+    assert unmatched == 1 and values == {"0": ["email", "a@b.c"]}
+    assert [(field["index"], field["position"]) for field in fields] == [(0, 0), (3, 1)]
@@ -0,0 +1,113 @@
+import json
+import threading
+
+from fill_trace import FillTracer, NULL_TRACER, detach
+
+
+class FakeDriver:
+    def __init__(self):
+        self.sent = 0
+
+    def execute(self, command, params=None):
+        self.sent += 1
+        return {"value": None}
+
+
+def test_attach_is_idempotent_across_tracers():
+    driver = FakeDriver()
+    first, second = FillTracer(), FillTracer()
+    first.attach(driver)
+    first.attach(driver)
+    second.attach(driver)
+    driver.execute("getTitle")
+    assert (first.webdriver_calls, second.webdriver_calls, driver.sent) == (0, 1, 1)
+
+    # The disabled tracer of the next job removes the wrapper
+    NULL_TRACER.attach(driver)
+    driver.execute("getTitle")
+    assert second.webdriver_calls == 1 and driver.sent == 2
+    assert detach(driver) == driver.execute
+
+
+def test_span_stacks_are_per_thread():
+    tracer = FillTracer()
+    ready = threading.Barrier(2)
+
+    def work(name):
+        with tracer.span(name):
+            ready.wait()
+            with tracer.span(f"{name}.field", "field"):
+                ready.wait()
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    by_name = {span["name"]: span for span in tracer.spans}
+    assert by_name["a.field"]["parent"] == by_name["a"]["id"]
+    assert by_name["b.field"]["parent"] == by_name["b"]["id"]
+    assert by_name["a"]["parent"] is None and by_name["b"]["parent"] is None
+    assert sorted(span["id"] for span in tracer.spans) == [0, 1, 2, 3]
+
+
+def test_call_counts_and_tracks_are_per_thread():
+    tracer = FillTracer()
+    drivers = {name: tracer.attach(FakeDriver()) for name in ("a", "b")}
+    ready = threading.Barrier(2)
+
+    def work(name, calls):
+        with tracer.span(name):
+            ready.wait()
+            for _ in range(calls):
+                drivers[name].execute("getTitle")
+            ready.wait()
+
+    threads = [threading.Thread(target=work, args=args) for args in (("a", 2), ("b", 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    by_name = {span["name"]: span for span in tracer.spans}
+    # Both spans were open while the other thread sent its commands
+    assert (by_name["a"]["webdriver_calls"], by_name["b"]["webdriver_calls"]) == (2, 5)
+    assert tracer.webdriver_calls == 7
+
+    events = {event["name"]: event for event in tracer.to_chrome_trace()["traceEvents"]}
+    assert events["a"]["tid"] == by_name["a"]["tid"] != events["b"]["tid"] == by_name["b"]["tid"]
+    assert "tid" not in events["a"]["args"]
+
+
+def test_report_since_a_mark_covers_only_later_spans_of_the_thread():
+    tracer = FillTracer()
+    driver = tracer.attach(FakeDriver())
+    with tracer.span("page_load"):
+        driver.execute("get")
+    mark = tracer.mark()
+    with tracer.span("page_load"):
+        driver.execute("get")
+        driver.execute("getTitle")
+    assert tracer.summary(since=mark) == {"page_load": {"count": 1, "total_ms": tracer.spans[1]["duration_ms"],
+                                                        "webdriver_calls": 2}}
+    lines = []
+    tracer.print_report(emit=lines.append, since=mark)
+    assert "1 spans, 2 WebDriver calls" in lines[0]
+
+
+def test_fill_cli_exports_the_trace(tmp_path, monkeypatch):
+    import enhanced_form_filler
+    from fill_log import shutdown_logging
+
+    def fill_form(self, url, review=True, journal_key=None):
+        with self.tracer.span("page_load", url=url):
+            pass
+        return True
+
+    monkeypatch.setattr(enhanced_form_filler.EnhancedFormFiller, "fill_form", fill_form)
+    trace_path = tmp_path / "fill.jsonl"
+    try:
+        assert enhanced_form_filler.main(["fill", "https://a.example", "--trace", str(trace_path), "--quiet"]) == 0
+    finally:
+        shutdown_logging()
+    [span] = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert span["name"] == "page_load" and span["url"] == "https://a.example"
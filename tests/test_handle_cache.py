@@ -0,0 +1,57 @@
+from fill_plan import plan_fields
+from handle_cache import HandleCache
+
+
+class FakeDriver:
+    """Records scripts; refresh results are queued by the test"""
+
+    def __init__(self):
+        self.calls = []
+        self.results = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0) if self.results else len(args[0])
+
+
+def radio(index, value, selector):
+    return {"index": index, "selector": selector, "element": f"el-{value}", "tag": "input", "input_type": "radio"}
+
+
+def test_group_members_are_tracked_separately():
+    driver = FakeDriver()
+    cache = HandleCache(driver)
+    members = [radio(0, "yes", "input[name='g'][value='yes']"), radio(1, "no", "input[name='g'][value='no']"),
+               radio(2, "a", None), radio(3, "b", None)]
+    cache.track(members)
+    assert list(cache.fields) == ["input[name='g'][value='yes']", "input[name='g'][value='no']", "#2", "#3"]
+
+    # First still attached, second re-rendered, third gone, fourth re-found by position
+    driver.results = [[None, "new-no", False, "new-b"]]
+    assert cache.refresh() == 2
+    assert members[1]["element"] == "new-no" and members[3]["element"] == "new-b"
+    assert "#2" not in cache.fields
+    assert cache.stats()["handles_missing"] == 1
+
+
+def test_plan_fields_keeps_unselectable_fields_apart():
+    schema = {"fields": [
+        {"type": "input", "input_type": "checkbox", "label": "Remote", "selector": None},
+        {"type": "input", "input_type": "checkbox", "label": "Onsite", "selector": None},
+        {"type": "input", "input_type": "text", "label": "Name", "id": "n", "selector": "input[name='n']"},
+        {"type": "input", "input_type": "text", "label": "Name", "id": "n", "selector": "input[name='n']"},
+    ]}
+    assert [field["label"] for field in plan_fields(schema)] == ["Remote", "Onsite", "Name"]
+
+
+def test_refresh_falls_back_to_position_only_when_known():
+    driver = FakeDriver()
+    cache = HandleCache(driver)
+    discovered = {"index": 4, "position": 4, "selector": None, "element": "a"}
+    planned = {"index": 2, "selector": "input[name='p']", "element": "b"}
+    extra = {"index": 9, "position": 1, "selector": None, "element": "c"}
+    cache.track([discovered, planned, extra])
+    driver.results = [[None, None, None]]
+    cache.refresh()
+    entries = driver.calls[-1][0]
+    assert entries == [["#4", None, 4], ["input[name='p']", "input[name='p']", None], ["#9", None, 1]]
@@ -0,0 +1,48 @@
+import pytest
+
+from field_rules import OptionIndex, choose_option, normalize_option_text, score_option
+
+
+def test_normalize_option_text():
+    assert normalize_option_text(" Full-Time ") == "full time"
+    assert normalize_option_text("5+ years") == "5+ years"
+
+
+@pytest.mark.parametrize("option, target, score", [
+    ("Full-time", "full time", 1.0),
+    ("Yes, full-time", "full time", 0.8),
+    ("3-5 years", "5", 1.0),
+    ("6-8 years", "5", 0.0),
+    ("5+ years", "7", 1.0),
+    ("Less than 2 years", "5", 0.0),
+    ("More than 4", "5 years", 1.0),
+    ("Anything", "", 0.0),
+])
+def test_score_option(option, target, score):
+    assert score_option(option, target) == score
+
+
+def test_partial_overlap_scores_below_containment():
+    assert 0 < score_option("Remote contract role", "remote role only") < 0.8
+
+
+def test_option_index_position_and_best():
+    index = OptionIndex([
+        {"text": "Select...", "value": "", "disabled": False},
+        {"text": "United States", "value": "us", "disabled": True},
+        {"text": "United States of America", "value": "usa", "disabled": False},
+        {"text": "Canada", "value": "ca", "disabled": False},
+    ])
+    # Disabled options are never chosen
+    assert index.position("united states") is None
+    assert index.position("CANADA") == 3
+    assert index.best("United States") == (2, 0.8)
+    assert index.best("Mexico") == (None, 0.0)
+
+
+def test_choose_option_prefers_the_target_value():
+    options = ["Please choose", "0-2", "3-5", "6+"]
+    assert choose_option(options, "Years of experience", "5") == ("select_experience", "3-5")
+    assert choose_option(options, "Favourite number", "7") == ("select_best_match", "6+")
+    assert choose_option(options, "Favourite number") == ("select_first_option", "0-2")
+    assert choose_option(["--", "Select one"], "Anything") == (None, None)
@@ -0,0 +1,79 @@
+from selenium.common.exceptions import StaleElementReferenceException
+
+from page_waits import COUNT_READY_FIELDS_JS, FORM_FIELD_SELECTOR, VALUE_COMMITTED_JS, PageWaiter
+
+
+class ScriptedDriver:
+    """Returns the next scripted answer per script (the last one repeats); exceptions are raised"""
+
+    def __init__(self, answers):
+        self.answers = {script: list(values) for script, values in answers.items()}
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        values = self.answers[script]
+        value = values.pop(0) if len(values) > 1 else values[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+READY_STATE = "return document.readyState"
+
+
+def waiter_for(answers, timeout=0.2):
+    return PageWaiter(ScriptedDriver(answers), timeout=timeout, poll_frequency=0.001)
+
+
+def test_dom_ready_polls_until_complete():
+    waiter = waiter_for({READY_STATE: ["loading", "interactive", "complete"]})
+    assert waiter.dom_ready()
+    assert len(waiter.driver.calls) == 3
+    assert [(t["wait"], t["satisfied"]) for t in waiter.timings] == [("dom_ready", True)]
+
+
+def test_form_fields_present_returns_the_count_once_enough_render():
+    waiter = waiter_for({COUNT_READY_FIELDS_JS: [0, 1, 4]})
+    assert waiter.form_fields_present(minimum=2) == 4
+    assert waiter.driver.calls[-1] == (COUNT_READY_FIELDS_JS, (FORM_FIELD_SELECTOR,))
+
+
+def test_unmet_waits_return_falsy_and_are_recorded():
+    waiter = waiter_for({COUNT_READY_FIELDS_JS: [0], READY_STATE: ["loading"]}, timeout=0.02)
+    assert waiter.form_fields_present() == 0
+    assert waiter.dom_ready() is False
+    assert [t["satisfied"] for t in waiter.timings] == [False, False]
+    assert all(t["seconds"] >= 0.02 for t in waiter.timings)
+
+
+def test_stale_elements_are_retried_not_raised():
+    waiter = waiter_for({VALUE_COMMITTED_JS: [StaleElementReferenceException("re-rendered"), False, True]})
+    assert waiter.value_committed("el", "Taylor")
+    assert waiter.driver.calls[-1] == (VALUE_COMMITTED_JS, ("el", "Taylor"))
+
+
+def test_script_result_returns_the_value():
+    waiter = waiter_for({"return window.ready": [None, {"fields": 3}]})
+    assert waiter.script_result("app_ready", "return window.ready") == {"fields": 3}
+    assert waiter.timings[0]["wait"] == "app_ready"
+
+
+def test_summary_and_report():
+    waiter = PageWaiter(None)
+    waiter.timings = [
+        {"wait": "value_committed", "seconds": 0.1, "satisfied": True},
+        {"wait": "value_committed", "seconds": 5.0, "satisfied": False},
+        {"wait": "dom_ready", "seconds": 0.25, "satisfied": True},
+    ]
+    assert waiter.total_seconds() == 5.35
+    assert waiter.summary() == {
+        "value_committed": {"count": 2, "total": 5.1, "max": 5.0, "unmet": 1},
+        "dom_ready": {"count": 1, "total": 0.25, "max": 0.25, "unmet": 0},
+    }
+    lines = []
+    waiter.print_report(emit=lines.append)
+    [report] = lines
+    assert "Wait time: 5.35s across 3 waits" in report
+    assert "value_committed: 2x, total 5.10s, max 5.00s, 1 timed out" in report
+    assert report.split("\n")[-1] == "   • dom_ready: 1x, total 0.25s, max 0.25s"
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from profile_store import (DirectoryProfileStore, IncompleteProfile, ProfileNotFound, ProfileStore,
+                           SQLiteProfileStore, open_profile_store)
+
+PROFILE = {"full_name": "Sam Lee", "email": "sam@example.com", "phone": "555-0142"}
+
+
+@pytest.fixture(params=["candidates", "candidates.db"])
+def store(request, tmp_path):
+    return open_profile_store(str(tmp_path / request.param), cache_size=2)
+
+
+def test_open_profile_store_picks_backend(tmp_path):
+    assert isinstance(open_profile_store(str(tmp_path / "c")), DirectoryProfileStore)
+    assert isinstance(open_profile_store(str(tmp_path / "c.sqlite")), SQLiteProfileStore)
+
+
+def test_base_store_is_abstract():
+    with pytest.raises(TypeError):
+        ProfileStore()
+
+
+def test_round_trip(store, tmp_path):
+    store.put("c1", profile=PROFILE, responses={"general": "Hi"}, resume_path="resumes/sam.pdf")
+    store.put("c2", profile={"full_name": "Ana Ruiz"})
+    record = store.get("c1")
+    assert record["profile"] == PROFILE
+    assert record["responses"] == {"general": "Hi"}
+    # Relative resume paths resolve against the store
+    assert os.path.isabs(record["resume_path"]) and record["resume_path"].endswith(os.path.join("resumes", "sam.pdf"))
+    assert store.get("c2")["resume_path"] is None
+    assert store.ids() == ["c1", "c2"]
+    assert "c3" not in store
+    with pytest.raises(ProfileNotFound):
+        store.get("c3")
+
+
+def test_put_invalidates_and_lru_evicts(store):
+    store.put("a", profile={"full_name": "A"})
+    store.get("a")
+    store.put("a", profile={"full_name": "A2"})
+    assert store.get("a")["profile"]["full_name"] == "A2"
+    store.put("b", profile={})
+    store.put("c", profile={})
+    store.get("b")
+    store.get("c")
+    assert store.stats()["cached"] == 2
+    store.get("a")
+    assert store.stats()["misses"] == 5
+
+
+def test_filler_options_require_identity_and_resume(store, tmp_path):
+    resume = tmp_path / "sam.pdf"
+    resume.write_bytes(b"%PDF-1.4\n")
+    store.put("ok", profile=PROFILE, resume_path=str(resume))
+    options = store.filler_options("ok")
+    assert options["profile"] == PROFILE and options["resume_path"] == str(resume)
+    assert options["demo_defaults"] is False
+
+    store.put("no_phone", profile={"full_name": "Sam Lee", "email": "sam@example.com"}, resume_path=str(resume))
+    with pytest.raises(IncompleteProfile, match="phone"):
+        store.filler_options("no_phone")
+
+    store.put("no_resume", profile=PROFILE)
+    with pytest.raises(IncompleteProfile, match="resume_path"):
+        store.filler_options("no_resume")
+    # A resume cache will generate the resume
+    assert store.filler_options("no_resume", require_resume=False)["resume_path"] is None
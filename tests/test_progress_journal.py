@@ -0,0 +1,84 @@
+import json
+
+from progress_journal import ProgressJournal, value_hash
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_replay_restores_fields_and_completed_postings(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(path)) as journal:
+        journal.record_field("https://a", "input[name='email']", "me@example.com")
+        journal.record_field("https://b", "input[name='email']", "me@example.com")
+        journal.complete_posting("https://b", filled=3)
+
+    journal = ProgressJournal(str(path))
+    assert journal.is_complete("https://b")
+    assert not journal.is_complete("https://a")
+    assert journal.committed_fields("https://a") == 1
+    # Fields of completed postings are not kept
+    assert journal.committed_fields("https://b") == 0
+    assert journal.field_committed("https://a", "input[name='email']", "me@example.com")
+    assert not journal.field_committed("https://a", "input[name='email']", "other@example.com")
+    journal.close()
+
+
+def test_field_committed_matches_value_read_back_from_page(tmp_path):
+    with ProgressJournal(str(tmp_path / "journal.jsonl")) as journal:
+        journal.record_field("https://a", "textarea[name='q']", "line one\nline two")
+        assert journal.field_committed("https://a", "textarea[name='q']", "line one\r\nline two\n")
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(path)) as journal:
+        journal.complete_posting("https://a")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "posting", "posting": "https://b"')
+
+    journal = ProgressJournal(str(path))
+    assert journal.is_complete("https://a")
+    assert not journal.is_complete("https://b")
+    journal.close()
+
+
+def test_values_are_stored_as_hashes_only(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(path), fsync="always") as journal:
+        journal.record_field("https://a", "#1", "secret answer")
+    record = _records(path)[0]
+    assert record["hash"] == value_hash("secret answer")
+    assert "secret answer" not in path.read_text(encoding="utf-8")
+
+
+def test_compacts_on_open(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(path), compact_min_records=10**9) as journal:
+        for i in range(50):
+            journal.record_field("https://a", f"#{i}", i)
+        journal.complete_posting("https://a", filled=50)
+    assert len(_records(path)) == 51
+
+    journal = ProgressJournal(str(path), compact_min_records=10)
+    assert journal.stats()["records_on_disk"] == 1
+    assert _records(path) == [{"type": "posting", "posting": "https://a", "filled": 50}]
+    journal.close()
+
+
+def test_compacts_while_appending(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ProgressJournal(str(path), fsync="never", flush_every=1, compact_ratio=4, compact_min_records=20)
+    for posting in range(10):
+        for i in range(10):
+            journal.record_field(f"https://{posting}", f"#{i}", i)
+        journal.complete_posting(f"https://{posting}", filled=10)
+    # 110 records were appended; the live state is 10 completed postings
+    assert journal.stats()["records_on_disk"] < 40
+    journal.close()
+
+    reopened = ProgressJournal(str(path))
+    assert all(reopened.is_complete(f"https://{posting}") for posting in range(10))
+    reopened.close()
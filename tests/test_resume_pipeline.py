@@ -0,0 +1,115 @@
+import os
+import threading
+
+import pytest
+
+import resume_pipeline
+from resume_pipeline import ResumeCache, _render_atomic, validate_resume
+
+
+class SlowTemplate:
+    """Writes its output in two steps, so overlapping renders would interleave on a shared file"""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(4)
+
+    def render(self, profile, output_path):
+        with open(output_path, "wb") as f:
+            f.write(b"%PDF-")
+            self.barrier.wait(timeout=5)
+            f.write(profile["full_name"].encode())
+
+
+def test_concurrent_renders_of_one_path_never_share_a_temporary_file(tmp_path, monkeypatch):
+    template = SlowTemplate()
+    monkeypatch.setattr(resume_pipeline, "resume_template", lambda: template)
+    path = str(tmp_path / "resume.pdf")
+    errors = []
+
+    def render():
+        try:
+            _render_atomic({"full_name": "Ada Lovelace"}, path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert (tmp_path / "resume.pdf").read_bytes() == b"%PDF-Ada Lovelace"
+    assert [p.name for p in tmp_path.iterdir()] == ["resume.pdf"]
+
+
+def test_failed_render_leaves_nothing_behind(tmp_path, monkeypatch):
+    class BrokenTemplate:
+        def render(self, profile, output_path):
+            open(output_path, "wb").write(b"%PDF-")
+            raise RuntimeError("layout overflow")
+
+    monkeypatch.setattr(resume_pipeline, "resume_template", BrokenTemplate)
+    with pytest.raises(RuntimeError):
+        _render_atomic({"full_name": "Ada"}, str(tmp_path / "resume.pdf"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_validate_resume_accepts_a_real_pdf(tmp_path):
+    assert validate_resume(write(tmp_path / "cv.pdf", b"%PDF-1.4 body")) is None
+    assert validate_resume(write(tmp_path / "cv.docx", b"PK\x03\x04 body"), accept=".pdf,.docx") is None
+    assert validate_resume(str(tmp_path / "cv.pdf"), accept="application/pdf") is None
+
+
+def test_validate_resume_reasons(tmp_path):
+    assert validate_resume(None) == "file not found"
+    assert validate_resume(str(tmp_path / "missing.pdf")) == "file not found"
+    assert validate_resume(write(tmp_path / "empty.pdf", b"")) == "file is empty"
+    assert validate_resume(write(tmp_path / "big.pdf", b"%PDF-" + b"x" * 2048), max_bytes=1024).startswith("file is ")
+    assert validate_resume(write(tmp_path / "cv.txt", b"text")) == "unsupported file type '.txt'"
+    assert validate_resume(write(tmp_path / "cv.doc", b"\xd0\xcf\x11\xe0"), accept=".pdf") == \
+        "'.doc' not accepted by the form (.pdf)"
+    assert validate_resume(write(tmp_path / "fake.pdf", b"<html>")) == "file content is not a valid .pdf document"
+
+
+PROFILE = {"full_name": "Ada Lovelace", "email": "ada@example.com", "phone": "555 0100", "experience": "Engines"}
+
+
+def test_cache_hit_until_resume_content_changes(tmp_path):
+    cache = ResumeCache(str(tmp_path))
+    first = cache.get_or_build(PROFILE)
+    assert validate_resume(first, accept=".pdf") is None
+    # Keys that aren't printed on the resume don't rebuild it
+    assert cache.get_or_build(dict(PROFILE, salary_expectation="100k")) == first
+    changed = cache.get_or_build(dict(PROFILE, phone="555 0199"))
+    assert changed != first and os.path.exists(first) and os.path.exists(changed)
+    assert cache.stats() == {"hits": 1, "builds": 2}
+
+
+def test_build_all_renders_each_distinct_resume_once(tmp_path):
+    cache = ResumeCache(str(tmp_path))
+    profiles = {"ada": PROFILE, "ada-copy": dict(PROFILE), "grace": dict(PROFILE, full_name="Grace Hopper")}
+    summary = cache.build_all(profiles, workers=2)
+    assert (summary["built"], summary["skipped"], summary["failed"]) == (2, 1, 0)
+    assert summary["paths"]["ada"] == summary["paths"]["ada-copy"] != summary["paths"]["grace"]
+    assert all(validate_resume(path) is None for path in summary["paths"].values())
+
+    profiles["grace"] = dict(profiles["grace"], email="grace@example.com")
+    again = cache.build_all(profiles, workers=2)
+    assert (again["built"], again["skipped"], again["workers"]) == (1, 2, 1)
+    assert again["paths"]["grace"] != summary["paths"]["grace"]
+
+
+def test_build_all_reports_render_failures_per_profile(tmp_path, monkeypatch):
+    class BrokenTemplate:
+        def render(self, profile, output_path):
+            raise RuntimeError("layout overflow")
+
+    monkeypatch.setattr(resume_pipeline, "resume_template", BrokenTemplate)
+    summary = ResumeCache(str(tmp_path)).build_all({"ada": PROFILE}, workers=1)
+    assert summary["failed"] == 1 and summary["errors"] == {"ada": "layout overflow"}
+    assert summary["paths"] == {} and list(tmp_path.iterdir()) == []
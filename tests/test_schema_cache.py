@@ -0,0 +1,80 @@
+import json
+import threading
+
+from schema_cache import FormSchemaCache, fingerprint_fields, schema_from_fields
+
+FIELDS = [{"index": 0, "tag": "input", "input_type": "email", "name": "email", "id": "e", "element": object()}]
+
+
+def test_round_trip_and_fingerprint_mismatch(tmp_path):
+    cache = FormSchemaCache(str(tmp_path))
+    fingerprint = fingerprint_fields(FIELDS)
+    cache.put("https://a.example", fingerprint, FIELDS, values={"0": ["email", "a@b.c"]}, values_key="k")
+    entry = cache.get("https://a.example", fingerprint)
+    assert entry["fields"] == schema_from_fields(FIELDS) and "element" not in entry["fields"][0]
+    assert entry["values"] == {"0": ["email", "a@b.c"]} and entry["values_key"] == "k"
+    assert cache.get("https://a.example", "changed") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = FormSchemaCache(str(tmp_path), max_entries=2)
+    cache.put("https://a.example", "fa", FIELDS)
+    cache.put("https://b.example", "fb", FIELDS)
+    # Using a makes b the least recently used
+    assert cache.get("https://a.example", "fa") is not None
+    cache.put("https://c.example", "fc", FIELDS)
+    assert cache.get("https://b.example", "fb") is None
+    assert cache.get("https://a.example", "fa") is not None
+    assert cache.get("https://c.example", "fc") is not None
+    assert len(cache) == 2 and cache.evictions == 1
+    assert len(list(tmp_path.glob("*.json"))) == 3  # two entries and the index
+
+
+def test_recency_survives_reopening(tmp_path):
+    cache = FormSchemaCache(str(tmp_path), max_entries=2)
+    cache.put("https://a.example", "fa", FIELDS)
+    cache.put("https://b.example", "fb", FIELDS)
+    cache.get("https://a.example", "fa")
+    cache.flush()
+
+    reopened = FormSchemaCache(str(tmp_path), max_entries=2)
+    reopened.put("https://c.example", "fc", FIELDS)
+    assert reopened.get("https://b.example", "fb") is None
+    assert reopened.get("https://a.example", "fa") is not None
+
+
+def test_invalidate(tmp_path):
+    cache = FormSchemaCache(str(tmp_path))
+    cache.put("https://a.example", "fa", FIELDS)
+    cache.invalidate("https://a.example")
+    assert len(cache) == 0 and cache.get("https://a.example", "fa") is None
+
+
+def test_concurrent_writers_keep_index_and_files_consistent(tmp_path):
+    cache = FormSchemaCache(str(tmp_path), max_entries=20)
+    errors = []
+
+    def writer(worker):
+        try:
+            for i in range(25):
+                url = f"https://w{worker}.example/{i}"
+                cache.put(url, f"f{i}", FIELDS)
+                cache.get(url, f"f{i}")
+                cache.flush()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) == 20 and cache.evictions == 8 * 25 - 20
+    assert not list(tmp_path.glob("*.tmp"))
+    # What is on disk is exactly what the index lists
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert {f"{key}.json" for key in index} | {"index.json"} == {p.name for p in tmp_path.glob("*.json")}
+    reopened = FormSchemaCache(str(tmp_path), max_entries=20)
+    assert all(reopened.get(meta["url"], meta["fingerprint"]) is not None for meta in index.values())
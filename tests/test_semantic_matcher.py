@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from enhanced_form_filler import DEFAULT_RESPONSES
+from semantic_matcher import RESPONSE_QUERIES, SemanticMatcher, tokenize
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    responses = dict(DEFAULT_RESPONSES, typing_speed="About 75 words per minute.",
+                     languages="English (native), conversational Spanish.")
+    return SemanticMatcher.build(responses)
+
+
+def test_tokenize_drops_stopwords_and_suffixes():
+    assert tokenize("What are you working on these weekends?") == ["work", "these", "weekend"]
+
+
+@pytest.mark.parametrize("question, key", [
+    ("How good are you at what you do? And what does being great mean to you?", "strengths"),
+    ("When would you be able to start?", "availability"),
+    ("Have you worked remotely before?", "remote_experience"),
+    ("What motivates you?", "motivation"),
+    ("What is your typing speed?", "typing_speed"),
+    ("Which languages do you speak?", "languages"),
+])
+def test_routes_questions_to_response_keys(matcher, question, key):
+    assert matcher.match(question)[0] == key
+
+
+def test_unrelated_question_is_below_threshold(matcher):
+    key, score = matcher.match("Favourite colour?")
+    assert key is None and score < matcher.threshold
+
+
+def test_optional_keys_are_only_indexed_when_answered(matcher):
+    assert "hobbies" in RESPONSE_QUERIES and "hobbies" not in matcher.keys
+
+
+def test_index_cache_round_trip(tmp_path):
+    responses = {"strengths": "Attention to detail.", "availability": "Two weeks."}
+    built = SemanticMatcher.load_or_build(responses, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("semantic_index_*.npz"))) == 1
+    loaded = SemanticMatcher.load_or_build(responses, cache_dir=str(tmp_path))
+    assert loaded.keys == built.keys
+    assert loaded.match("notice period") == built.match("notice period")
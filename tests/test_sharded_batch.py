@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+
+import pytest
+
+import sharded_batch
+from batch_runner import normalize_job
+from sharded_batch import ShardedBatchRunner, percentile, shard_jobs
+
+JOBS = [normalize_job({"url": f"https://example.com/{i}"}) for i in range(7)]
+
+
+def test_shard_jobs_round_robin():
+    shards = shard_jobs(list(range(7)), 3)
+    assert shards == [[0, 3, 6], [1, 4], [2, 5]]
+    assert sorted(sum(shards, [])) == list(range(7))
+    assert shard_jobs([1, 2], 4) == [[1], [2], [], []]
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([5], 95) == 5
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile(values, 100) == 20.0
+    assert percentile([3, 1, 2], 0) == 1
+
+
+def test_lost_records_cover_only_unreported_jobs():
+    reported = {(JOBS[0]["url"], None)}
+    lost = ShardedBatchRunner._lost_records(JOBS[:3], reported, "worker exited with code -9")
+    assert [record["url"] for record in lost] == [JOBS[1]["url"], JOBS[2]["url"]]
+    assert all(not r["success"] and r["error"] == "worker exited with code -9" and r["worker"] is None for r in lost)
+
+
+def _dying_worker(shard_index, jobs, options, results):
+    """Reports its first job, then the process dies without a word"""
+    record = {"url": jobs[0]["url"], "candidate": None, "success": True, "filled": 3, "attempts": 1,
+              "seconds": 1.5, "error": None, "metrics": {}}
+    results.put(("result", shard_index, record))
+    results.close()
+    results.join_thread()
+    os._exit(3)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_jobs_of_a_dead_worker_are_failed_not_lost(monkeypatch):
+    monkeypatch.setattr(sharded_batch, "_worker", _dying_worker)
+    summary = ShardedBatchRunner(workers=2).run(JOBS[:4])
+    assert summary["jobs"] == 4 and summary["succeeded"] == 2 and summary["failed"] == 2
+    assert summary["worker_errors"] == {0: "worker exited with code 3", 1: "worker exited with code 3"}
+    assert sorted(r["url"] for r in summary["results"]) == sorted(job["url"] for job in JOBS[:4])
+    assert summary["latency_p50"] == 1.5 and summary["fields_filled"] == 6